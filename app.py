@@ -1,37 +1,68 @@
-import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
-import tkinter as tk
-from tkinter import ttk, messagebox
 import time
-import matplotlib
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+INICIO_PROCESSO = time.perf_counter()  # Referência para o tempo até o primeiro quadro
 
-# Use o backend TkAgg para integração com Tkinter
-matplotlib.use("TkAgg")
+import numpy as np
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import copy
+import threading
+from collections import namedtuple
+from definicao_fuzzy import (
+    PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, PARAMETROS_POTENCIA_PADRAO, trimf,
+    carregar_parametros, salvar_parametros
+)
+from motor_vetorizado import MotorFuzzyVetorizado, DEFUZZIFICACOES
+from base_regras import OPERADORES_E, AGREGACOES
+from buffer_circular import BufferCircular
+from telemetria import GravadorTelemetria
+from perfil import PerfiladorTicks, formatar_histograma
+from diagnostico import CanalDiagnostico, NIVEIS
+from planta import TEMPERATURA_AMBIENTE, COEFICIENTE_AMBIENTE, PlantaLote, modelo_primeira_ordem
+from motor_superficie import FAIXA_ERRO, FAIXA_VARIACAO
+from saturacao import PoliticaSaturacao, POLITICAS_ENTRADA, POLITICAS_SEM_ATIVACAO
+from texto_incremental import TextoIncremental
+
+# Canais registrados no histórico da simulação
+CANAIS_HISTORICO = ('tempo', 'temperatura', 'potencia', 'erro', 'variacao')
+
+# Grades (passo de erro em °C x passo de variação em °C/s) do motor
+# 'superficie'. Erro máximo da interpolação com os parâmetros padrão, em pontos
+# percentuais de potência: 6.2, 2.5, 1.3 e 0.55; construção em 0.07 s, 0.3 s,
+# 1.4 s e 4.5 s.
+RESOLUCOES_SUPERFICIE = {
+    '1.0 x 0.5': (1.0, 0.5),
+    '0.5 x 0.25': (0.5, 0.25),
+    '0.25 x 0.1': (0.25, 0.1),
+    '0.1 x 0.05': (0.1, 0.05),
+}
+RESOLUCAO_SUPERFICIE_PADRAO = '0.25 x 0.1'
+
+# Resoluções (°C e °C/s) oferecidas no explorador da superfície de controle
+RESOLUCOES_EXPLORADOR = ('0.5', '0.25', '0.1', '0.05')
+
+# Estado publicado pelo laço de controle a cada passo
+Instantaneo = namedtuple('Instantaneo', ['tempo', 'temperatura', 'erro', 'variacao', 'potencia', 'fuzzificacao'])
+
+# skfuzzy e matplotlib são importados sob demanda: o skfuzzy em segundo plano
+# após o primeiro quadro e o matplotlib ao montar os gráficos, que usam
+# Figure e FigureCanvasTkAgg diretamente, sem pyplot
 
 
 class InterfaceControleFuzzy:
-    def __init__(self, raiz):
+    def __init__(self, raiz, diagnostico=None):
         self.raiz = raiz
+        # Mensagens de diagnóstico; as de cada passo do controle são de depuração
+        self.diagnostico = diagnostico if diagnostico is not None else CanalDiagnostico()
         self.raiz.title("Sistema de Controle Fuzzy - Chuveiro Inteligente")
         self.raiz.state('zoomed')  # Maximiza a janela
 
         # Parâmetros das funções de pertinência
-        self.parametros_erro_valores = {
-            'muito_negativo': [-30, -30, -15],
-            'negativo': [-20, -10, 0],
-            'neutro': [-5, 0, 5],
-            'positivo': [0, 10, 20],
-            'muito_positivo': [15, 30, 30]
-        }
+        self.parametros_erro_valores = copy.deepcopy(PARAMETROS_ERRO_PADRAO)
+        self.parametros_var_valores = copy.deepcopy(PARAMETROS_VAR_PADRAO)
 
-        self.parametros_var_valores = {
-            'diminuindo': [-10, -10, 0],
-            'estavel': [-2, 0, 2],
-            'aumentando': [0, 10, 10]
-        }
+        # Motor de inferência usado no laço de controle ('skfuzzy', 'vetorizado', 'superficie' ou 'sugeno')
+        self.motor_inferencia = 'skfuzzy'
+        self.resolucao_superficie = RESOLUCOES_SUPERFICIE[RESOLUCAO_SUPERFICIE_PADRAO]
 
         # Criação do sistema fuzzy
         self.configurar_sistema_fuzzy()
@@ -39,65 +70,192 @@ class InterfaceControleFuzzy:
         # Variáveis de simulação
         self.temperatura_atual = 20.0  # Inicializa em 20°C
         self.temperatura_desejada = 25.0  # Inicializa em 25°C
+        # Modelo térmico do simulador sem interface, com discretização exata
+        # (o passo acompanha o tempo real entre os ticks)
+        self.planta = PlantaLote(modelo_primeira_ordem(), 1, self.temperatura_atual, 'exato')
         self.ultimo_tempo = time.time()
-        self.historico_temp = [self.temperatura_atual]
-        self.historico_potencia = [0.0]
+
+        # Histórico em buffer circular; o gráfico exibe apenas a janela mais recente
+        self.capacidade_historico = 100000
+        self.janela_grafico = 100.0  # Segundos exibidos nos gráficos
+
+        # 'blit' redesenha apenas as curvas sobre o fundo em cache; 'completo'
+        # redesenha a figura inteira a cada atualização
+        self.modo_renderizacao = 'blit'
+        self.historico = BufferCircular(self.capacidade_historico, CANAIS_HISTORICO)
+        self.historico.adicionar((self.ultimo_tempo, self.temperatura_atual, 0.0, 0.0, 0.0))
 
         # Flag para controlar o estado da simulação
         self.executando = False
 
+        # O laço de controle roda em uma thread com período próprio e publica o
+        # último estado em self.instantaneo; a interface o amostra em sua taxa
+        self.periodo_controle = 0.01  # s (100 Hz)
+        self.periodo_interface_ms = 100  # ms (10 quadros por segundo)
+        self.trava_estado = threading.Lock()
+        self.evento_parada = threading.Event()
+        self.thread_controle = None
+        self.instantaneo = None
+
+        # Gravador de telemetria (ativado pelo botão na aba de simulação)
+        self.gravador = None
+
+        # Instrumentação das fases de cada tick (desligada por padrão)
+        self.perfil = PerfiladorTicks()
+
         # Configuração da interface
         self.configurar_interface()
 
-    def configurar_sistema_fuzzy(self):
-        # Universos de discurso
-        self.erro_temperatura = ctrl.Antecedent(np.arange(-30, 31, 1), 'erro_temperatura')
-        self.variacao_temp = ctrl.Antecedent(np.arange(-10, 11, 1), 'variacao_temperatura')
-        self.potencia = ctrl.Consequent(np.arange(0, 101, 1), 'potencia')
-
-        # Funções de pertinência para Erro de Temperatura
-        for termo, params in self.parametros_erro_valores.items():
-            self.erro_temperatura[termo] = fuzz.trimf(self.erro_temperatura.universe, params)
-
-        # Funções de pertinência para Variação de Temperatura
-        for termo, params in self.parametros_var_valores.items():
-            self.variacao_temp[termo] = fuzz.trimf(self.variacao_temp.universe, params)
-
-        # Funções de pertinência para Potência
-        self.potencia['baixa'] = fuzz.trimf(self.potencia.universe, [0, 0, 50])
-        self.potencia['media'] = fuzz.trimf(self.potencia.universe, [25, 50, 75])
-        self.potencia['alta'] = fuzz.trimf(self.potencia.universe, [50, 100, 100])
-
-        # Regras Corretas
-        self.regras = [
-            # Regras para Erro Muito Negativo (desired << actual) -> diminuir potência
-            ctrl.Rule(self.erro_temperatura['muito_negativo'] & self.variacao_temp['diminuindo'], self.potencia['baixa']),
-            ctrl.Rule(self.erro_temperatura['muito_negativo'] & self.variacao_temp['estavel'], self.potencia['baixa']),
-            ctrl.Rule(self.erro_temperatura['muito_negativo'] & self.variacao_temp['aumentando'], self.potencia['baixa']),
-
-            # Regras para Erro Negativo (desired < actual)
-            ctrl.Rule(self.erro_temperatura['negativo'] & self.variacao_temp['diminuindo'], self.potencia['media']),
-            ctrl.Rule(self.erro_temperatura['negativo'] & self.variacao_temp['estavel'], self.potencia['media']),
-            ctrl.Rule(self.erro_temperatura['negativo'] & self.variacao_temp['aumentando'], self.potencia['baixa']),
-
-            # Regras para Erro Neutro (desired ≈ actual)
-            ctrl.Rule(self.erro_temperatura['neutro'] & self.variacao_temp['diminuindo'], self.potencia['media']),
-            ctrl.Rule(self.erro_temperatura['neutro'] & self.variacao_temp['estavel'], self.potencia['media']),
-            ctrl.Rule(self.erro_temperatura['neutro'] & self.variacao_temp['aumentando'], self.potencia['media']),
-
-            # Regras para Erro Positivo (desired > actual)
-            ctrl.Rule(self.erro_temperatura['positivo'] & self.variacao_temp['diminuindo'], self.potencia['alta']),
-            ctrl.Rule(self.erro_temperatura['positivo'] & self.variacao_temp['estavel'], self.potencia['media']),
-            ctrl.Rule(self.erro_temperatura['positivo'] & self.variacao_temp['aumentando'], self.potencia['baixa']),
-
-            # Regras para Erro Muito Positivo (desired >> actual)
-            ctrl.Rule(self.erro_temperatura['muito_positivo'] & self.variacao_temp['diminuindo'], self.potencia['alta']),
-            ctrl.Rule(self.erro_temperatura['muito_positivo'] & self.variacao_temp['estavel'], self.potencia['alta']),
-            ctrl.Rule(self.erro_temperatura['muito_positivo'] & self.variacao_temp['aumentando'], self.potencia['alta']),
-        ]
+        # Após o primeiro quadro: mede o tempo de abertura, monta os gráficos e
+        # carrega o sistema skfuzzy em segundo plano
+        self.tempo_primeiro_quadro = None
+        self.raiz.after_idle(self.ao_exibir_primeiro_quadro)
+
+    def ao_exibir_primeiro_quadro(self):
+        # Conclui o desenho pendente da janela antes de medir
+        self.raiz.update_idletasks()
+        self.tempo_primeiro_quadro = time.perf_counter() - INICIO_PROCESSO
+        self.perfil.registrar('primeiro_quadro', self.tempo_primeiro_quadro)
+        self.diagnostico.informar("Tempo até o primeiro quadro: {:.0f} ms", self.tempo_primeiro_quadro * 1000)
+
+        self.configurar_graficos_simulacao()
+        threading.Thread(target=self.obter_sistema_skfuzzy, daemon=True).start()
 
-        self.sistema_ctrl = ctrl.ControlSystem(self.regras)
-        self.simulacao = ctrl.ControlSystemSimulation(self.sistema_ctrl)
+    def configurar_sistema_fuzzy(self):
+        # Os objetos skfuzzy (sistema_ctrl, simulacao e variáveis) são montados
+        # na primeira chamada de obter_sistema_skfuzzy
+        self.trava_skfuzzy = threading.Lock()
+        self.sistema_ctrl = None
+        self.simulacao = None
+
+        # Motor NumPy equivalente, usado também para avaliações em lote
+        self.motor_vetorizado = MotorFuzzyVetorizado(self.parametros_erro_valores, self.parametros_var_valores)
+
+        # A superfície pré-calculada depende das funções de pertinência e é
+        # reconstruída em segundo plano na próxima consulta; o Sugeno é
+        # ajustado em segundo plano na primeira vez em que for usado e após
+        # cada alteração, mantendo o ajuste anterior até o novo ficar pronto
+        self.tabela_superficie = None
+        self.thread_superficie = None
+        self.ajuste_sugeno = (None, None)  # (geração dos parâmetros, motor)
+        self.thread_sugeno = None
+        self.geracao_parametros = 0
+
+        # Superfície exibida no explorador: calculada em segundo plano e
+        # guardada até que a chave (parâmetros, motor, resolução) mude
+        self.cache_explorador = {'chave': None, 'tabela': None, 'calculando': None}
+
+        # Entradas fora dos universos e passos sem regra ativa
+        self.saturacao = PoliticaSaturacao()
+
+    def obter_sistema_skfuzzy(self):
+        # Carrega o sistema skfuzzy do cache quando os parâmetros não mudaram,
+        # ou o monta. Seguro para chamadas concorrentes.
+        with self.trava_skfuzzy:
+            if self.sistema_ctrl is None:
+                from sistema_skfuzzy import carregar_sistema
+                sistema = carregar_sistema(self.parametros_erro_valores, self.parametros_var_valores)
+                self.erro_temperatura = sistema.erro_temperatura
+                self.variacao_temp = sistema.variacao_temp
+                self.potencia = sistema.potencia
+                self.regras = sistema.regras
+                self.simulacao = self.criar_simulacao(sistema.sistema_ctrl)
+                self.sistema_ctrl = sistema.sistema_ctrl
+            return self.sistema_ctrl
+
+    def criar_simulacao(self, sistema_ctrl):
+        from skfuzzy import control as ctrl
+        return ctrl.ControlSystemSimulation(sistema_ctrl)
+
+    def invalidar_motores_derivados(self):
+        # A superfície e o Sugeno ajustado dependem das funções de pertinência
+        # e dos operadores, e são refeitos na próxima consulta
+        self.tabela_superficie = None
+        self.geracao_parametros += 1
+
+    def obter_motor_sugeno(self):
+        # Sugeno de primeira ordem ajustado à superfície do motor vetorizado.
+        # Retorna o último ajuste (None antes do primeiro) e, se os parâmetros
+        # mudaram desde ele, inicia o reajuste em segundo plano.
+        if self.ajuste_sugeno[0] != self.geracao_parametros and self.thread_sugeno is None:
+            geracao = self.geracao_parametros
+            parametros_erro = dict(self.parametros_erro_valores)
+            parametros_var = dict(self.parametros_var_valores)
+            referencia = self.motor_vetorizado
+
+            def ajustar():
+                from motor_sugeno import ajustar_sugeno
+                try:
+                    motor = ajustar_sugeno(parametros_erro, parametros_var, ordem=1, referencia=referencia)
+                    # Descarta o ajuste se os parâmetros mudaram durante o cálculo
+                    if geracao == self.geracao_parametros:
+                        self.ajuste_sugeno = (geracao, motor)
+                except Exception as e:
+                    self.diagnostico.erro("Falha no ajuste do Sugeno: {}", e)
+                finally:
+                    self.thread_sugeno = None
+
+            self.thread_sugeno = threading.Thread(target=ajustar, daemon=True)
+            self.thread_sugeno.start()
+        return self.ajuste_sugeno[1]
+
+    def obter_tabela_superficie(self):
+        # Retorna None enquanto a superfície estiver sendo reconstruída
+        if self.tabela_superficie is None and self.thread_superficie is None:
+            geracao = self.geracao_parametros
+            resolucao = self.resolucao_superficie
+
+            def construir():
+                from motor_superficie import TabelaSuperficie
+                # A superfície segue o motor vetorizado, que com os operadores
+                # padrão difere do skfuzzy em menos de 0.02 ponto percentual e
+                # permite grades finas em poucos segundos
+                tabela = TabelaSuperficie(self.motor_vetorizado, *resolucao)
+                # Descarta a tabela se os parâmetros ou a resolução mudaram durante a construção
+                if geracao == self.geracao_parametros and resolucao == self.resolucao_superficie:
+                    self.tabela_superficie = tabela
+                    self.diagnostico.informar("Superfície de controle reconstruída: erro máximo de interpolação = {:.3f}%",
+                                              tabela.erro_maximo)
+                self.thread_superficie = None
+
+            self.thread_superficie = threading.Thread(target=construir, daemon=True)
+            self.thread_superficie.start()
+        return self.tabela_superficie
+
+    def inferir(self, erro, variacao):
+        # Retorna um ResultadoFuzzificacao com a potência do motor selecionado;
+        # os graus de pertinência ficam disponíveis para as abas de diagnóstico.
+        # Nenhum motor levanta exceção: a saída bruta (NaN sem regra ativa)
+        # passa pela política de saturação.
+        motor = self.motor_vetorizado
+        if self.motor_inferencia == 'vetorizado':
+            fuzzificacao = motor.inferir(erro, variacao, validar=False)
+        elif self.motor_inferencia == 'sugeno':
+            sugeno = self.obter_motor_sugeno()
+            if sugeno is not None:
+                motor = sugeno
+            # Antes do primeiro ajuste, usa o motor vetorizado
+            fuzzificacao = motor.inferir(erro, variacao, validar=False)
+        elif self.motor_inferencia == 'superficie':
+            tabela = self.obter_tabela_superficie()
+            if tabela is None:
+                # Enquanto a superfície é reconstruída, usa o motor vetorizado
+                fuzzificacao = motor.inferir(erro, variacao, validar=False)
+            else:
+                motor = tabela
+                fuzzificacao = self.motor_vetorizado.fuzzificar(erro, variacao, tabela.calcular(erro, variacao))
+        else:
+            # O motor vetorizado tem as mesmas funções de pertinência: sem
+            # nenhuma força de disparo, o skfuzzy levantaria exceção
+            fuzzificacao = motor.fuzzificar(erro, variacao, np.nan)
+            if fuzzificacao.forcas.max() > 0:
+                self.obter_sistema_skfuzzy()
+                self.simulacao.input['erro_temperatura'] = erro
+                self.simulacao.input['variacao_temperatura'] = variacao
+                self.simulacao.compute()
+                fuzzificacao.potencia = float(self.simulacao.output['potencia'])
+        fuzzificacao.potencia = self.saturacao.corrigir(motor, erro, variacao, fuzzificacao.potencia)
+        return fuzzificacao
 
     def configurar_interface(self):
         # Criação do notebook (sistema de abas)
@@ -111,19 +269,59 @@ class InterfaceControleFuzzy:
             "Sistema Fuzzy Interno",
             "Regras e Informações",
             "Verificação das Regras",
-            "Variáveis e Processos"
+            "Variáveis e Processos",
+            "Superfície de Controle",
+            "Desempenho"
         ]
         for nome in nomes_abas:
             aba = ttk.Frame(self.notebook)
             self.notebook.add(aba, text=nome)
             self.abas[nome] = aba
 
-        # Configuração de cada aba
-        self.configurar_aba_simulacao()
-        self.configurar_aba_fuzzy_interno()
-        self.configurar_aba_regras_info()
-        self.configurar_aba_verificacao_regras()
-        self.configurar_aba_variaveis_processos()
+        # Cada aba é montada na primeira vez em que é selecionada
+        self.configuradores_abas = {
+            "Simulação em Tempo Real": self.configurar_aba_simulacao,
+            "Sistema Fuzzy Interno": self.configurar_aba_fuzzy_interno,
+            "Regras e Informações": self.configurar_aba_regras_info,
+            "Verificação das Regras": self.configurar_aba_verificacao_regras,
+            "Variáveis e Processos": self.configurar_aba_variaveis_processos,
+            "Superfície de Controle": self.configurar_aba_superficie,
+            "Desempenho": self.configurar_aba_desempenho,
+        }
+        self.abas_construidas = set()
+        # Abas de texto montadas mas ocultas durante um reset, atualizadas ao serem exibidas
+        self.abas_desatualizadas = set()
+        self.notebook.bind('<<NotebookTabChanged>>', self.ao_trocar_aba)
+        self.construir_aba(nomes_abas[0])
+
+    def construir_aba(self, nome):
+        if nome not in self.abas_construidas:
+            self.abas_construidas.add(nome)
+            self.configuradores_abas[nome]()
+
+    def ao_trocar_aba(self, evento=None):
+        aba = self.aba_visivel()
+        self.construir_aba(aba)
+        if aba in self.abas_desatualizadas:
+            self.abas_desatualizadas.discard(aba)
+            self.atualizar_aba_texto(aba)
+        if aba == "Superfície de Controle":
+            self.atualizar_explorador()
+
+    def atualizar_aba_texto(self, aba):
+        if aba == "Sistema Fuzzy Interno":
+            self.atualizar_fuzzy_interno()
+        elif aba == "Variáveis e Processos":
+            self.atualizar_variaveis_processos_interface(self.fuzzificacao_atual())
+        elif aba == "Verificação das Regras":
+            self.atualizar_verificacao_regras(self.fuzzificacao_atual())
+
+    def fuzzificacao_atual(self):
+        # Diagnóstico do último passo, ou das entradas nulas antes do primeiro
+        instantaneo = self.instantaneo
+        if instantaneo is not None:
+            return instantaneo.fuzzificacao
+        return self.motor_vetorizado.fuzzificar(0.0, 0.0, 0.0)
 
     def configurar_aba_simulacao(self):
         aba = self.abas["Simulação em Tempo Real"]
@@ -160,6 +358,24 @@ class InterfaceControleFuzzy:
         self.botao_reset = ttk.Button(frame_botoes, text="Resetar Simulação", command=self.reset_simulacao, state='disabled')
         self.botao_reset.pack(side='left', padx=2)
 
+        self.botao_telemetria = ttk.Button(frame_botoes, text="Gravar Telemetria", command=self.alternar_telemetria)
+        self.botao_telemetria.pack(side='left', padx=2)
+
+        # Seleção do motor de inferência
+        ttk.Label(frame_controles, text="Motor:").pack(side='left', padx=5)
+        self.combo_motor = ttk.Combobox(frame_controles, values=['skfuzzy', 'vetorizado', 'superficie', 'sugeno'], state='readonly', width=12)
+        self.combo_motor.set(self.motor_inferencia)
+        self.combo_motor.bind('<<ComboboxSelected>>', self.selecionar_motor)
+        self.combo_motor.pack(side='left', padx=5)
+
+        # Resolução da grade do motor 'superficie': precisão x tempo de construção
+        ttk.Label(frame_controles, text="Grade:").pack(side='left', padx=5)
+        self.combo_resolucao_superficie = ttk.Combobox(frame_controles, values=list(RESOLUCOES_SUPERFICIE),
+                                                       state='readonly', width=10)
+        self.combo_resolucao_superficie.set(RESOLUCAO_SUPERFICIE_PADRAO)
+        self.combo_resolucao_superficie.bind('<<ComboboxSelected>>', self.selecionar_resolucao_superficie)
+        self.combo_resolucao_superficie.pack(side='left', padx=5)
+
         # Barra de Progresso para Potência
         frame_progresso = ttk.LabelFrame(aba, text="Indicador de Potência")
         frame_progresso.pack(fill='x', padx=5, pady=5)
@@ -181,24 +397,37 @@ class InterfaceControleFuzzy:
         self.label_erro_sim = ttk.Label(frame_info, text=f"Erro de Temperatura: {0.0:.1f}°C", font=("Arial", 14))
         self.label_erro_sim.pack(pady=10)
 
+        # Os gráficos são montados logo após o primeiro quadro
+        self.frame_graficos = frame_info
+        self.canvas = None
+
+    def configurar_graficos_simulacao(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         # Criação dos gráficos
-        self.fig, (self.ax_temp, self.ax_pot) = plt.subplots(2, 1, figsize=(8, 6))
+        self.fig = Figure(figsize=(8, 6))
+        self.ax_temp, self.ax_pot = self.fig.subplots(2, 1)
         self.fig.tight_layout(pad=3.0)
 
         # Gráfico de Temperatura
         self.ax_temp.set_title("Histórico de Temperatura")
         self.ax_temp.set_xlabel("Tempo (s)")
         self.ax_temp.set_ylabel("Temperatura (°C)")
-        self.line_temp, = self.ax_temp.plot([], [], color='red')
+        self.line_temp, = self.ax_temp.plot([], [], color='red', animated=self.modo_renderizacao == 'blit')
 
         # Gráfico de Potência
         self.ax_pot.set_title("Histórico de Potência Aplicada")
         self.ax_pot.set_xlabel("Tempo (s)")
         self.ax_pot.set_ylabel("Potência (%)")
-        self.line_pot, = self.ax_pot.plot([], [], color='blue')
+        self.line_pot, = self.ax_pot.plot([], [], color='blue', animated=self.modo_renderizacao == 'blit')
 
         # Integração dos gráficos com Tkinter
-        self.canvas = FigureCanvasTkAgg(self.fig, master=frame_info)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_graficos)
+        self.fundo_graficos = None
+        self.limites_graficos = None
+        self.canvas.mpl_connect('draw_event', self.ao_desenhar_graficos)
+        self.ajustar_limites_graficos()
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
 
@@ -212,6 +441,7 @@ class InterfaceControleFuzzy:
         self.texto_fuzzy = tk.Text(frame_info, wrap=tk.WORD, height=15)
         self.texto_fuzzy.pack(fill='both', expand=True, padx=5, pady=5)
         self.texto_fuzzy.config(state='disabled')
+        self.vista_fuzzy = TextoIncremental(self.texto_fuzzy)
         self.atualizar_fuzzy_interno()
 
         # Frame para editar funções de pertinência
@@ -284,6 +514,45 @@ class InterfaceControleFuzzy:
         self.botao_aplicar = ttk.Button(frame_editar, text="Aplicar Alterações", command=self.aplicar_alteracoes_fuzzy)
         self.botao_aplicar.pack(pady=10)
 
+        # Importação/exportação em JSON (por exemplo, resultados de sintonia.py)
+        ttk.Button(frame_editar, text="Carregar Parâmetros...", command=self.carregar_parametros_arquivo).pack(pady=2)
+        ttk.Button(frame_editar, text="Salvar Parâmetros...", command=self.salvar_parametros_arquivo).pack(pady=2)
+
+        # Operadores do motor vetorizado (o skfuzzy usa sempre min/max/centróide)
+        frame_operadores = ttk.LabelFrame(aba, text="Operadores do Motor Vetorizado")
+        frame_operadores.pack(fill='x', padx=5, pady=5)
+
+        self.combos_operadores = {}
+        opcoes = (
+            ('operador_e', "E:", OPERADORES_E, self.motor_vetorizado.base.operador_e),
+            ('agregacao', "Agregação:", AGREGACOES, self.motor_vetorizado.base.agregacao),
+            ('defuzzificacao', "Defuzzificação:", DEFUZZIFICACOES, self.motor_vetorizado.defuzzificacao),
+        )
+        for chave, rotulo, valores, atual in opcoes:
+            ttk.Label(frame_operadores, text=rotulo).pack(side='left', padx=5)
+            combo = ttk.Combobox(frame_operadores, values=list(valores), state='readonly', width=20)
+            combo.set(atual)
+            combo.bind('<<ComboboxSelected>>', self.selecionar_operadores)
+            combo.pack(side='left', padx=5)
+            self.combos_operadores[chave] = combo
+
+        # Políticas para entradas fora dos universos e passos sem regra ativa
+        frame_saturacao = ttk.LabelFrame(aba, text="Saturação")
+        frame_saturacao.pack(fill='x', padx=5, pady=5)
+
+        self.combos_saturacao = {}
+        opcoes = (
+            ('entrada', "Entradas fora do universo:", POLITICAS_ENTRADA, self.saturacao.entrada),
+            ('sem_ativacao', "Sem regra ativa:", POLITICAS_SEM_ATIVACAO, self.saturacao.sem_ativacao),
+        )
+        for chave, rotulo, valores, atual in opcoes:
+            ttk.Label(frame_saturacao, text=rotulo).pack(side='left', padx=5)
+            combo = ttk.Combobox(frame_saturacao, values=list(valores), state='readonly', width=12)
+            combo.set(atual)
+            combo.bind('<<ComboboxSelected>>', self.selecionar_saturacao)
+            combo.pack(side='left', padx=5)
+            self.combos_saturacao[chave] = combo
+
     def configurar_aba_regras_info(self):
         aba = self.abas["Regras e Informações"]
 
@@ -299,6 +568,9 @@ class InterfaceControleFuzzy:
 
         self.label_potencia_crisp = ttk.Label(frame_crisp, text="Potência: 0%")
         self.label_potencia_crisp.pack(anchor='w', padx=5, pady=2)
+        instantaneo = self.instantaneo
+        if instantaneo is not None:
+            self.atualizar_valores_crisp(instantaneo.erro, instantaneo.variacao, instantaneo.potencia)
 
         # Frame para exibir as regras
         frame_regras = ttk.LabelFrame(aba, text="Base de Regras")
@@ -308,30 +580,16 @@ class InterfaceControleFuzzy:
         self.texto_regras.pack(fill='both', expand=True, padx=5, pady=5)
         self.texto_regras.config(state='disabled')
 
-        # Inserir as regras
-        regras_texto = [
-            "Regras do Sistema Fuzzy:",
-            "",
-            "1. SE erro_muito_negativo E variação_diminuindo ENTÃO potência_baixa",
-            "2. SE erro_muito_negativo E variação_estavel ENTÃO potência_baixa",
-            "3. SE erro_muito_negativo E variação_aumentando ENTÃO potência_baixa",
-            "",
-            "4. SE erro_negativo E variação_diminuindo ENTÃO potência_media",
-            "5. SE erro_negativo E variação_estavel ENTÃO potência_media",
-            "6. SE erro_negativo E variação_aumentando ENTÃO potência_baixa",
-            "",
-            "7. SE erro_neutro E variação_diminuindo ENTÃO potência_media",
-            "8. SE erro_neutro E variação_estavel ENTÃO potência_media",
-            "9. SE erro_neutro E variação_aumentando ENTÃO potência_media",
-            "",
-            "10. SE erro_positivo E variação_diminuindo ENTÃO potência_alta",
-            "11. SE erro_positivo E variação_estavel ENTÃO potência_media",
-            "12. SE erro_positivo E variação_aumentando ENTÃO potência_baixa",
-            "",
-            "13. SE erro_muito_positivo E variação_diminuindo ENTÃO potência_alta",
-            "14. SE erro_muito_positivo E variação_estavel ENTÃO potência_alta",
-            "15. SE erro_muito_positivo E variação_aumentando ENTÃO potência_alta",
-        ]
+        # Inserir as regras, geradas da base compilada e agrupadas pelo termo do erro
+        regras_texto = ["Regras do Sistema Fuzzy:"]
+        base = self.motor_vetorizado.base
+        termo_anterior = None
+        for numero, (texto, linha) in enumerate(zip(base.descrever(['erro', 'variação']), base.antecedentes), start=1):
+            termo_erro = linha[0]
+            if termo_erro != termo_anterior:
+                regras_texto.append("")
+                termo_anterior = termo_erro
+            regras_texto.append(f"{numero}. {texto}")
         self.texto_regras.config(state='normal')
         self.texto_regras.insert('1.0', "\n".join(regras_texto))
         self.texto_regras.config(state='disabled')
@@ -345,6 +603,8 @@ class InterfaceControleFuzzy:
         self.texto_regras_ativas = tk.Text(frame_regras_ativas, wrap=tk.WORD, height=25)
         self.texto_regras_ativas.pack(fill='both', expand=True, padx=5, pady=5)
         self.texto_regras_ativas.config(state='disabled')
+        self.vista_regras_ativas = TextoIncremental(self.texto_regras_ativas)
+        self.atualizar_verificacao_regras(self.fuzzificacao_atual())
 
     def configurar_aba_variaveis_processos(self):
         aba = self.abas["Variáveis e Processos"]
@@ -356,6 +616,7 @@ class InterfaceControleFuzzy:
         self.texto_fuzzificacao = tk.Text(frame_fuzzificacao, wrap=tk.WORD, height=15)
         self.texto_fuzzificacao.pack(fill='both', expand=True, padx=5, pady=5)
         self.texto_fuzzificacao.config(state='disabled')
+        self.vista_fuzzificacao = TextoIncremental(self.texto_fuzzificacao)
 
         # Frame para processo de defuzzificação
         frame_defuzzificacao = ttk.LabelFrame(aba, text="Processo de Defuzzificação")
@@ -364,6 +625,220 @@ class InterfaceControleFuzzy:
         self.texto_defuzzificacao = tk.Text(frame_defuzzificacao, wrap=tk.WORD, height=10)
         self.texto_defuzzificacao.pack(fill='both', expand=True, padx=5, pady=5)
         self.texto_defuzzificacao.config(state='disabled')
+        self.vista_defuzzificacao = TextoIncremental(self.texto_defuzzificacao)
+        self.atualizar_variaveis_processos_interface(self.fuzzificacao_atual())
+
+    def configurar_aba_superficie(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        aba = self.abas["Superfície de Controle"]
+
+        frame_controles = ttk.LabelFrame(aba, text="Controles")
+        frame_controles.pack(fill='x', padx=5, pady=5)
+
+        ttk.Label(frame_controles, text="Resolução:").pack(side='left', padx=5)
+        self.combo_resolucao_explorador = ttk.Combobox(frame_controles, values=list(RESOLUCOES_EXPLORADOR),
+                                                       state='readonly', width=6)
+        self.combo_resolucao_explorador.set('0.1')
+        self.combo_resolucao_explorador.bind('<<ComboboxSelected>>', self.atualizar_explorador)
+        self.combo_resolucao_explorador.pack(side='left', padx=5)
+
+        self.label_explorador = ttk.Label(frame_controles, text="")
+        self.label_explorador.pack(side='left', padx=10)
+
+        # Mapa de calor da potência sobre os universos de entrada; o ponto de
+        # operação e a trajetória recente são desenhados por cima com blit
+        self.fig_superficie = Figure(figsize=(8, 6))
+        self.ax_superficie = self.fig_superficie.subplots()
+        self.imagem_superficie = self.ax_superficie.imshow(
+            np.full((2, 2), np.nan), origin='lower', aspect='auto', cmap='inferno', vmin=0, vmax=100,
+            extent=(FAIXA_ERRO[0], FAIXA_ERRO[1], FAIXA_VARIACAO[0], FAIXA_VARIACAO[1]))
+        self.fig_superficie.colorbar(self.imagem_superficie, ax=self.ax_superficie, label="Potência (%)")
+        self.ax_superficie.set_title("Superfície de Controle")
+        self.ax_superficie.set_xlabel("Erro de Temperatura (°C)")
+        self.ax_superficie.set_ylabel("Variação de Temperatura (°C/s)")
+        self.linha_trajetoria, = self.ax_superficie.plot([], [], color='cyan', linewidth=1, animated=True)
+        self.ponto_operacao, = self.ax_superficie.plot([], [], 'o', color='white', markeredgecolor='black',
+                                                       animated=True)
+
+        self.canvas_superficie = FigureCanvasTkAgg(self.fig_superficie, master=aba)
+        self.fundo_superficie = None
+        self.chave_superficie_exibida = None
+        self.canvas_superficie.mpl_connect('draw_event', self.ao_desenhar_superficie)
+        self.canvas_superficie.get_tk_widget().pack(fill='both', expand=True)
+
+    def chave_explorador(self):
+        # skfuzzy, vetorizado e superfície compartilham a superfície do motor vetorizado
+        familia = 'sugeno' if self.motor_inferencia == 'sugeno' else 'mamdani'
+        return (self.geracao_parametros, familia, float(self.combo_resolucao_explorador.get()))
+
+    def obter_superficie_explorador(self):
+        # Retorna a tabela (variações x erros) da chave atual, ou None enquanto
+        # ela é calculada em segundo plano com uma única avaliação em lote
+        chave = self.chave_explorador()
+        cache = self.cache_explorador
+        if cache['chave'] == chave:
+            return cache['tabela']
+        if cache['calculando'] != chave:
+            motor = self.motor_vetorizado
+            if chave[1] == 'sugeno':
+                # Aguarda o ajuste do Sugeno para os parâmetros atuais
+                self.obter_motor_sugeno()
+                geracao, motor = self.ajuste_sugeno
+                if geracao != chave[0]:
+                    return None
+            cache['calculando'] = chave
+
+            def calcular():
+                try:
+                    passo = chave[2]
+                    erros = np.linspace(*FAIXA_ERRO, int(round((FAIXA_ERRO[1] - FAIXA_ERRO[0]) / passo)) + 1)
+                    variacoes = np.linspace(*FAIXA_VARIACAO,
+                                            int(round((FAIXA_VARIACAO[1] - FAIXA_VARIACAO[0]) / passo)) + 1)
+                    grade_erro, grade_var = np.meshgrid(erros, variacoes)
+                    tabela = motor.compute_many(grade_erro, grade_var)
+                    # Descarta o resultado se os parâmetros mudaram durante o cálculo
+                    if cache['calculando'] == chave and chave[0] == self.geracao_parametros:
+                        cache.update(chave=chave, tabela=tabela)
+                except Exception as e:
+                    self.diagnostico.erro("Falha no cálculo da superfície de controle: {}", e)
+                finally:
+                    # Libera a chave para que uma nova consulta possa recalculá-la
+                    if cache['calculando'] == chave:
+                        cache['calculando'] = None
+
+            threading.Thread(target=calcular, daemon=True).start()
+        return None
+
+    def atualizar_explorador(self, evento=None):
+        tabela = self.obter_superficie_explorador()
+        if tabela is None:
+            self.label_explorador.config(text="Calculando a superfície...")
+            # Sem a simulação em execução, acompanha o cálculo enquanto a aba estiver visível
+            if not self.executando and self.aba_visivel() == "Superfície de Controle":
+                self.raiz.after(100, self.atualizar_explorador)
+            return
+
+        chave = self.cache_explorador['chave']
+        if chave != self.chave_superficie_exibida:
+            # Nova superfície: troca a imagem e refaz o fundo em cache
+            self.imagem_superficie.set_data(np.ma.masked_invalid(tabela))
+            self.chave_superficie_exibida = chave
+            self.label_explorador.config(text=f"{tabela.shape[1]} x {tabela.shape[0]} pontos")
+            self.fundo_superficie = None
+        self.atualizar_trajetoria_explorador()
+
+    def atualizar_trajetoria_explorador(self):
+        with self.trava_estado:
+            instantes = self.historico['tempo']
+            inicio = np.searchsorted(instantes, instantes[-1] - self.janela_grafico) if len(instantes) else 0
+            erros = np.clip(self.historico['erro'][inicio:], *FAIXA_ERRO)
+            variacoes = np.clip(self.historico['variacao'][inicio:], *FAIXA_VARIACAO)
+        self.linha_trajetoria.set_data(erros, variacoes)
+        self.ponto_operacao.set_data(erros[-1:], variacoes[-1:])
+
+        if self.fundo_superficie is None:
+            # Redesenho completo; o fundo é recapturado no draw_event
+            self.canvas_superficie.draw_idle()
+            return
+        self.canvas_superficie.restore_region(self.fundo_superficie)
+        self.ax_superficie.draw_artist(self.linha_trajetoria)
+        self.ax_superficie.draw_artist(self.ponto_operacao)
+        self.canvas_superficie.blit(self.fig_superficie.bbox)
+
+    def ao_desenhar_superficie(self, evento):
+        self.fundo_superficie = self.canvas_superficie.copy_from_bbox(self.fig_superficie.bbox)
+        self.ax_superficie.draw_artist(self.linha_trajetoria)
+        self.ax_superficie.draw_artist(self.ponto_operacao)
+
+    def configurar_aba_desempenho(self):
+        aba = self.abas["Desempenho"]
+
+        frame_controles = ttk.LabelFrame(aba, text="Instrumentação")
+        frame_controles.pack(fill='x', padx=5, pady=5)
+
+        self.var_perfil_ativo = tk.BooleanVar(value=self.perfil.ativo)
+        ttk.Checkbutton(frame_controles, text="Medir latência das fases", variable=self.var_perfil_ativo,
+                        command=self.alternar_perfil).pack(side='left', padx=5)
+
+        ttk.Label(frame_controles, text="Ticks:").pack(side='left', padx=5)
+        self.spin_ticks_cprofile = tk.Spinbox(frame_controles, from_=1, to=100000, increment=10, width=7)
+        self.spin_ticks_cprofile.pack(side='left', padx=5)
+        self.spin_ticks_cprofile.delete(0, 'end')
+        self.spin_ticks_cprofile.insert(0, 100)
+
+        # Um laço por captura (só um perfilador pode estar ativo no processo)
+        self.combo_laco_cprofile = ttk.Combobox(frame_controles, values=['controle', 'interface'],
+                                                state='readonly', width=9)
+        self.combo_laco_cprofile.set('controle')
+        self.combo_laco_cprofile.pack(side='left', padx=5)
+
+        ttk.Button(frame_controles, text="Capturar cProfile", command=self.capturar_cprofile).pack(side='left', padx=5)
+        ttk.Button(frame_controles, text="Limpar", command=self.limpar_desempenho).pack(side='left', padx=5)
+
+        ttk.Label(frame_controles, text="Diagnóstico:").pack(side='left', padx=5)
+        self.combo_diagnostico = ttk.Combobox(frame_controles, values=list(NIVEIS), state='readonly', width=10)
+        self.combo_diagnostico.set(self.diagnostico.nivel)
+        self.combo_diagnostico.bind('<<ComboboxSelected>>',
+                                    lambda evento: self.diagnostico.configurar(self.combo_diagnostico.get()))
+        self.combo_diagnostico.pack(side='left', padx=5)
+
+        frame_latencias = ttk.LabelFrame(aba, text="Latência por Fase (últimos ticks)")
+        frame_latencias.pack(fill='both', expand=True, padx=5, pady=5)
+
+        self.texto_desempenho = tk.Text(frame_latencias, wrap=tk.NONE, height=20, font=("Courier", 10))
+        self.texto_desempenho.pack(fill='both', expand=True, padx=5, pady=5)
+        self.texto_desempenho.config(state='disabled')
+        self.atualizar_desempenho()
+
+    def alternar_perfil(self):
+        self.perfil.ativo = self.var_perfil_ativo.get()
+
+    def limpar_desempenho(self):
+        self.perfil.limpar()
+        self.saturacao.zerar_contadores()
+
+    def capturar_cprofile(self):
+        try:
+            n_ticks = int(self.spin_ticks_cprofile.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Informe um número inteiro de ticks.")
+            return
+        laco = self.combo_laco_cprofile.get()
+        carimbo = time.strftime("%Y%m%d_%H%M%S")
+        try:
+            self.perfil.capturar_cprofile(laco, n_ticks, f"perfil_{laco}_{carimbo}.pstats")
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        messagebox.showinfo("cProfile", f"Capturando {n_ticks} ticks do laço de {laco}.")
+
+    def atualizar_desempenho(self):
+        # Tabela de latências (ms) e histograma móvel de 1 µs a 10 s por fase
+        linhas = [f"{'fase':18s} {'n':>6s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'máx':>9s}  histograma (1 µs .. 10 s)"]
+        for fase, medida in self.perfil.resumo().items():
+            linhas.append(f"{fase:18s} {medida['amostras']:6d} {medida['p50_ms']:9.3f} {medida['p95_ms']:9.3f} "
+                          f"{medida['p99_ms']:9.3f} {medida['max_ms']:9.3f}  {formatar_histograma(medida['histograma'])}")
+        if len(linhas) == 1:
+            linhas.append("Medição desligada ou sem amostras.")
+
+        # Quantas vezes cada política de saturação foi acionada
+        linhas.append("")
+        linhas.append("Saturação: " + "  ".join(f"{politica}={n}" for politica, n in self.saturacao.contadores.items()))
+
+        if self.perfil.falha_captura is not None:
+            linhas.append(self.perfil.falha_captura)
+
+        # Eventos de diagnóstico mais recentes
+        linhas.append("")
+        linhas.append("Eventos recentes:")
+        linhas.extend(self.diagnostico.recentes(10))
+
+        self.texto_desempenho.config(state='normal')
+        self.texto_desempenho.delete('1.0', tk.END)
+        self.texto_desempenho.insert('1.0', "\n".join(linhas))
+        self.texto_desempenho.config(state='disabled')
 
     def iniciar_simulacao(self):
         if not self.executando:
@@ -371,48 +846,63 @@ class InterfaceControleFuzzy:
             self.botao_iniciar.config(state='disabled')
             self.botao_parar.config(state='normal')
             self.botao_reset.config(state='normal')
+
+            # Garante que o laço anterior terminou antes de iniciar outro
+            if self.thread_controle is not None:
+                self.thread_controle.join()
+            self.evento_parada.clear()
+            self.thread_controle = threading.Thread(target=self.executar_laco_controle, daemon=True)
+            self.thread_controle.start()
             self.atualizar()
 
     def parar_simulacao(self):
         if self.executando:
             self.executando = False
+            self.evento_parada.set()
             self.botao_iniciar.config(state='normal')
             self.botao_parar.config(state='disabled')
             self.botao_reset.config(state='normal')
 
     def reset_simulacao(self):
         # Resetando as variáveis de simulação
-        self.temperatura_atual = 20.0
-        self.temperatura_desejada = 25.0
-        self.historico_temp = [self.temperatura_atual]
-        self.historico_potencia = [0.0]
-        self.ultimo_tempo = time.time()
+        with self.trava_estado:
+            self.temperatura_atual = 20.0
+            self.planta.reiniciar(self.temperatura_atual)
+            self.temperatura_desejada = 25.0
+            self.ultimo_tempo = time.time()
+            self.historico.limpar()
+            self.historico.adicionar((self.ultimo_tempo, self.temperatura_atual, 0.0, 0.0, 0.0))
+            self.instantaneo = None
+            self.saturacao.reiniciar()
 
         # Atualizando os widgets
         self.label_temp_desejada.config(text=f"{self.temperatura_desejada:.1f}°C")
         self.escala_temp_desejada.set(self.temperatura_desejada)
         self.label_temp_atual_sim.config(text=f"Temperatura Atual: {self.temperatura_atual:.1f}°C")
         self.label_erro_sim.config(text=f"Erro de Temperatura: {0.0:.1f}°C")
-        self.label_temp_atual_crisp.config(text=f"Temperatura Atual: {self.temperatura_atual:.1f}°C")
-        self.label_variacao_crisp.config(text=f"Variação: 0°C/s")
-        self.label_potencia_crisp.config(text=f"Potência: 0%")
         self.barra_potencia['value'] = 0
+        if "Regras e Informações" in self.abas_construidas:
+            self.label_temp_atual_crisp.config(text=f"Temperatura Atual: {self.temperatura_atual:.1f}°C")
+            self.label_variacao_crisp.config(text=f"Variação: 0°C/s")
+            self.label_potencia_crisp.config(text=f"Potência: 0%")
 
         # Resetando os gráficos
-        self.line_temp.set_data([], [])
-        self.ax_temp.set_xlim(-100, 0)
-        self.ax_temp.set_ylim(0, 50)
-        self.ax_temp.figure.canvas.draw()
-
-        self.line_pot.set_data([], [])
-        self.ax_pot.set_xlim(-100, 0)
-        self.ax_pot.set_ylim(0, 100)
-        self.ax_pot.figure.canvas.draw()
-
-        # Atualizando os textos de fuzzificação e defuzzificação
-        self.atualizar_fuzzy_interno()
-        self.atualizar_variaveis_processos_interface(0.0, 0.0, 0.0)
-        self.atualizar_verificacao_regras(0.0, 0.0, 0.0)
+        if self.canvas is not None:
+            self.line_temp.set_data([], [])
+            self.line_pot.set_data([], [])
+            self.limites_graficos = None
+            self.ajustar_limites_graficos()
+            self.canvas.draw_idle()
+
+        # Atualizando o texto da aba visível; as demais abas já montadas são
+        # atualizadas ao serem exibidas e as não montadas, ao serem abertas
+        aba = self.aba_visivel()
+        for nome in ("Sistema Fuzzy Interno", "Variáveis e Processos", "Verificação das Regras"):
+            if nome in self.abas_construidas:
+                if nome == aba:
+                    self.atualizar_aba_texto(nome)
+                else:
+                    self.abas_desatualizadas.add(nome)
 
         # Desativar o botão Reset se a simulação não estiver executando
         if not self.executando:
@@ -422,6 +912,40 @@ class InterfaceControleFuzzy:
         self.temperatura_desejada = float(valor)
         self.label_temp_desejada.config(text=f"{self.temperatura_desejada:.1f}°C")
 
+    def alternar_telemetria(self):
+        # Só a troca do gravador fica sob a trava; o diálogo é exibido depois,
+        # sem bloquear o laço de controle
+        with self.trava_estado:
+            gravador = self.gravador
+            if gravador is None:
+                self.gravador = GravadorTelemetria(time.strftime("telemetria_%Y%m%d_%H%M%S.fztl"))
+            else:
+                gravador.fechar()
+                self.gravador = None
+
+        if gravador is None:
+            self.botao_telemetria.config(text="Parar Telemetria")
+        else:
+            self.botao_telemetria.config(text="Gravar Telemetria")
+            messagebox.showinfo("Telemetria", f"{gravador.total_registros} passos gravados em {gravador.caminho}")
+
+    def encerrar_telemetria(self):
+        # Grava os registros ainda no buffer ao fechar a aplicação
+        with self.trava_estado:
+            if self.gravador is not None:
+                self.gravador.fechar()
+                self.gravador = None
+
+    def selecionar_motor(self, evento=None):
+        self.motor_inferencia = self.combo_motor.get()
+
+    def selecionar_resolucao_superficie(self, evento=None):
+        resolucao = RESOLUCOES_SUPERFICIE[self.combo_resolucao_superficie.get()]
+        if resolucao != self.resolucao_superficie:
+            # A nova tabela é construída em segundo plano na próxima consulta
+            self.resolucao_superficie = resolucao
+            self.tabela_superficie = None
+
     def atualizar_temperatura(self, potencia):
         tempo_atual = time.time()
         delta_t = tempo_atual - self.ultimo_tempo
@@ -429,51 +953,74 @@ class InterfaceControleFuzzy:
         # Limitar delta_t para evitar grandes variações
         delta_t = min(delta_t, 1.0)  # Limita delta_t a no máximo 1 segundo
 
-        # Ajuste no fator ambiental para simular troca de calor com o ambiente
-        fator_ambiente = -0.05 * (self.temperatura_atual - 20)  # Reduzido para suavizar a variação
-        delta_temp = (potencia / 100.0 * 2.0) * delta_t + fator_ambiente * delta_t  # Ajuste no ganho da potência
+        # Modelo térmico compartilhado com o simulador sem interface
+        temperatura_anterior = self.temperatura_atual
+        self.temperatura_atual = float(self.planta.avancar(potencia, delta_t)[0])
+        delta_temp = self.temperatura_atual - temperatura_anterior
 
-        # Debugging: Print dos valores de delta_temp
-        print(f"Potência: {potencia:.2f}%, Fator Ambiente: {fator_ambiente:.2f}, Delta Temp: {delta_temp:.2f}")
+        if self.diagnostico.ativo():
+            fator_ambiente = -COEFICIENTE_AMBIENTE * (temperatura_anterior - TEMPERATURA_AMBIENTE)
+            self.diagnostico.depurar("Potência: {:.2f}%, Fator Ambiente: {:.2f}, Delta Temp: {:.2f}",
+                                     potencia, fator_ambiente, delta_temp)
 
-        self.temperatura_atual += delta_temp
         self.ultimo_tempo = tempo_atual
         return delta_temp
 
-    def atualizar_graficos_simulacao(self):
-        # Atualiza os gráficos com os históricos
-        tempos = np.arange(-len(self.historico_temp)+1, 1, 1)
-
-        # Atualiza o gráfico de temperatura
-        self.line_temp.set_data(tempos, self.historico_temp)
-        self.ax_temp.set_xlim(min(tempos), max(tempos))
-        self.ax_temp.set_ylim(0, 50)
-        self.ax_temp.figure.canvas.draw()
+    def ajustar_limites_graficos(self):
+        # Altera os limites dos eixos apenas quando eles mudam de fato, pois
+        # isso invalida o fundo em cache e exige redesenhar a figura inteira
+        limites = ((-self.janela_grafico, 0), (0, 50), (0, 100))
+        if limites == self.limites_graficos:
+            return False
+
+        limites_x, limites_temp, limites_pot = limites
+        self.ax_temp.set_xlim(*limites_x)
+        self.ax_temp.set_ylim(*limites_temp)
+        self.ax_pot.set_xlim(*limites_x)
+        self.ax_pot.set_ylim(*limites_pot)
+        self.limites_graficos = limites
+        return True
+
+    def ao_desenhar_graficos(self, evento):
+        # Após cada redesenho completo, guarda o fundo estático (eixos, títulos e
+        # marcações) e desenha as curvas animadas por cima
+        if self.modo_renderizacao != 'blit':
+            return
+        self.fundo_graficos = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax_temp.draw_artist(self.line_temp)
+        self.ax_pot.draw_artist(self.line_pot)
 
-        # Atualiza o gráfico de potência
-        self.line_pot.set_data(tempos, self.historico_potencia)
-        self.ax_pot.set_xlim(min(tempos), max(tempos))
-        self.ax_pot.set_ylim(0, 100)
-        self.ax_pot.figure.canvas.draw()
+    def atualizar_graficos_simulacao(self):
+        # Seleciona as amostras dentro da janela de tempo exibida. As curvas
+        # recebem cópias da janela, pois o laço de controle continua escrevendo
+        # no buffer enquanto o Tk desenha
+        instantes = self.historico['tempo']
+        inicio = np.searchsorted(instantes, instantes[-1] - self.janela_grafico)
+        tempos = instantes[inicio:] - instantes[-1]
+
+        self.line_temp.set_data(tempos, self.historico['temperatura'][inicio:].copy())
+        self.line_pot.set_data(tempos, self.historico['potencia'][inicio:].copy())
+
+        if self.ajustar_limites_graficos() or self.modo_renderizacao != 'blit' or self.fundo_graficos is None:
+            # Redesenho completo agrupado pelo Tk; o fundo é recapturado no draw_event
+            self.canvas.draw_idle()
+            return
+
+        # Blit: restaura o fundo em cache e redesenha apenas as duas curvas
+        self.canvas.restore_region(self.fundo_graficos)
+        self.ax_temp.draw_artist(self.line_temp)
+        self.ax_pot.draw_artist(self.line_pot)
+        self.canvas.blit(self.fig.bbox)
 
     def atualizar_fuzzy_interno(self):
         # Atualiza as informações das funções de pertinência na aba "Sistema Fuzzy Interno"
-        info_fuzzy = "Funções de Pertinência para Erro de Temperatura:\n"
-        for termo, params in self.parametros_erro_valores.items():
-            info_fuzzy += f"  - {termo}: {params}\n"
-
-        info_fuzzy += "\nFunções de Pertinência para Variação de Temperatura:\n"
-        for termo, params in self.parametros_var_valores.items():
-            info_fuzzy += f"  - {termo}: {params}\n"
-
-        info_fuzzy += "\nFunções de Pertinência para Potência:\n"
-        for termo in self.potencia.terms:
-            info_fuzzy += f"  - {termo}: {self.potencia[termo].mf.tolist()}\n"
-
-        self.texto_fuzzy.config(state='normal')
-        self.texto_fuzzy.delete('1.0', tk.END)
-        self.texto_fuzzy.insert('1.0', info_fuzzy)
-        self.texto_fuzzy.config(state='disabled')
+        linhas = ["Funções de Pertinência para Erro de Temperatura:"]
+        linhas += [f"  - {termo}: {params}" for termo, params in self.parametros_erro_valores.items()]
+        linhas += ["", "Funções de Pertinência para Variação de Temperatura:"]
+        linhas += [f"  - {termo}: {params}" for termo, params in self.parametros_var_valores.items()]
+        linhas += ["", "Funções de Pertinência para Potência:"]
+        linhas += [f"  - {termo}: {params}" for termo, params in PARAMETROS_POTENCIA_PADRAO.items()]
+        self.vista_fuzzy.exibir(linhas)
 
     def atualizar_valores_crisp(self, erro, variacao, potencia):
         self.label_temp_atual_crisp.config(text=f"Temperatura Atual: {self.temperatura_atual:.1f}°C")
@@ -481,150 +1028,261 @@ class InterfaceControleFuzzy:
         self.label_potencia_crisp.config(text=f"Potência: {potencia:.1f}%")
         self.barra_potencia['value'] = potencia
 
-    def atualizar_verificacao_regras(self, erro, variacao, potencia):
-        # Atualiza as regras ativas e suas forças de disparo
-        regras_ativas = []
-        for i, regra in enumerate(self.regras, start=1):
-            # Acessa os termos dos antecedentes usando term1 e term2
-            termo_erro = regra.antecedent.term1
-            termo_var = regra.antecedent.term2
-
-            # Calcula os graus de pertinência
-            grau_erro = fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura[termo_erro.label].mf, erro)
-            grau_var = fuzz.interp_membership(self.variacao_temp.universe, self.variacao_temp[termo_var.label].mf, variacao)
-
-            # Calcula a força de disparo como o mínimo dos graus de pertinência
-            firing_strength = min(grau_erro, grau_var)
-
-            if firing_strength > 0:
-                regras_ativas.append(f"Regra {i}: Força de Disparo = {firing_strength:.2f}")
-
-        # Atualiza o texto na aba de verificação das regras
-        self.texto_regras_ativas.config(state='normal')
-        self.texto_regras_ativas.delete('1.0', tk.END)
-        if regras_ativas:
-            self.texto_regras_ativas.insert('1.0', "\n".join(regras_ativas))
-        else:
-            self.texto_regras_ativas.insert('1.0', "Nenhuma regra ativa.")
-        self.texto_regras_ativas.config(state='disabled')
-
-    def atualizar_variaveis_processos_interface(self, erro, variacao, potencia):
-        # Atualiza as variáveis de entrada e seus graus de pertinência
-        info_fuzzificacao = f"Erro de Temperatura: {erro:.1f}°C\n"
-        info_fuzzificacao += f"  - muito_negativo: {fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura['muito_negativo'].mf, erro):.2f}\n"
-        info_fuzzificacao += f"  - negativo: {fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura['negativo'].mf, erro):.2f}\n"
-        info_fuzzificacao += f"  - neutro: {fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura['neutro'].mf, erro):.2f}\n"
-        info_fuzzificacao += f"  - positivo: {fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura['positivo'].mf, erro):.2f}\n"
-        info_fuzzificacao += f"  - muito_positivo: {fuzz.interp_membership(self.erro_temperatura.universe, self.erro_temperatura['muito_positivo'].mf, erro):.2f}\n\n"
-
-        info_fuzzificacao += f"Variação de Temperatura: {variacao:.2f}°C/s\n"
-        info_fuzzificacao += f"  - diminuindo: {fuzz.interp_membership(self.variacao_temp.universe, self.variacao_temp['diminuindo'].mf, variacao):.2f}\n"
-        info_fuzzificacao += f"  - estavel: {fuzz.interp_membership(self.variacao_temp.universe, self.variacao_temp['estavel'].mf, variacao):.2f}\n"
-        info_fuzzificacao += f"  - aumentando: {fuzz.interp_membership(self.variacao_temp.universe, self.variacao_temp['aumentando'].mf, variacao):.2f}\n"
-
-        self.texto_fuzzificacao.config(state='normal')
-        self.texto_fuzzificacao.delete('1.0', tk.END)
-        self.texto_fuzzificacao.insert('1.0', info_fuzzificacao)
-        self.texto_fuzzificacao.config(state='disabled')
+    def atualizar_verificacao_regras(self, fuzzificacao):
+        # Uma linha fixa por regra, após a linha de resumo. Só as regras cuja
+        # força exibida mudou são formatadas e editadas, de modo que o custo
+        # por quadro acompanha as regras que mudam, não o tamanho da base.
+        forcas = fuzzificacao.forcas
+        exibidas = np.where(forcas > 0, np.round(forcas, 2), -1.0)
+        vista = self.vista_regras_ativas
+        if vista.valores is None or len(vista.valores) != len(exibidas):
+            vista.definir([""] * (len(exibidas) + 1))
+            vista.valores = np.full(len(exibidas), np.nan)
+        alteradas = np.flatnonzero(exibidas != vista.valores)
+        if len(alteradas) == 0:
+            return
+        vista.valores = exibidas
+
+        n_ativas = int(np.count_nonzero(exibidas >= 0))
+        alteracoes = [(0, f"Regras ativas: {n_ativas} de {len(exibidas)}" if n_ativas else "Nenhuma regra ativa.")]
+        for i in alteradas.tolist():
+            forca = exibidas[i]
+            alteracoes.append((i + 1, f"Regra {i + 1}: Força de Disparo = {forca:.2f}" if forca >= 0
+                               else f"Regra {i + 1}: inativa"))
+        vista.alterar(alteracoes)
+
+    def atualizar_variaveis_processos_interface(self, fuzzificacao):
+        # Atualiza as variáveis de entrada e seus graus de pertinência (sem
+        # reinterpolar). O número de linhas depende só dos termos, e apenas os
+        # campos que mudaram são editados nos widgets.
+        motor = fuzzificacao.motor
+        linhas = [f"Erro de Temperatura: {fuzzificacao.erro:.1f}°C"]
+        linhas += [f"  - {termo}: {grau:.2f}" for termo, grau in zip(motor.termos_erro, fuzzificacao.graus_erro)]
+        linhas += ["", f"Variação de Temperatura: {fuzzificacao.variacao:.2f}°C/s"]
+        linhas += [f"  - {termo}: {grau:.2f}" for termo, grau in zip(motor.termos_var, fuzzificacao.graus_var)]
+        self.vista_fuzzificacao.exibir(linhas)
 
         # Atualiza o processo de defuzzificação
-        info_defuzzificacao = f"Potência Defuzzificada: {potencia:.2f}%\n"
-        info_defuzzificacao += f"Agregação das Contribuições das Regras:\n"
-        info_defuzzificacao += f"  - Resultado: {potencia:.2f}%"
-
-        self.texto_defuzzificacao.config(state='normal')
-        self.texto_defuzzificacao.delete('1.0', tk.END)
-        self.texto_defuzzificacao.insert('1.0', info_defuzzificacao)
-        self.texto_defuzzificacao.config(state='disabled')
+        potencia = fuzzificacao.potencia
+        linhas = [f"Potência Defuzzificada: {potencia:.2f}%", "Agregação das Contribuições das Regras:"]
+        linhas += [f"  - {termo}: corte em {nivel:.2f}"
+                   for termo, nivel in zip(motor.termos_potencia, fuzzificacao.ativacao)]
+        linhas.append(f"  - Resultado: {potencia:.2f}%")
+        self.vista_defuzzificacao.exibir(linhas)
 
     def aplicar_alteracoes_fuzzy(self):
-        # Coleta os novos parâmetros para Erro de Temperatura
-        for termo, spins in self.parametros_erro.items():
-            try:
-                a = float(spins[0].get())
-                b = float(spins[1].get())
-                c = float(spins[2].get())
-                # Atualiza os valores das funções de pertinência
-                self.parametros_erro_valores[termo] = [a, b, c]
-                self.erro_temperatura[termo].mf = fuzz.trimf(self.erro_temperatura.universe, [a, b, c])
-            except ValueError:
-                messagebox.showerror("Erro", f"Valores inválidos para a função de pertinência '{termo}'. Certifique-se de inserir números válidos.")
-                return
-
-        # Coleta os novos parâmetros para Variação de Temperatura
-        for termo, spins in self.parametros_var.items():
-            try:
-                a = float(spins[0].get())
-                b = float(spins[1].get())
-                c = float(spins[2].get())
-                # Atualiza os valores das funções de pertinência
-                self.parametros_var_valores[termo] = [a, b, c]
-                self.variacao_temp[termo].mf = fuzz.trimf(self.variacao_temp.universe, [a, b, c])
-            except ValueError:
-                messagebox.showerror("Erro", f"Valores inválidos para a função de pertinência '{termo}'. Certifique-se de inserir números válidos.")
-                return
-
-        # Atualiza o sistema fuzzy com as novas funções de pertinência
-        self.configurar_sistema_fuzzy()
-        self.simulacao = ctrl.ControlSystemSimulation(self.sistema_ctrl)
+        # Coleta e valida todos os parâmetros antes de aplicar qualquer alteração
+        novos_parametros = []
+        for variavel, parametros in (('erro', self.parametros_erro), ('variacao', self.parametros_var)):
+            for termo, spins in parametros.items():
+                try:
+                    a = float(spins[0].get())
+                    b = float(spins[1].get())
+                    c = float(spins[2].get())
+                except ValueError:
+                    messagebox.showerror("Erro", f"Valores inválidos para a função de pertinência '{termo}'. Certifique-se de inserir números válidos.")
+                    return
+                if not a <= b <= c:
+                    messagebox.showerror("Erro", f"Os parâmetros da função de pertinência '{termo}' devem satisfazer a <= b <= c.")
+                    return
+                novos_parametros.append((variavel, termo, [a, b, c]))
+
+        # Atualiza apenas os termos alterados, sem reconstruir o sistema fuzzy
+        with self.trava_estado:
+            for variavel, termo, params in novos_parametros:
+                self.atualizar_parametro_termo(variavel, termo, params)
 
         # Atualiza as informações na interface
         self.atualizar_fuzzy_interno()
         messagebox.showinfo("Sucesso", "Funções de pertinência atualizadas com sucesso!")
 
-    def atualizar(self):
-        if self.executando:
+    def carregar_parametros_arquivo(self):
+        caminho = filedialog.askopenfilename(filetypes=[("JSON", "*.json"), ("Todos os arquivos", "*.*")])
+        if not caminho:
+            return
+        try:
+            parametros_erro, parametros_var = carregar_parametros(caminho)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Erro", f"Não foi possível carregar os parâmetros: {e}")
+            return
+
+        # Preenche os campos de edição e aplica pela validação normal
+        for valores, spins_termos in ((parametros_erro, self.parametros_erro), (parametros_var, self.parametros_var)):
+            for termo, spins in spins_termos.items():
+                if termo not in valores:
+                    continue
+                for spin, valor in zip(spins, valores[termo]):
+                    spin.delete(0, 'end')
+                    spin.insert(0, valor)
+        self.aplicar_alteracoes_fuzzy()
+
+    def salvar_parametros_arquivo(self):
+        caminho = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[("JSON", "*.json")])
+        if not caminho:
+            return
+        with self.trava_estado:
+            parametros_erro = copy.deepcopy(self.parametros_erro_valores)
+            parametros_var = copy.deepcopy(self.parametros_var_valores)
+        try:
+            salvar_parametros(caminho, parametros_erro, parametros_var)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar os parâmetros: {e}")
+
+    def selecionar_operadores(self, evento=None):
+        escolhas = {chave: combo.get() for chave, combo in self.combos_operadores.items()}
+        with self.trava_estado:
+            self.motor_vetorizado.configurar_operadores(**escolhas)
+            self.invalidar_motores_derivados()
+
+    def selecionar_saturacao(self, evento=None):
+        escolhas = {chave: combo.get() for chave, combo in self.combos_saturacao.items()}
+        with self.trava_estado:
+            self.saturacao.configurar(**escolhas)
+
+    def atualizar_parametro_termo(self, variavel, termo, params):
+        # Altera a função de pertinência de um único termo e invalida apenas o
+        # que depende dela. Retorna False se os parâmetros não mudaram.
+        # Com a simulação em execução, deve ser chamado com self.trava_estado.
+        if variavel == 'erro':
+            valores, nome_antecedente = self.parametros_erro_valores, 'erro_temperatura'
+        elif variavel == 'variacao':
+            valores, nome_antecedente = self.parametros_var_valores, 'variacao_temp'
+        else:
+            raise ValueError(f"Variável desconhecida: '{variavel}'.")
+
+        params = [float(p) for p in params]
+        if valores[termo] == params:
+            return False
+
+        with self.trava_skfuzzy:
+            valores[termo] = params
+            if self.sistema_ctrl is not None:
+                # O termo é modificado no lugar: as regras e o grafo do
+                # ControlSystem continuam apontando para o mesmo objeto
+                antecedente = getattr(self, nome_antecedente)
+                antecedente[termo].mf = trimf(antecedente.universe, params)
+
+                # Descarta os resultados memorizados pela simulação
+                self.simulacao = self.criar_simulacao(self.sistema_ctrl)
+        self.motor_vetorizado.atualizar_termo(variavel, termo, params)
+        self.invalidar_motores_derivados()
+        return True
+
+    def executar_laco_controle(self):
+        # Laço de controle em thread própria, com período fixo e independente
+        # da taxa de atualização da interface
+        proximo = time.perf_counter()
+        while not self.evento_parada.is_set():
+            self.passo_controle()
+
+            proximo += self.periodo_controle
+            espera = proximo - time.perf_counter()
+            if espera > 0:
+                self.evento_parada.wait(espera)
+            else:
+                proximo = time.perf_counter()  # Atrasado: não tenta recuperar passos perdidos
+
+    def passo_controle(self):
+        perfil = self.perfil
+        perfil.iniciar_tick('controle')
+        with self.trava_estado, perfil.fase('tick_controle'):
             # Calcula o erro de temperatura
             erro = self.temperatura_desejada - self.temperatura_atual
-            print(f"Erro: {erro:.1f}°C")
 
-            # Calcula a variação de temperatura
-            if len(self.historico_temp) > 1:
-                variacao = self.historico_temp[-1] - self.historico_temp[-2]
+            # Calcula a variação de temperatura por segundo entre as duas últimas amostras
+            if len(self.historico) > 1:
+                intervalo = self.historico.ultimo('tempo') - self.historico.ultimo('tempo', 1)
+                variacao = (self.historico.ultimo('temperatura') - self.historico.ultimo('temperatura', 1)) / max(intervalo, 1e-6)
             else:
                 variacao = 0.0
-            print(f"Variação de Temperatura: {variacao:.2f}°C/s")
 
-            # Atualiza o sistema fuzzy com os valores atuais
-            self.simulacao.input['erro_temperatura'] = erro
-            self.simulacao.input['variacao_temperatura'] = variacao
-
-            try:
-                self.simulacao.compute()
-                potencia = self.simulacao.output['potencia']
-                print(f"Potência Calculada: {potencia:.2f}%")
-            except Exception as e:
-                print(f"Erro na computação fuzzy: {e}")
-                potencia = 50.0  # Valor padrão em caso de erro
+            # Calcula a potência com o motor de inferência selecionado
+            with perfil.fase('inferencia'):
+                fuzzificacao = self.inferir(erro, variacao)
+                potencia = fuzzificacao.potencia
+            self.diagnostico.depurar("Erro: {:.1f}°C, Variação de Temperatura: {:.2f}°C/s, Potência Calculada: {:.2f}%",
+                                     erro, variacao, potencia)
 
             # Atualiza a temperatura
-            self.atualizar_temperatura(potencia)
+            with perfil.fase('planta'):
+                self.atualizar_temperatura(potencia)
 
             # Atualiza históricos
-            self.historico_temp.append(self.temperatura_atual)
-            self.historico_potencia.append(potencia)
+            with perfil.fase('historico'):
+                self.historico.adicionar((self.ultimo_tempo, self.temperatura_atual, potencia, erro, variacao))
 
-            # Mantém apenas os últimos 100 pontos
-            if len(self.historico_temp) > 100:
-                self.historico_temp.pop(0)
-                self.historico_potencia.pop(0)
+                if self.gravador is not None:
+                    self.gravador.registrar(self.ultimo_tempo, self.temperatura_desejada, self.temperatura_atual,
+                                            erro, variacao, potencia, fuzzificacao.forcas)
 
-            # Atualiza interfaces
-            self.atualizar_graficos_simulacao()
-            self.label_temp_atual_sim.config(text=f"Temperatura Atual: {self.temperatura_atual:.1f}°C")
-            self.label_erro_sim.config(text=f"Erro de Temperatura: {erro:.1f}°C")
-            self.atualizar_valores_crisp(erro, variacao, potencia)
-            self.atualizar_verificacao_regras(erro, variacao, potencia)
-            self.atualizar_variaveis_processos_interface(erro, variacao, potencia)
+            # Publica o estado mais recente para a interface
+            self.instantaneo = Instantaneo(self.ultimo_tempo, self.temperatura_atual, erro, variacao, potencia, fuzzificacao)
+        caminho = perfil.finalizar_tick('controle')
+        if caminho is not None:
+            self.diagnostico.informar("Perfil cProfile do controle salvo em {}", caminho)
 
-            # Agenda próxima atualização (a cada 1000 ms)
-            self.raiz.after(1000, self.atualizar)
+    def aba_visivel(self):
+        return self.notebook.tab(self.notebook.select(), 'text')
+
+    def atualizar(self):
+        if self.executando:
+            perfil = self.perfil
+            perfil.iniciar_tick('interface')
+            instantaneo = self.instantaneo
+            if instantaneo is not None:
+                erro, variacao, potencia = instantaneo.erro, instantaneo.variacao, instantaneo.potencia
+
+                # Atualiza apenas a aba visível; as demais são atualizadas ao serem exibidas
+                aba = self.aba_visivel()
+                with perfil.fase('quadro_interface'):
+                    if aba == "Simulação em Tempo Real":
+                        if self.canvas is not None:
+                            with perfil.fase('graficos'), self.trava_estado:
+                                self.atualizar_graficos_simulacao()
+                        with perfil.fase('aba_simulacao'):
+                            self.label_temp_atual_sim.config(text=f"Temperatura Atual: {instantaneo.temperatura:.1f}°C")
+                            self.label_erro_sim.config(text=f"Erro de Temperatura: {erro:.1f}°C")
+                            self.barra_potencia['value'] = potencia
+                    elif aba == "Regras e Informações":
+                        with perfil.fase('aba_regras_info'):
+                            self.atualizar_valores_crisp(erro, variacao, potencia)
+                    elif aba == "Verificação das Regras":
+                        with perfil.fase('aba_verificacao'):
+                            self.atualizar_verificacao_regras(instantaneo.fuzzificacao)
+                    elif aba == "Variáveis e Processos":
+                        with perfil.fase('aba_variaveis'):
+                            self.atualizar_variaveis_processos_interface(instantaneo.fuzzificacao)
+                    elif aba == "Superfície de Controle":
+                        with perfil.fase('aba_superficie'):
+                            self.atualizar_explorador()
+                    elif aba == "Desempenho":
+                        self.atualizar_desempenho()
+
+            caminho = perfil.finalizar_tick('interface')
+            if caminho is not None:
+                self.diagnostico.informar("Perfil cProfile da interface salvo em {}", caminho)
+
+            # Agenda o próximo quadro da interface
+            self.raiz.after(self.periodo_interface_ms, self.atualizar)
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sistema de Controle Fuzzy - Chuveiro Inteligente")
+    parser.add_argument('--diagnostico', choices=list(NIVEIS), default='info',
+                        help="Nível das mensagens de diagnóstico ('depuracao' inclui as de cada passo)")
+    parser.add_argument('--amostragem', type=int, default=1,
+                        help="Emite uma a cada N mensagens de depuração e informação de cada tipo")
+    args = parser.parse_args()
+
     raiz = tk.Tk()
-    app = InterfaceControleFuzzy(raiz)
-    raiz.mainloop()
+    app = InterfaceControleFuzzy(raiz, CanalDiagnostico(args.diagnostico, args.amostragem))
+    try:
+        raiz.mainloop()
+    finally:
+        app.encerrar_telemetria()
+        app.diagnostico.fechar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+import numpy as np
+
+
+# Operadores selecionáveis
+OPERADORES_E = ('min', 'produto')
+AGREGACOES = ('max', 'soma_probabilistica')
+
+# Limite de elementos da matriz de forças (N, regras) montada por lote
+ELEMENTOS_POR_LOTE = 1 << 22
+
+
+class BaseRegras:
+    # Base de regras declarativa compilada em arrays de índices.
+    #
+    # `entradas` mapeia o nome de cada variável de entrada para a lista dos
+    # seus termos; a ordem define as colunas da matriz de graus (N, termos),
+    # com os termos de todas as entradas concatenados. Cada regra é uma tupla
+    # com um termo por entrada seguido do termo de saída, por exemplo
+    # ('neutro', 'estavel', 'media'); None indica que a entrada não participa.
+    #
+    # Cada regra vira uma linha de `antecedentes` com os índices globais dos
+    # seus termos (preenchida com a coluna constante 1, neutra para min e
+    # produto). A avaliação é uma coleta graus[:, antecedentes] seguida de
+    # uma redução, com custo linear no número de regras e de antecedentes.
+
+    def __init__(self, entradas, termos_saida, regras, operador_e='min', agregacao='max'):
+        self.entradas = list(entradas)
+        self.termos_saida = list(termos_saida)
+        self.operador_e = operador_e
+        self.agregacao = agregacao
+        self.validar_operadores()
+
+        # Índice global de cada termo: posição na matriz de graus concatenada
+        self.termos = [(entrada, termo) for entrada in self.entradas for termo in entradas[entrada]]
+        indice_termo = {chave: i for i, chave in enumerate(self.termos)}
+        self.n_termos = len(self.termos)
+        self.n_regras = len(regras)
+
+        largura = 1
+        linhas = []
+        saidas = []
+        for regra in regras:
+            if len(regra) != len(self.entradas) + 1:
+                raise ValueError(f"A regra {regra} deve ter um termo por entrada e o termo de saída.")
+            try:
+                linha = [indice_termo[(entrada, termo)]
+                         for entrada, termo in zip(self.entradas, regra[:-1]) if termo is not None]
+                saidas.append(self.termos_saida.index(regra[-1]))
+            except (KeyError, ValueError):
+                raise ValueError(f"Termo desconhecido na regra {regra}.") from None
+            largura = max(largura, len(linha))
+            linhas.append(linha)
+
+        # Antecedentes (regras, largura), completados com a coluna constante
+        self.antecedentes = np.full((self.n_regras, largura), self.n_termos, dtype=np.intp)
+        for i, linha in enumerate(linhas):
+            self.antecedentes[i, :len(linha)] = linha
+        self.idx_saida = np.array(saidas, dtype=np.intp)
+
+        # Regras agrupadas por termo de saída, para a acumulação com reduceat
+        self._ordem = np.argsort(self.idx_saida, kind='stable')
+        termos_presentes, self._inicios = np.unique(self.idx_saida[self._ordem], return_index=True)
+        self._termos_presentes = termos_presentes
+
+    def validar_operadores(self):
+        if self.operador_e not in OPERADORES_E:
+            raise ValueError(f"Operador E desconhecido: '{self.operador_e}'.")
+        if self.agregacao not in AGREGACOES:
+            raise ValueError(f"Agregação desconhecida: '{self.agregacao}'.")
+
+    def indices_entrada(self, entrada):
+        # Colunas da matriz de graus que pertencem a uma entrada
+        return [i for i, (nome, _) in enumerate(self.termos) if nome == entrada]
+
+    def tamanho_lote(self, limite=ELEMENTOS_POR_LOTE):
+        # Maior lote cujas forças (N, regras) cabem em `limite` elementos
+        return max(1, limite // max(self.n_regras, 1))
+
+    def forcas(self, graus):
+        # Forças de disparo (N, regras) a partir dos graus (N, termos)
+        completos = np.empty((graus.shape[0], self.n_termos + 1))
+        completos[:, :self.n_termos] = graus
+        completos[:, self.n_termos] = 1.0
+
+        # Redução coluna a coluna dos antecedentes, sem montar (N, regras, largura)
+        reduzir = np.minimum if self.operador_e == 'min' else np.multiply
+        forcas = completos[:, self.antecedentes[:, 0]]
+        for k in range(1, self.antecedentes.shape[1]):
+            reduzir(forcas, completos[:, self.antecedentes[:, k]], out=forcas)
+        return forcas
+
+    def ativacoes(self, forcas):
+        # Acumulação das regras que apontam para o mesmo termo de saída (N, termos_saida)
+        ativacao = np.zeros((forcas.shape[0], len(self.termos_saida)))
+        if self.n_regras == 0:
+            return ativacao
+        ordenadas = forcas[:, self._ordem]
+        if self.agregacao == 'max':
+            ativacao[:, self._termos_presentes] = np.maximum.reduceat(ordenadas, self._inicios, axis=1)
+        else:
+            ativacao[:, self._termos_presentes] = 1.0 - np.multiply.reduceat(1.0 - ordenadas, self._inicios, axis=1)
+        return ativacao
+
+    def avaliar(self, graus):
+        # Forças e ativações de N entradas já fuzzificadas, em lotes
+        ativacao = np.empty((graus.shape[0], len(self.termos_saida)))
+        lote = self.tamanho_lote()
+        for inicio in range(0, graus.shape[0], lote):
+            ativacao[inicio:inicio + lote] = self.ativacoes(self.forcas(graus[inicio:inicio + lote]))
+        return ativacao
+
+    def descrever(self, nomes_entradas=None, nome_saida='potência'):
+        # Texto de cada regra no formato "SE a E b ENTÃO c", na ordem da base
+        if nomes_entradas is None:
+            nomes_entradas = self.entradas
+        textos = []
+        for linha, saida in zip(self.antecedentes, self.idx_saida):
+            partes = [f"{nomes_entradas[self.entradas.index(self.termos[i][0])]}_{self.termos[i][1]}"
+                      for i in linha if i < self.n_termos]
+            textos.append(f"SE {' E '.join(partes)} ENTÃO {nome_saida}_{self.termos_saida[saida]}")
+        return textos
@@ -0,0 +1,354 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from base_regras import BaseRegras
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from frota import FrotaControladores
+from motor_sugeno import ajustar_sugeno
+from motor_superficie import TabelaSuperficie
+from motor_vetorizado import MotorFuzzyVetorizado
+from simulador import SimuladorChuveiro
+from planta import MODELOS, INTEGRADORES, PlantaLote, modelo_primeira_ordem
+
+
+# Aumento relativo do p50 tolerado antes de acusar regressão
+TOLERANCIA_PADRAO = 0.25
+
+
+def gerar_entradas(n, semente=0):
+    # Entradas realistas: pares (erro, variacao) de trajetórias em malha
+    # fechada com setpoints variados, mais ruído de sensor
+    rng = np.random.default_rng(semente)
+    erros, variacoes = [], []
+    for desejada in (25.0, 30.0, 35.0, 40.0, 45.0):
+        resultado = SimuladorChuveiro(temperatura_desejada=desejada).simular(300)
+        erros.append(resultado['erro'])
+        variacoes.append(resultado['variacao'])
+    erros = np.concatenate(erros)
+    variacoes = np.concatenate(variacoes)
+
+    indices = rng.integers(0, len(erros), n)
+    return (erros[indices] + rng.normal(0.0, 0.2, n),
+            variacoes[indices] + rng.normal(0.0, 0.05, n))
+
+
+def medir(funcao, repeticoes, itens_por_chamada=1, aquecimento=10):
+    # funcao(i) é chamada `repeticoes` vezes; retorna latência por chamada em
+    # microssegundos (p50/p95/p99) e vazão em itens por segundo
+    for i in range(aquecimento):
+        funcao(i)
+
+    duracoes = np.empty(repeticoes)
+    relogio = time.perf_counter_ns
+    for i in range(repeticoes):
+        inicio = relogio()
+        funcao(i)
+        duracoes[i] = relogio() - inicio
+    duracoes /= 1000.0
+
+    return {
+        'repeticoes': repeticoes,
+        'itens_por_chamada': itens_por_chamada,
+        'p50_us': float(np.percentile(duracoes, 50)),
+        'p95_us': float(np.percentile(duracoes, 95)),
+        'p99_us': float(np.percentile(duracoes, 99)),
+        'media_us': float(duracoes.mean()),
+        'vazao_por_s': float(itens_por_chamada * 1e6 / duracoes.mean()),
+    }
+
+
+def criar_interface_parcial(app):
+    # Instância sem janela: apenas o sistema fuzzy de configurar_sistema_fuzzy
+    interface = app.InterfaceControleFuzzy.__new__(app.InterfaceControleFuzzy)
+    interface.parametros_erro_valores = dict(PARAMETROS_ERRO_PADRAO)
+    interface.parametros_var_valores = dict(PARAMETROS_VAR_PADRAO)
+    interface.configurar_sistema_fuzzy()
+    interface.obter_sistema_skfuzzy()
+    return interface
+
+
+def etapas_inferencia(erros, variacoes, rapido):
+    from skfuzzy import control as ctrl
+
+    app, _ = importar_app()
+    n = len(erros)
+    repeticoes = 200 if rapido else 2000
+    resultados = {}
+
+    # Caminho skfuzzy, como montado em configurar_sistema_fuzzy. O cache da
+    # simulação é desativado para medir o cálculo e não a consulta memorizada.
+    interface = criar_interface_parcial(app)
+    simulacao = ctrl.ControlSystemSimulation(interface.sistema_ctrl, cache=False)
+
+    def skfuzzy_compute(i):
+        simulacao.input['erro_temperatura'] = erros[i % n]
+        simulacao.input['variacao_temperatura'] = variacoes[i % n]
+        simulacao.compute()
+
+    resultados['inferencia.skfuzzy'] = medir(skfuzzy_compute, repeticoes // 4)
+
+    motor = MotorFuzzyVetorizado(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)
+    resultados['inferencia.vetorizado'] = medir(lambda i: motor.compute(erros[i % n], variacoes[i % n]), repeticoes)
+
+    lote = 10000
+    resultados['inferencia.vetorizado_lote'] = medir(
+        lambda i: motor.compute_many(erros[:lote], variacoes[:lote]), 20 if rapido else 100, lote)
+
+    sugeno = ajustar_sugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, ordem=1, referencia=motor)
+    resultados['inferencia.sugeno'] = medir(lambda i: sugeno.compute(erros[i % n], variacoes[i % n]), repeticoes)
+    resultados['inferencia.sugeno_lote'] = medir(
+        lambda i: sugeno.compute_many(erros[:lote], variacoes[:lote]), 20 if rapido else 100, lote)
+
+    tabela = TabelaSuperficie(motor, validar=False)
+    resultados['inferencia.superficie'] = medir(lambda i: tabela.compute(erros[i % n], variacoes[i % n]), repeticoes)
+    resultados['inferencia.superficie_lote'] = medir(
+        lambda i: tabela.compute_many(erros[:lote], variacoes[:lote]), 20 if rapido else 100, lote)
+    return resultados
+
+
+def etapas_inicializacao(rapido):
+    # Importação do app em um processo novo e obtenção do sistema skfuzzy
+    # (montagem completa x leitura do cache serializado)
+    import subprocess
+    import tempfile
+    from sistema_skfuzzy import carregar_sistema, montar_sistema
+
+    resultados = {}
+    comando = [sys.executable, '-c', 'import app']
+    resultados['inicializacao.importar_app'] = medir(
+        lambda i: subprocess.run(comando, check=True, cwd=os.path.dirname(os.path.abspath(__file__))),
+        3 if rapido else 10, aquecimento=1)
+
+    resultados['inicializacao.montar_skfuzzy'] = medir(
+        lambda i: montar_sistema(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO), 5 if rapido else 20)
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultados['inicializacao.carregar_skfuzzy'] = medir(
+            lambda i: carregar_sistema(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, diretorio),
+            5 if rapido else 20, aquecimento=1)
+    return resultados
+
+
+def etapas_base_regras(rapido, n_entradas=24, semente=0):
+    # Bases sintéticas grandes: o custo por avaliação deve crescer linearmente
+    # com o número de regras
+    rng = np.random.default_rng(semente)
+    entradas = {f'x{i}': ['baixo', 'medio', 'alto'] for i in range(n_entradas)}
+    saidas = ['baixa', 'media', 'alta']
+    termos_possiveis = ['baixo', 'medio', 'alto'] + [None] * 7
+    graus = rng.random((1000, 3 * n_entradas))
+
+    resultados = {}
+    for n_regras in (1000, 4000):
+        regras = [tuple(rng.choice(termos_possiveis, n_entradas).tolist()) + (str(rng.choice(saidas)),)
+                  for _ in range(n_regras)]
+        base = BaseRegras(entradas, saidas, regras)
+        resultados[f'regras.{n_entradas}_entradas_{n_regras}_regras'] = medir(
+            lambda i: base.avaliar(graus), 5 if rapido else 20, len(graus))
+    return resultados
+
+
+def etapas_simulacao(rapido):
+    repeticoes = 2000 if rapido else 20000
+    resultados = {}
+
+    # O passo da planta de atualizar_temperatura no app: uma planta de
+    # primeira ordem com o integrador exato. No app o passo é o tempo real
+    # entre os ticks e muda a cada passo (rediscretização); com passo fixo, a
+    # discretização fica em cache.
+    planta = PlantaLote(modelo_primeira_ordem(), 1, 20.0, integrador='exato')
+    passos_reais = 0.01 + np.random.default_rng(0).uniform(-0.002, 0.002, 1024)
+    resultados['planta.atualizar_temperatura'] = medir(
+        lambda i: float(planta.avancar(40.0, float(passos_reais[i % len(passos_reais)]))[0]), repeticoes)
+    resultados['planta.atualizar_temperatura_passo_fixo'] = medir(
+        lambda i: float(planta.avancar(40.0, 0.01)[0]), repeticoes)
+
+    passos = 200 if rapido else 1000
+    simulador = SimuladorChuveiro()
+    resultados['simulacao.headless'] = medir(lambda i: simulador.simular(passos), 5 if rapido else 20, passos)
+
+    frota = FrotaControladores(100000, temperatura_desejada=np.linspace(20.0, 45.0, 100000))
+    resultados['simulacao.frota_100k'] = medir(lambda i: frota.passo(1.0), 20 if rapido else 200, 100000)
+
+    # Um passo de 100 mil plantas de cada modelo e integrador
+    potencias = np.linspace(0.0, 100.0, 100000)
+    for nome, modelo in MODELOS.items():
+        for integrador in INTEGRADORES:
+            planta = PlantaLote(modelo(), 100000, integrador=integrador, dt=1.0)
+            resultados[f'planta.{nome}_{integrador}_100k'] = medir(
+                lambda i: planta.avancar(potencias), 20 if rapido else 200, 100000)
+    return resultados
+
+
+class _TextoSimulado:
+    # Substituto de tk.Text quando não há display: mede apenas a montagem do
+    # texto e conta as edições que chegariam ao widget
+    def __init__(self):
+        self.edicoes = 0
+
+    def config(self, **opcoes):
+        pass
+
+    def delete(self, *args):
+        self.edicoes += 1
+
+    def insert(self, indice, texto):
+        self.edicoes += 1
+
+
+def importar_app():
+    import app
+    return app, _tem_display()
+
+
+def _tem_display():
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def etapas_interface(erros, variacoes, rapido):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    app, tem_display = importar_app()
+    plt.switch_backend('Agg')
+    repeticoes = 100 if rapido else 1000
+    n = len(erros)
+    resultados = {}
+
+    # Instância parcial: apenas os atributos usados pelos métodos medidos
+    interface = criar_interface_parcial(app)
+    interface.janela_grafico = 100.0
+    interface.historico = app.BufferCircular(100000, app.CANAIS_HISTORICO)
+    for i in range(1000):
+        interface.historico.adicionar((i * 0.1, 20.0 + i * 0.01, 40.0, 5.0, 0.1))
+
+    for modo in ('blit', 'completo'):
+        interface.modo_renderizacao = modo
+        interface.fig, (interface.ax_temp, interface.ax_pot) = plt.subplots(2, 1, figsize=(8, 6))
+        interface.line_temp, = interface.ax_temp.plot([], [], animated=modo == 'blit')
+        interface.line_pot, = interface.ax_pot.plot([], [], animated=modo == 'blit')
+        interface.canvas = FigureCanvasAgg(interface.fig)
+        interface.fundo_graficos = None
+        interface.limites_graficos = None
+        interface.canvas.mpl_connect('draw_event', interface.ao_desenhar_graficos)
+        interface.ajustar_limites_graficos()
+        interface.canvas.draw()
+
+        # No canvas Agg, draw_idle desenha imediatamente: o tempo medido inclui
+        # o redesenho que o Tk faria logo em seguida
+        def graficos(i):
+            interface.historico.adicionar((100.0 + i * 0.1, 25.0, 40.0, 0.0, 0.0))
+            interface.atualizar_graficos_simulacao()
+
+        resultados[f'interface.graficos_{modo}'] = medir(graficos, repeticoes // (1 if modo == 'blit' else 5))
+        plt.close(interface.fig)
+
+    # Abas de texto: widgets reais com display, substitutos sem display
+    if tem_display:
+        import tkinter as tk
+        raiz = tk.Tk()
+        raiz.withdraw()
+        fabrica = lambda: tk.Text(raiz)
+    else:
+        fabrica = _TextoSimulado
+    interface.vista_regras_ativas = app.TextoIncremental(fabrica())
+    interface.vista_fuzzificacao = app.TextoIncremental(fabrica())
+    interface.vista_defuzzificacao = app.TextoIncremental(fabrica())
+    sufixo = '' if tem_display else '_simulado'
+
+    resultados['interface.verificacao_regras' + sufixo] = medir(
+        lambda i: interface.atualizar_verificacao_regras(
+            interface.motor_vetorizado.inferir(erros[i % n], variacoes[i % n])), repeticoes)
+    resultados['interface.variaveis_processos' + sufixo] = medir(
+        lambda i: interface.atualizar_variaveis_processos_interface(
+            interface.motor_vetorizado.inferir(erros[i % n], variacoes[i % n])), repeticoes)
+
+    # Bases de regras crescentes com poucas regras ativas por quadro, como no
+    # controlador: o custo deve acompanhar as regras que mudam, não o total
+    class Diagnostico:
+        def __init__(self, forcas):
+            self.forcas = forcas
+
+    for n_regras in (15, 150, 600):
+        interface.vista_regras_ativas = app.TextoIncremental(fabrica())
+        posicoes = np.random.default_rng(0).integers(0, n_regras, size=(64, 4))
+
+        def verificacao(i):
+            forcas = np.zeros(n_regras)
+            forcas[posicoes[(i // 8) % len(posicoes)]] = 0.25 + 0.5 * abs(np.sin(i * 0.1))
+            interface.atualizar_verificacao_regras(Diagnostico(forcas))
+
+        resultados[f'interface.verificacao_regras_{n_regras}' + sufixo] = medir(verificacao, repeticoes)
+    return resultados
+
+
+def comparar(resultados, linha_base, tolerancia):
+    # Lista as etapas cujo p50 piorou além da tolerância
+    regressoes = []
+    for etapa, medida in resultados.items():
+        base = linha_base.get('etapas', {}).get(etapa)
+        if base is None:
+            continue
+        razao = medida['p50_us'] / max(base['p50_us'], 1e-9)
+        if razao > 1.0 + tolerancia:
+            regressoes.append((etapa, base['p50_us'], medida['p50_us'], razao))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do controlador fuzzy.")
+    parser.add_argument('--saida', default=None, help="Arquivo JSON para salvar os resultados")
+    parser.add_argument('--linha-base', default=None, help="JSON de uma execução anterior para comparação")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO)
+    parser.add_argument('--rapido', action='store_true', help="Menos repetições (para verificação rápida)")
+    parser.add_argument('--sem-interface', action='store_true', help="Ignora as etapas da interface gráfica")
+    args = parser.parse_args()
+
+    erros, variacoes = gerar_entradas(10000)
+    etapas = {}
+    etapas.update(etapas_inicializacao(args.rapido))
+    etapas.update(etapas_inferencia(erros, variacoes, args.rapido))
+    etapas.update(etapas_base_regras(args.rapido))
+    etapas.update(etapas_simulacao(args.rapido))
+    if not args.sem_interface:
+        etapas.update(etapas_interface(erros, variacoes, args.rapido))
+
+    print(f"{'etapa':40s} {'p50 (us)':>12s} {'p95 (us)':>12s} {'p99 (us)':>12s} {'itens/s':>14s}")
+    for etapa, medida in etapas.items():
+        print(f"{etapa:40s} {medida['p50_us']:12.1f} {medida['p95_us']:12.1f} "
+              f"{medida['p99_us']:12.1f} {medida['vazao_por_s']:14.0f}")
+
+    resultado = {
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'numpy': np.__version__,
+        'etapas': etapas,
+    }
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+
+    if args.linha_base:
+        with open(args.linha_base, encoding='utf-8') as arquivo:
+            linha_base = json.load(arquivo)
+        regressoes = comparar(etapas, linha_base, args.tolerancia)
+        if regressoes:
+            print("\nREGRESSÕES DE DESEMPENHO:")
+            for etapa, antes, depois, razao in regressoes:
+                print(f"  {etapa}: p50 {antes:.1f} us -> {depois:.1f} us ({razao:.2f}x)")
+            sys.exit(1)
+        print("\nNenhuma regressão em relação à linha de base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class BufferCircular:
+    # Histórico de capacidade fixa para vários canais numéricos.
+    # Cada amostra é escrita duas vezes (posições i e i + capacidade), de modo
+    # que as últimas n amostras estão sempre contíguas na memória e podem ser
+    # devolvidas como visões NumPy ordenadas, sem cópia e sem deslocamentos.
+
+    def __init__(self, capacidade, canais, dtype=float):
+        if capacidade < 1:
+            raise ValueError("A capacidade do buffer deve ser positiva.")
+
+        self.capacidade = int(capacidade)
+        self.canais = tuple(canais)
+        self._indices = {canal: i for i, canal in enumerate(self.canais)}
+        self._dados = np.zeros((len(self.canais), 2 * self.capacidade), dtype=dtype)
+        self._posicao = 0  # Próxima posição de escrita em [0, capacidade)
+        self._tamanho = 0
+
+    def __len__(self):
+        return self._tamanho
+
+    def adicionar(self, valores):
+        # valores: sequência na mesma ordem de self.canais
+        posicao = self._posicao
+        self._dados[:, posicao] = valores
+        self._dados[:, posicao + self.capacidade] = valores
+
+        self._posicao = posicao + 1 if posicao + 1 < self.capacidade else 0
+        if self._tamanho < self.capacidade:
+            self._tamanho += 1
+
+    def visao(self, canal, n=None):
+        # Visão somente leitura das últimas n amostras do canal, da mais antiga
+        # para a mais recente
+        if n is None or n > self._tamanho:
+            n = self._tamanho
+        fim = self._posicao + self.capacidade if self._tamanho == self.capacidade else self._posicao
+        visao = self._dados[self._indices[canal], fim - n:fim]
+        visao.flags.writeable = False
+        return visao
+
+    def __getitem__(self, canal):
+        return self.visao(canal)
+
+    def ultimo(self, canal, atras=0):
+        # Amostra mais recente (atras=0) ou anterior (atras=1, 2, ...)
+        if atras >= self._tamanho:
+            raise IndexError("O histórico não possui amostras suficientes.")
+        indice = self._posicao - 1 - atras
+        if indice < 0:
+            indice += self.capacidade
+        return float(self._dados[self._indices[canal], indice])
+
+    def limpar(self):
+        self._posicao = 0
+        self._tamanho = 0
@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+
+
+# Universos de discurso
+UNIVERSO_ERRO = np.arange(-30, 31, 1)
+UNIVERSO_VARIACAO = np.arange(-10, 11, 1)
+UNIVERSO_POTENCIA = np.arange(0, 101, 1)
+
+# Parâmetros padrão das funções de pertinência triangulares [a, b, c]
+PARAMETROS_ERRO_PADRAO = {
+    'muito_negativo': [-30, -30, -15],
+    'negativo': [-20, -10, 0],
+    'neutro': [-5, 0, 5],
+    'positivo': [0, 10, 20],
+    'muito_positivo': [15, 30, 30]
+}
+
+PARAMETROS_VAR_PADRAO = {
+    'diminuindo': [-10, -10, 0],
+    'estavel': [-2, 0, 2],
+    'aumentando': [0, 10, 10]
+}
+
+PARAMETROS_POTENCIA_PADRAO = {
+    'baixa': [0, 0, 50],
+    'media': [25, 50, 75],
+    'alta': [50, 100, 100]
+}
+
+# Base de regras: (termo do erro, termo da variação, termo da potência)
+REGRAS = [
+    # Regras para Erro Muito Negativo (desired << actual) -> diminuir potência
+    ('muito_negativo', 'diminuindo', 'baixa'),
+    ('muito_negativo', 'estavel', 'baixa'),
+    ('muito_negativo', 'aumentando', 'baixa'),
+
+    # Regras para Erro Negativo (desired < actual)
+    ('negativo', 'diminuindo', 'media'),
+    ('negativo', 'estavel', 'media'),
+    ('negativo', 'aumentando', 'baixa'),
+
+    # Regras para Erro Neutro (desired ≈ actual)
+    ('neutro', 'diminuindo', 'media'),
+    ('neutro', 'estavel', 'media'),
+    ('neutro', 'aumentando', 'media'),
+
+    # Regras para Erro Positivo (desired > actual)
+    ('positivo', 'diminuindo', 'alta'),
+    ('positivo', 'estavel', 'media'),
+    ('positivo', 'aumentando', 'baixa'),
+
+    # Regras para Erro Muito Positivo (desired >> actual)
+    ('muito_positivo', 'diminuindo', 'alta'),
+    ('muito_positivo', 'estavel', 'alta'),
+    ('muito_positivo', 'aumentando', 'alta'),
+]
+
+
+def trimf(universo, params):
+    # Equivalente NumPy de skfuzzy.trimf
+    a, b, c = params
+    if not a <= b <= c:
+        raise ValueError("Os parâmetros da função triangular devem satisfazer a <= b <= c.")
+
+    universo = np.asarray(universo, dtype=float)
+    mf = np.zeros(len(universo))
+
+    # Lado esquerdo
+    if a != b:
+        idx = np.nonzero(np.logical_and(a < universo, universo < b))[0]
+        mf[idx] = (universo[idx] - a) / float(b - a)
+
+    # Lado direito
+    if b != c:
+        idx = np.nonzero(np.logical_and(b < universo, universo < c))[0]
+        mf[idx] = (c - universo[idx]) / float(c - b)
+
+    mf[universo == b] = 1
+    return mf
+
+
+def trapmf(universo, params):
+    # Equivalente NumPy de skfuzzy.trapmf
+    a, b, c, d = params
+    if not a <= b <= c <= d:
+        raise ValueError("Os parâmetros da função trapezoidal devem satisfazer a <= b <= c <= d.")
+
+    universo = np.asarray(universo, dtype=float)
+    mf = np.ones(len(universo))
+
+    idx = universo <= b
+    mf[idx] = trimf(universo[idx], [a, b, b])
+    idx = universo >= c
+    mf[idx] = trimf(universo[idx], [c, c, d])
+    mf[np.logical_or(universo < a, universo > d)] = 0
+    return mf
+
+
+def carregar_parametros(caminho):
+    # Lê um conjunto de parâmetros salvo com salvar_parametros
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return dados['parametros_erro'], dados['parametros_var']
+
+
+def salvar_parametros(caminho, parametros_erro, parametros_var):
+    dados = {'parametros_erro': parametros_erro, 'parametros_var': parametros_var}
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, indent=4)
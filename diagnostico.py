@@ -0,0 +1,125 @@
+import sys
+import threading
+import time
+from collections import deque
+
+
+# Níveis em ordem crescente de severidade
+DEPURACAO = 10
+INFO = 20
+AVISO = 30
+ERRO = 40
+DESLIGADO = 100
+
+NIVEIS = {'depuracao': DEPURACAO, 'info': INFO, 'aviso': AVISO, 'erro': ERRO, 'desligado': DESLIGADO}
+NOMES_NIVEIS = {valor: nome for nome, valor in NIVEIS.items()}
+
+
+class CanalDiagnostico:
+    # Mensagens de diagnóstico com níveis, amostragem e escrita em segundo
+    # plano. Cada evento é guardado como (instante, nível, modelo, argumentos)
+    # e só é formatado com str.format ao ser escrito pela thread de descarga
+    # ou consultado em `recentes`. Abaixo do nível configurado, uma chamada
+    # custa apenas uma comparação de inteiros.
+    #
+    # Com `amostragem` = N, mensagens de depuração e informação são emitidas
+    # uma a cada N ocorrências do mesmo modelo; avisos e erros, sempre. O
+    # anel guarda os últimos `capacidade_anel` eventos emitidos, mesmo depois
+    # de escritos, para análise após uma falha.
+
+    def __init__(self, nivel='info', amostragem=1, capacidade_anel=1000, destino=None, intervalo_descarga=0.5):
+        self.amostragem = max(1, int(amostragem))
+        self.destino = destino if destino is not None else sys.stdout
+        self.intervalo_descarga = float(intervalo_descarga)
+        self.anel = deque(maxlen=capacidade_anel)
+        self._pendentes = deque()
+        self._ocorrencias = {}
+        self._evento_parada = threading.Event()
+        self._trava_thread = threading.Lock()
+        self._thread = None
+        self.configurar(nivel)
+
+    def configurar(self, nivel):
+        if nivel not in NIVEIS:
+            raise ValueError(f"Nível de diagnóstico desconhecido: '{nivel}'.")
+        self.nivel = nivel
+        self._limiar = NIVEIS[nivel]
+
+    def ativo(self, nivel=DEPURACAO):
+        # Para evitar calcular argumentos caros quando o nível está desligado
+        return nivel >= self._limiar
+
+    def depurar(self, modelo, *args):
+        if self._limiar <= DEPURACAO:
+            self._registrar(DEPURACAO, modelo, args)
+
+    def informar(self, modelo, *args):
+        if self._limiar <= INFO:
+            self._registrar(INFO, modelo, args)
+
+    def avisar(self, modelo, *args):
+        if self._limiar <= AVISO:
+            self._registrar(AVISO, modelo, args)
+
+    def erro(self, modelo, *args):
+        if self._limiar <= ERRO:
+            self._registrar(ERRO, modelo, args)
+
+    def _registrar(self, nivel, modelo, args):
+        if nivel < AVISO and self.amostragem > 1:
+            n = self._ocorrencias.get(modelo, 0)
+            self._ocorrencias[modelo] = n + 1
+            if n % self.amostragem:
+                return
+        evento = (time.time(), nivel, modelo, args)
+        self.anel.append(evento)
+        self._pendentes.append(evento)
+        if self._thread is None:
+            self._iniciar_descarga()
+
+    def _iniciar_descarga(self):
+        with self._trava_thread:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._laco_descarga, daemon=True)
+                self._thread.start()
+
+    def _laco_descarga(self):
+        while not self._evento_parada.wait(self.intervalo_descarga):
+            self.descarregar()
+        self.descarregar()
+
+    @staticmethod
+    def formatar(evento):
+        instante, nivel, modelo, args = evento
+        return (f"{time.strftime('%H:%M:%S', time.localtime(instante))}.{int(instante * 1000) % 1000:03d} "
+                f"[{NOMES_NIVEIS[nivel]}] {modelo.format(*args)}")
+
+    def descarregar(self):
+        # Escreve de uma vez todos os eventos pendentes
+        linhas = []
+        while True:
+            try:
+                evento = self._pendentes.popleft()
+            except IndexError:
+                break
+            linhas.append(self.formatar(evento))
+        if linhas:
+            self.destino.write("\n".join(linhas) + "\n")
+            self.destino.flush()
+
+    def recentes(self, n=None):
+        # Últimos eventos do anel, já formatados
+        eventos = list(self.anel)
+        if n is not None:
+            eventos = eventos[-n:]
+        return [self.formatar(evento) for evento in eventos]
+
+    def fechar(self):
+        # Encerra a thread de descarga, escrevendo o que estiver pendente
+        with self._trava_thread:
+            if self._thread is not None:
+                self._evento_parada.set()
+                self._thread.join()
+                self._thread = None
+                self._evento_parada.clear()
+        self.descarregar()
@@ -0,0 +1,110 @@
+import numpy as np
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from motor_superficie import TabelaSuperficie
+from motor_vetorizado import MotorFuzzyVetorizado
+from saturacao import PoliticaSaturacao
+from simulador import variacao_temperatura
+
+
+class FrotaControladores:
+    # N chuveiros independentes controlados pela mesma base de regras.
+    # O estado fica em estrutura de arrays (um array por grandeza) e cada passo
+    # avança todas as unidades com uma única inferência vetorizada e uma única
+    # atualização da planta.
+    #
+    # Cada unidade pode usar um conjunto próprio de parâmetros das funções de
+    # pertinência: `conjuntos_parametros` é uma lista de pares
+    # (parametros_erro, parametros_var) e `conjunto` indica o índice de cada unidade.
+    #
+    # motor='tabela' consulta superfícies pré-calculadas (uma por conjunto);
+    # motor='exato' usa o motor vetorizado.
+    #
+    # `planta` (um PlantaLote de planta.py com n_unidades plantas) substitui o
+    # passo de Euler do modelo de primeira ordem.
+    #
+    # `saturacao` (PoliticaSaturacao) trata as entradas fora dos universos e
+    # as unidades sem regra ativa; com 'manter', cada unidade mantém a sua
+    # própria última potência.
+
+    def __init__(self, n_unidades, temperatura_inicial=20.0, temperatura_desejada=25.0,
+                 conjuntos_parametros=None, conjunto=None, motor='tabela',
+                 resolucao_tabela=(0.25, 0.125), planta=None, saturacao=None):
+        if motor not in ('tabela', 'exato'):
+            raise ValueError(f"Motor desconhecido: '{motor}'.")
+        if conjuntos_parametros is None:
+            conjuntos_parametros = [(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)]
+
+        self.n_unidades = int(n_unidades)
+        self.motor = motor
+        self.saturacao = saturacao if saturacao is not None else PoliticaSaturacao()
+
+        # Estado de cada unidade
+        self.temperatura = np.full(self.n_unidades, temperatura_inicial, dtype=float)
+        self.temperatura_desejada = np.broadcast_to(
+            np.asarray(temperatura_desejada, dtype=float), (self.n_unidades,)).copy()
+        self.temperatura_anterior = self.temperatura.copy()
+        self.potencia = np.full(self.n_unidades, self.saturacao.valor_padrao)
+        if planta is not None:
+            if planta.n_plantas != self.n_unidades:
+                raise ValueError("A planta deve ter uma unidade por controlador.")
+            planta.reiniciar(self.temperatura)
+        self.planta = planta
+        if conjunto is None:
+            self.conjunto = np.zeros(self.n_unidades, dtype=np.intp)
+        else:
+            self.conjunto = np.asarray(conjunto, dtype=np.intp)
+            if self.conjunto.shape != (self.n_unidades,):
+                raise ValueError("É necessário um índice de conjunto de parâmetros por unidade.")
+            if self.conjunto.min() < 0 or self.conjunto.max() >= len(conjuntos_parametros):
+                raise ValueError("Índice de conjunto de parâmetros fora da faixa.")
+
+        # Unidades de cada conjunto (todas, com um único conjunto)
+        if len(conjuntos_parametros) == 1:
+            self.unidades_conjunto = [slice(None)]
+        else:
+            self.unidades_conjunto = [np.flatnonzero(self.conjunto == i) for i in range(len(conjuntos_parametros))]
+
+        # Um motor por conjunto de parâmetros
+        self.motores = [MotorFuzzyVetorizado(params_erro, params_var)
+                        for params_erro, params_var in conjuntos_parametros]
+
+        if motor == 'tabela':
+            passo_erro, passo_variacao = resolucao_tabela
+            # As tabelas guardam NaN onde nenhuma regra dispara; a política de
+            # saturação decide a potência dessas unidades a cada passo
+            self.tabelas = [TabelaSuperficie(m, passo_erro, passo_variacao, validar=False) for m in self.motores]
+
+    def inferir(self, erros, variacoes):
+        motores = self.tabelas if self.motor == 'tabela' else self.motores
+        potencia = np.empty(self.n_unidades)
+        for motor, unidades in zip(motores, self.unidades_conjunto):
+            potencia[unidades] = self.saturacao.calcular_muitos(
+                motor, erros[unidades], variacoes[unidades], anteriores=self.potencia[unidades])
+        return potencia
+
+    def passo(self, dt):
+        # Controlador e planta de todas as unidades em um único passo
+        erro = self.temperatura_desejada - self.temperatura
+        variacao = (self.temperatura - self.temperatura_anterior) / dt
+
+        self.potencia = self.inferir(erro, variacao)
+
+        self.temperatura_anterior[:] = self.temperatura
+        if self.planta is None:
+            self.temperatura += variacao_temperatura(self.temperatura, self.potencia, dt)
+        else:
+            self.temperatura[:] = self.planta.avancar(self.potencia, dt)
+        return self.potencia
+
+    def simular(self, passos, dt=1.0, registrar=False):
+        # Com registrar=True retorna a trajetória de temperatura (passos + 1, N)
+        trajetoria = None
+        if registrar:
+            trajetoria = np.empty((passos + 1, self.n_unidades))
+            trajetoria[0] = self.temperatura
+        for k in range(1, passos + 1):
+            self.passo(dt)
+            if registrar:
+                trajetoria[k] = self.temperatura
+        return trajetoria
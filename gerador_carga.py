@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from simulador import variacao_temperatura
+
+
+class ConexaoLinhas:
+    # Cliente do protocolo de linhas JSON (TCP ou socket Unix)
+
+    def __init__(self, leitor, escritor):
+        self.leitor = leitor
+        self.escritor = escritor
+
+    async def enviar(self, leitura):
+        self.escritor.write(json.dumps(leitura).encode('utf-8') + b"\n")
+        await self.escritor.drain()
+        return json.loads(await self.leitor.readline())
+
+    def fechar(self):
+        self.escritor.close()
+
+
+class ConexaoHttp:
+    # Cliente HTTP/1.1 mínimo com conexão persistente; None indica 503
+
+    def __init__(self, leitor, escritor, host):
+        self.leitor = leitor
+        self.escritor = escritor
+        self.host = host
+
+    async def enviar(self, leitura):
+        corpo = json.dumps(leitura).encode('utf-8')
+        self.escritor.write(
+            f"POST /leitura HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n".encode('latin-1') + corpo)
+        await self.escritor.drain()
+
+        status = int((await self.leitor.readline()).split()[1])
+        tamanho = 0
+        while True:
+            linha = await self.leitor.readline()
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = linha.decode('latin-1').partition(':')
+            if nome.strip().lower() == 'content-length':
+                tamanho = int(valor)
+        resposta = json.loads(await self.leitor.readexactly(tamanho))
+        return None if status == 503 else resposta
+
+    def fechar(self):
+        self.escritor.close()
+
+
+async def conectar(transporte, host, porta, caminho_unix):
+    if transporte == 'unix':
+        leitor, escritor = await asyncio.open_unix_connection(caminho_unix)
+    else:
+        leitor, escritor = await asyncio.open_connection(host, porta)
+    if transporte == 'http':
+        return ConexaoHttp(leitor, escritor, host)
+    return ConexaoLinhas(leitor, escritor)
+
+
+async def cliente(conexao, unidades, desejada, duracao, dt, latencias, contagem):
+    # Cada conexão percorre suas unidades em rodízio; a temperatura de cada
+    # unidade evolui com o modelo térmico e a potência recebida, em malha
+    # fechada através do serviço
+    temperaturas = {unidade: 20.0 for unidade in unidades}
+    tempos = {unidade: 0.0 for unidade in unidades}
+    fim = time.perf_counter() + duracao
+    while time.perf_counter() < fim:
+        for unidade in unidades:
+            leitura = {'unidade': unidade, 'temperatura': temperaturas[unidade], 'desejada': desejada,
+                       'tempo': tempos[unidade]}
+            inicio = time.perf_counter()
+            resposta = await conexao.enviar(leitura)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta is None or 'potencia' not in resposta:
+                contagem['rejeitadas'] += 1
+                continue
+            contagem['respondidas'] += 1
+            temperaturas[unidade] += variacao_temperatura(temperaturas[unidade], resposta['potencia'], dt)
+            tempos[unidade] += dt
+
+
+async def executar(args):
+    conexoes = [await conectar(args.transporte, args.host, args.porta, args.unix) for _ in range(args.conexoes)]
+    latencias = []
+    contagem = {'respondidas': 0, 'rejeitadas': 0}
+    inicio = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            cliente(conexao, [f"u{i}_{j}" for j in range(args.unidades_por_conexao)], args.desejada,
+                    args.duracao, args.dt, latencias, contagem)
+            for i, conexao in enumerate(conexoes)))
+    finally:
+        for conexao in conexoes:
+            conexao.fechar()
+    decorrido = time.perf_counter() - inicio
+
+    latencias_ms = np.array(latencias) * 1000.0
+    p50, p95, p99, p999 = np.percentile(latencias_ms, [50, 95, 99, 99.9]) if len(latencias_ms) else (0.0,) * 4
+    print(f"Conexões: {args.conexoes}  Unidades: {args.conexoes * args.unidades_por_conexao}")
+    print(f"Respondidas: {contagem['respondidas']}  Rejeitadas: {contagem['rejeitadas']}")
+    print(f"Vazão: {contagem['respondidas'] / decorrido:.0f} leituras/s")
+    print(f"Latência (ms): p50={p50:.3f} p95={p95:.3f} p99={p99:.3f} p99.9={p999:.3f} "
+          f"máx={latencias_ms.max() if len(latencias_ms) else 0.0:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de controle fuzzy.")
+    parser.add_argument('--transporte', choices=('tcp', 'unix', 'http'), default='tcp')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', default='/tmp/controle_fuzzy.sock')
+    parser.add_argument('--conexoes', type=int, default=64)
+    parser.add_argument('--unidades-por-conexao', type=int, default=4)
+    parser.add_argument('--desejada', type=float, default=35.0)
+    parser.add_argument('--duracao', type=float, default=5.0, help="Duração do teste em segundos")
+    parser.add_argument('--dt', type=float, default=1.0, help="Passo do modelo térmico de cada unidade")
+    args = parser.parse_args()
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
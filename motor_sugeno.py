@@ -0,0 +1,198 @@
+import argparse
+import json
+
+import numpy as np
+
+from definicao_fuzzy import (
+    UNIVERSO_POTENCIA, PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, PARAMETROS_POTENCIA_PADRAO, REGRAS,
+    carregar_parametros
+)
+from motor_vetorizado import MotorFuzzyVetorizado, ResultadoFuzzificacao, amostrar_pertinencia
+from simulador import SimuladorChuveiro
+
+
+ORDENS = (0, 1)
+
+
+def consequentes_iniciais(regras=REGRAS, parametros_potencia=None):
+    # Ordem zero a partir do Mamdani: cada regra produz o centróide do seu
+    # conjunto de saída
+    if parametros_potencia is None:
+        parametros_potencia = PARAMETROS_POTENCIA_PADRAO
+    centroides = {}
+    for termo, params in parametros_potencia.items():
+        mf = amostrar_pertinencia(UNIVERSO_POTENCIA, params)
+        centroides[termo] = float(np.sum(mf * UNIVERSO_POTENCIA) / np.sum(mf))
+    return np.array([[centroides[regra[-1]]] for regra in regras])
+
+
+class MotorSugeno(MotorFuzzyVetorizado):
+    # Controlador Takagi-Sugeno com os mesmos antecedentes e a mesma base de
+    # regras do Mamdani. Cada regra produz z = p * erro + q * variacao + r
+    # (primeira ordem) ou z = r (ordem zero), e a saída é a média das saídas
+    # ponderada pelas forças de disparo, sem agregação nem defuzzificação.
+    #
+    # `consequentes` tem forma (regras, 1) na ordem zero, com as colunas [r],
+    # ou (regras, 3) na primeira ordem, com as colunas [p, q, r].
+
+    def __init__(self, parametros_erro, parametros_var, consequentes=None, ordem=None,
+                 regras=REGRAS, tamanho_lote=4096, operador_e='min'):
+        super().__init__(parametros_erro, parametros_var, regras=regras,
+                         tamanho_lote=tamanho_lote, operador_e=operador_e)
+        if consequentes is None:
+            consequentes = consequentes_iniciais(regras)
+        consequentes = np.asarray(consequentes, dtype=float)
+        if consequentes.ndim == 1:
+            consequentes = consequentes[:, None]
+        if ordem is None:
+            ordem = 0 if consequentes.shape[1] == 1 else 1
+        if ordem not in ORDENS:
+            raise ValueError(f"Ordem desconhecida: {ordem}.")
+        if consequentes.shape != (self.n_regras, 1 if ordem == 0 else 3):
+            raise ValueError("Os consequentes devem ter uma linha por regra: [r] na ordem zero "
+                             "ou [p, q, r] na primeira ordem.")
+        self.ordem = ordem
+        self.consequentes = consequentes
+
+    def entradas_limitadas(self, erros, variacoes):
+        # Entradas dos consequentes de primeira ordem, limitadas aos universos
+        # como na fuzzificação
+        return (np.clip(erros, self.universo_erro[0], self.universo_erro[-1]),
+                np.clip(variacoes, self.universo_var[0], self.universo_var[-1]))
+
+    def saidas_regras(self, erros, variacoes):
+        # Saída de cada regra (N, regras)
+        if self.ordem == 0:
+            return np.broadcast_to(self.consequentes[:, 0], (len(erros), self.n_regras))
+        erros, variacoes = self.entradas_limitadas(erros, variacoes)
+        p, q, r = self.consequentes.T
+        return erros[:, None] * p + variacoes[:, None] * q + r
+
+    def media_ponderada(self, forcas, erros, variacoes):
+        # Média ponderada das saídas das regras; NaN onde nenhuma regra dispara
+        soma = forcas.sum(axis=1)
+        ponderada = (forcas * self.saidas_regras(erros, variacoes)).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(soma > 0, ponderada / soma, np.nan)
+
+    def compute_many(self, erros, variacoes):
+        erros, variacoes = np.broadcast_arrays(np.asarray(erros, dtype=float),
+                                               np.asarray(variacoes, dtype=float))
+        forma = erros.shape
+        erros = erros.ravel()
+        variacoes = variacoes.ravel()
+
+        saida = np.empty(erros.shape[0])
+        lote = min(self.tamanho_lote, self.base.tamanho_lote())
+        for inicio in range(0, erros.shape[0], lote):
+            fim = inicio + lote
+            graus_erro, graus_var = self.fuzzificar_muitos(erros[inicio:fim], variacoes[inicio:fim])
+            forcas = self.forcas_disparo(graus_erro, graus_var)
+            saida[inicio:fim] = self.media_ponderada(forcas, erros[inicio:fim], variacoes[inicio:fim])
+        return saida.reshape(forma)
+
+    def inferir(self, erro, variacao, validar=True):
+        erros, variacoes = np.array([float(erro)]), np.array([float(variacao)])
+        graus_erro, graus_var = self.fuzzificar_muitos(erros, variacoes)
+        forcas = self.forcas_disparo(graus_erro, graus_var)
+        potencia = float(self.media_ponderada(forcas, erros, variacoes)[0])
+        if validar and np.isnan(potencia):
+            raise ValueError("Nenhuma regra foi ativada para as entradas fornecidas.")
+        return ResultadoFuzzificacao(self, erro, variacao, potencia, graus_erro[0], graus_var[0], forcas[0])
+
+
+def grade_ajuste(passo_erro=0.5, passo_variacao=0.25):
+    # Pontos (erro, variacao) que cobrem os universos de entrada
+    erros = np.arange(-30.0, 30.0 + passo_erro / 2, passo_erro)
+    variacoes = np.arange(-10.0, 10.0 + passo_variacao / 2, passo_variacao)
+    grade_erro, grade_var = np.meshgrid(erros, variacoes, indexing='ij')
+    return grade_erro.ravel(), grade_var.ravel()
+
+
+def ajustar_sugeno(parametros_erro, parametros_var, ordem=1, referencia=None, erros=None, variacoes=None):
+    # Ajusta por mínimos quadrados os consequentes de um MotorSugeno para
+    # reproduzir a superfície de controle do Mamdani `referencia` (por padrão,
+    # o motor vetorizado com os mesmos parâmetros). As forças de disparo não
+    # dependem dos consequentes, então a saída Sugeno é linear neles.
+    if referencia is None:
+        referencia = MotorFuzzyVetorizado(parametros_erro, parametros_var)
+    if erros is None:
+        erros, variacoes = grade_ajuste()
+    erros = np.asarray(erros, dtype=float)
+    variacoes = np.asarray(variacoes, dtype=float)
+
+    motor = MotorSugeno(parametros_erro, parametros_var, operador_e=referencia.base.operador_e)
+
+    # Pontos sem regra ativa não restringem os consequentes
+    alvo = referencia.compute_many(erros, variacoes)
+    graus_erro, graus_var = motor.fuzzificar_muitos(erros, variacoes)
+    forcas = motor.forcas_disparo(graus_erro, graus_var)
+    soma = forcas.sum(axis=1)
+    validos = ~np.isnan(alvo) & (soma > 0)
+    alvo = alvo[validos]
+    normalizadas = forcas[validos] / soma[validos, None]
+
+    if ordem == 0:
+        matriz = normalizadas
+    else:
+        e, v = motor.entradas_limitadas(erros[validos], variacoes[validos])
+        matriz = np.concatenate([normalizadas * e[:, None], normalizadas * v[:, None], normalizadas], axis=1)
+    solucao = np.linalg.lstsq(matriz, alvo, rcond=None)[0]
+
+    motor.ordem = ordem
+    motor.consequentes = solucao[:, None] if ordem == 0 else solucao.reshape(3, motor.n_regras).T
+    return motor
+
+
+def comparar_motores(motor, referencia, temperaturas_desejadas=(25.0, 30.0, 35.0, 40.0, 45.0), passos=600):
+    # Diferenças de superfície (sobre a grade de ajuste) e de malha fechada
+    # (trajetórias de temperatura do simulador) entre dois motores
+    erros, variacoes = grade_ajuste()
+    diferenca = np.abs(motor.compute_many(erros, variacoes) - referencia.compute_many(erros, variacoes))
+    diferenca_temperatura = 0.0
+    for desejada in temperaturas_desejadas:
+        a = SimuladorChuveiro(motor, temperatura_desejada=desejada).simular(passos)
+        b = SimuladorChuveiro(referencia, temperatura_desejada=desejada).simular(passos)
+        diferenca_temperatura = max(diferenca_temperatura, float(np.abs(a['temperatura'] - b['temperatura']).max()))
+    return {
+        'superficie_max': float(np.nanmax(diferenca)),
+        'superficie_rms': float(np.sqrt(np.nanmean(diferenca ** 2))),
+        'temperatura_max': diferenca_temperatura,
+    }
+
+
+def salvar_consequentes(caminho, motor):
+    dados = {'ordem': motor.ordem, 'consequentes': motor.consequentes.tolist()}
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, indent=4)
+
+
+def carregar_consequentes(caminho):
+    # Retorna (ordem, consequentes) salvos com salvar_consequentes
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return dados['ordem'], np.array(dados['consequentes'], dtype=float)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajusta um controlador Sugeno à superfície do Mamdani.")
+    parser.add_argument('--ordem', type=int, choices=ORDENS, default=1)
+    parser.add_argument('--parametros', default=None, help="JSON com os parâmetros das funções de pertinência")
+    parser.add_argument('--saida', default=None, help="JSON para salvar os consequentes ajustados")
+    args = parser.parse_args()
+
+    if args.parametros:
+        parametros_erro, parametros_var = carregar_parametros(args.parametros)
+    else:
+        parametros_erro, parametros_var = PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+
+    referencia = MotorFuzzyVetorizado(parametros_erro, parametros_var)
+    motor = ajustar_sugeno(parametros_erro, parametros_var, args.ordem, referencia)
+    for chave, valor in comparar_motores(motor, referencia).items():
+        print(f"{chave}: {valor:.4f}")
+    if args.saida:
+        salvar_consequentes(args.saida, motor)
+
+
+if __name__ == "__main__":
+    main()
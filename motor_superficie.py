@@ -0,0 +1,111 @@
+import numpy as np
+
+
+# Faixas de entrada cobertas pela superfície de controle
+FAIXA_ERRO = (-30.0, 30.0)
+FAIXA_VARIACAO = (-10.0, 10.0)
+
+
+def interpolar(tabela, erros, variacoes, passo_erro, passo_variacao):
+    # Interpolação bilinear vetorizada sobre uma grade que cobre FAIXA_ERRO x
+    # FAIXA_VARIACAO
+    n_erro, n_var = tabela.shape
+    erros = np.clip(np.asarray(erros, dtype=float), *FAIXA_ERRO)
+    variacoes = np.clip(np.asarray(variacoes, dtype=float), *FAIXA_VARIACAO)
+
+    pos_erro = (erros - FAIXA_ERRO[0]) / passo_erro
+    pos_var = (variacoes - FAIXA_VARIACAO[0]) / passo_variacao
+    i = np.minimum(pos_erro.astype(np.intp), n_erro - 2)
+    j = np.minimum(pos_var.astype(np.intp), n_var - 2)
+    fe = pos_erro - i
+    fv = pos_var - j
+
+    t00, t10 = tabela[i, j], tabela[i + 1, j]
+    t01, t11 = tabela[i, j + 1], tabela[i + 1, j + 1]
+
+    inferior = t00 + (t10 - t00) * fe
+    superior = t01 + (t11 - t01) * fe
+    return inferior + (superior - inferior) * fv
+
+
+class TabelaSuperficie:
+    # Superfície potencia(erro, variacao) pré-calculada sobre uma grade regular.
+    # As consultas são respondidas por interpolação bilinear, sem passar pelo
+    # grafo de regras do skfuzzy a cada passo do controlador.
+    #
+    # `referencia` é o motor exato usado para montar a tabela: um
+    # ctrl.ControlSystem do skfuzzy ou qualquer motor com compute_many.
+
+    def __init__(self, referencia, passo_erro=1.0, passo_variacao=0.5, validar=True):
+        if passo_erro <= 0 or passo_variacao <= 0:
+            raise ValueError("A resolução da superfície deve ser positiva.")
+
+        self.referencia = referencia
+        self.passo_erro = float(passo_erro)
+        self.passo_variacao = float(passo_variacao)
+
+        # Grade de pontos (inclui os extremos das faixas)
+        n_erro = int(round((FAIXA_ERRO[1] - FAIXA_ERRO[0]) / self.passo_erro)) + 1
+        n_var = int(round((FAIXA_VARIACAO[1] - FAIXA_VARIACAO[0]) / self.passo_variacao)) + 1
+        self.erros = np.linspace(FAIXA_ERRO[0], FAIXA_ERRO[1], n_erro)
+        self.variacoes = np.linspace(FAIXA_VARIACAO[0], FAIXA_VARIACAO[1], n_var)
+
+        # Passos efetivos após o ajuste da grade às faixas
+        self.passo_erro = self.erros[1] - self.erros[0]
+        self.passo_variacao = self.variacoes[1] - self.variacoes[0]
+
+        grade_erro, grade_var = np.meshgrid(self.erros, self.variacoes, indexing='ij')
+        self.tabela = self.calcular_exato(grade_erro, grade_var)
+
+        # Erro máximo da interpolação medido contra o motor exato
+        self.erro_maximo = self.medir_erro_maximo() if validar else None
+
+    def calcular_exato(self, erros, variacoes):
+        if hasattr(self.referencia, 'compute_many'):
+            return self.referencia.compute_many(erros, variacoes)
+
+        # Avalia o motor skfuzzy de uma só vez sobre arrays de entrada
+        # (importado aqui para não carregar o skfuzzy com as tabelas)
+        from skfuzzy import control as ctrl
+        simulacao = ctrl.ControlSystemSimulation(self.referencia)
+        simulacao.input['erro_temperatura'] = np.asarray(erros, dtype=float)
+        simulacao.input['variacao_temperatura'] = np.asarray(variacoes, dtype=float)
+        simulacao.compute()
+        return np.asarray(simulacao.output['potencia'], dtype=float)
+
+    def medir_erro_maximo(self):
+        # Os centros das células e os pontos médios das arestas são os pontos
+        # mais distantes dos nós da grade, onde a interpolação mais se desvia
+        meios_erro = np.linspace(FAIXA_ERRO[0], FAIXA_ERRO[1], 2 * len(self.erros) - 1)
+        meios_var = np.linspace(FAIXA_VARIACAO[0], FAIXA_VARIACAO[1], 2 * len(self.variacoes) - 1)
+        grade_erro, grade_var = np.meshgrid(meios_erro, meios_var, indexing='ij')
+
+        exato = self.calcular_exato(grade_erro, grade_var)
+        interpolado = self.calcular_muitos(grade_erro, grade_var)
+        return float(np.max(np.abs(exato - interpolado)))
+
+    def calcular(self, erro, variacao):
+        # Limita as entradas à faixa da grade, como o skfuzzy faz com os universos
+        erro = min(max(float(erro), FAIXA_ERRO[0]), FAIXA_ERRO[1])
+        variacao = min(max(float(variacao), FAIXA_VARIACAO[0]), FAIXA_VARIACAO[1])
+
+        # Localiza a célula da grade
+        pos_erro = (erro - FAIXA_ERRO[0]) / self.passo_erro
+        pos_var = (variacao - FAIXA_VARIACAO[0]) / self.passo_variacao
+        i = min(int(pos_erro), len(self.erros) - 2)
+        j = min(int(pos_var), len(self.variacoes) - 2)
+        fe = pos_erro - i
+        fv = pos_var - j
+
+        # Interpolação bilinear entre os quatro cantos da célula
+        tabela = self.tabela
+        inferior = tabela[i, j] * (1.0 - fe) + tabela[i + 1, j] * fe
+        superior = tabela[i, j + 1] * (1.0 - fe) + tabela[i + 1, j + 1] * fe
+        return float(inferior * (1.0 - fv) + superior * fv)
+
+    def calcular_muitos(self, erros, variacoes):
+        return interpolar(self.tabela, erros, variacoes, self.passo_erro, self.passo_variacao)
+
+    # Interface comum dos motores de inferência
+    compute = calcular
+    compute_many = calcular_muitos
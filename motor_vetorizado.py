@@ -0,0 +1,393 @@
+import numpy as np
+
+from base_regras import BaseRegras
+from definicao_fuzzy import (
+    UNIVERSO_ERRO, UNIVERSO_VARIACAO, UNIVERSO_POTENCIA,
+    PARAMETROS_POTENCIA_PADRAO, REGRAS, trimf, trapmf
+)
+
+
+# Diferença máxima esperada contra o skfuzzy. O skfuzzy não insere no universo
+# os pontos onde dois conjuntos recortados se cruzam, então o centróide dele
+# difere do exato em até ~0.02 ponto percentual nesta base de regras.
+TOLERANCIA_SKFUZZY = 0.05
+
+DEFUZZIFICACOES = ('centroide', 'bisetor', 'mom')
+
+
+def amostrar_pertinencia(universo, params):
+    # Função de pertinência de saída amostrada: triangular [a, b, c],
+    # trapezoidal [a, b, c, d] ou já amostrada sobre o universo
+    if len(params) == 3:
+        return trimf(universo, params)
+    if len(params) == 4:
+        return trapmf(universo, params)
+    if len(params) == len(universo):
+        return np.asarray(params, dtype=float)
+    raise ValueError("Função de pertinência deve ser [a, b, c], [a, b, c, d] ou amostrada sobre o universo.")
+
+
+def vertices_pertinencia(params, inicio, fim):
+    # Vértices (x, y) de uma função triangular ou trapezoidal dentro de
+    # [inicio, fim], para avaliação com np.interp. Retorna None quando a função
+    # não é linear por partes ou tem uma aresta vertical dentro do universo.
+    if len(params) == 3:
+        xs, ys = [float(p) for p in params], [0.0, 1.0, 0.0]
+    elif len(params) == 4:
+        xs, ys = [float(p) for p in params], [0.0, 1.0, 1.0, 0.0]
+    else:
+        return None
+
+    # Arestas verticais (ombros) só são aceitas nas bordas do universo
+    while len(xs) > 1 and xs[0] == xs[1]:
+        if xs[0] > inicio:
+            return None
+        xs, ys = xs[1:], ys[1:]
+    while len(xs) > 1 and xs[-1] == xs[-2]:
+        if xs[-1] < fim:
+            return None
+        xs, ys = xs[:-1], ys[:-1]
+    if len(xs) < 2:
+        return None
+    return np.array(xs), np.array(ys)
+
+
+class ResultadoFuzzificacao:
+    # Fuzzificação de um passo do controlador, compartilhada entre o motor e
+    # as abas de diagnóstico. Os graus são calculados no máximo uma vez: já
+    # vêm preenchidos pelo motor vetorizado ou são obtidos sob demanda quando
+    # a potência veio de outro motor.
+
+    def __init__(self, motor, erro, variacao, potencia=None, graus_erro=None, graus_var=None, forcas=None):
+        self.motor = motor
+        self.erro = float(erro)
+        self.variacao = float(variacao)
+        self.potencia = potencia
+        self._graus_erro = graus_erro
+        self._graus_var = graus_var
+        self._forcas = forcas
+        self._ativacao = None
+
+    def _fuzzificar(self):
+        graus_erro, graus_var = self.motor.fuzzificar_muitos(np.array([self.erro]), np.array([self.variacao]))
+        self._graus_erro = graus_erro[0]
+        self._graus_var = graus_var[0]
+
+    @property
+    def graus_erro(self):
+        # Grau de pertinência em cada termo do erro, na ordem de motor.termos_erro
+        if self._graus_erro is None:
+            self._fuzzificar()
+        return self._graus_erro
+
+    @property
+    def graus_var(self):
+        if self._graus_var is None:
+            self._fuzzificar()
+        return self._graus_var
+
+    @property
+    def forcas(self):
+        # Força de disparo de cada regra, na ordem da base de regras
+        if self._forcas is None:
+            self._forcas = self.motor.forcas_disparo(self.graus_erro[None, :], self.graus_var[None, :])[0]
+        return self._forcas
+
+    @property
+    def ativacao(self):
+        # Nível de corte de cada termo de saída, na ordem de motor.termos_potencia
+        if self._ativacao is None:
+            self._ativacao = self.motor.ativacoes(self.forcas[None, :])[0]
+        return self._ativacao
+
+
+class MotorFuzzyVetorizado:
+    # Motor Mamdani implementado apenas com NumPy. Fuzzifica N entradas contra
+    # todos os termos de uma vez, monta as forças de disparo como uma matriz
+    # (N, regras) com a base de regras compilada, agrega os conjuntos de saída
+    # recortados em (N, universo) e defuzzifica em uma única redução.
+    #
+    # Operadores: E 'min' ou 'produto'; agregação 'max' ou
+    # 'soma_probabilistica'; defuzzificação 'centroide', 'bisetor' ou 'mom'
+    # (média dos máximos). O padrão (min/max/centróide) equivale ao skfuzzy.
+    #
+    # Com conjuntos de saída triangulares ou trapezoidais, agregação 'max' e
+    # centróide, a defuzzificação é exata e calculada a partir dos vértices do
+    # polígono agregado, sem universo amostrado. Nos demais casos usa o
+    # universo de saída sobreamostrado.
+
+    def __init__(self, parametros_erro, parametros_var, parametros_potencia=None,
+                 regras=REGRAS, sobreamostragem=4, tamanho_lote=4096,
+                 operador_e='min', agregacao='max', defuzzificacao='centroide',
+                 centroide_analitico=True):
+        if parametros_potencia is None:
+            parametros_potencia = PARAMETROS_POTENCIA_PADRAO
+
+        self.termos_erro = list(parametros_erro)
+        self.termos_var = list(parametros_var)
+        self.termos_potencia = list(parametros_potencia)
+        self.tamanho_lote = tamanho_lote
+
+        self.universo_erro = UNIVERSO_ERRO.astype(float)
+        self.universo_var = UNIVERSO_VARIACAO.astype(float)
+
+        # Universo de saída refinado: os recortes das regras criam quinas entre
+        # as amostras originais, e a sobreamostragem aproxima o centróide exato
+        passo = (UNIVERSO_POTENCIA[1] - UNIVERSO_POTENCIA[0]) / float(sobreamostragem)
+        n_pontos = (len(UNIVERSO_POTENCIA) - 1) * sobreamostragem + 1
+        self.universo_potencia = UNIVERSO_POTENCIA[0] + passo * np.arange(n_pontos)
+
+        # Funções de pertinência amostradas nos universos (uma linha por termo)
+        self.mf_erro = np.array([trimf(self.universo_erro, p) for p in parametros_erro.values()])
+        self.mf_var = np.array([trimf(self.universo_var, p) for p in parametros_var.values()])
+        self.mf_potencia = np.array([
+            np.interp(self.universo_potencia, UNIVERSO_POTENCIA, amostrar_pertinencia(UNIVERSO_POTENCIA, p))
+            for p in parametros_potencia.values()
+        ])
+
+        # Centróide analítico a partir dos vértices dos conjuntos de saída
+        self.centroide_analitico = centroide_analitico
+        self.parametros_potencia = {t: list(p) for t, p in parametros_potencia.items()}
+        self._preparar_geometria_saida()
+
+        # Base de regras compilada em arrays de índices
+        self.base = BaseRegras({'erro': self.termos_erro, 'variacao': self.termos_var},
+                               self.termos_potencia, regras, operador_e, agregacao)
+        self.idx_saida = self.base.idx_saida
+        self.n_regras = self.base.n_regras
+        self.defuzzificacao = defuzzificacao
+        self.configurar_operadores()
+
+        # Pesos da regra do trapézio para o centróide de uma função linear por partes
+        x = self.universo_potencia
+        dx = np.diff(x)
+        self._peso_area = np.zeros(len(x))
+        self._peso_area[:-1] += dx / 2.0
+        self._peso_area[1:] += dx / 2.0
+        self._peso_momento = np.zeros(len(x))
+        self._peso_momento[:-1] += dx * (2.0 * x[:-1] + x[1:]) / 6.0
+        self._peso_momento[1:] += dx * (x[:-1] + 2.0 * x[1:]) / 6.0
+
+    def configurar_operadores(self, operador_e=None, agregacao=None, defuzzificacao=None):
+        # Troca os operadores sem recompilar a base de regras
+        base = self.base
+        anteriores = base.operador_e, base.agregacao, self.defuzzificacao
+        if operador_e is not None:
+            base.operador_e = operador_e
+        if agregacao is not None:
+            base.agregacao = agregacao
+        if defuzzificacao is not None:
+            self.defuzzificacao = defuzzificacao
+        try:
+            base.validar_operadores()
+            if self.defuzzificacao not in DEFUZZIFICACOES:
+                raise ValueError(f"Defuzzificação desconhecida: '{self.defuzzificacao}'.")
+        except ValueError:
+            base.operador_e, base.agregacao, self.defuzzificacao = anteriores
+            raise
+
+    def atualizar_termo(self, variavel, termo, params):
+        # Substitui a função de pertinência de um único termo, sem recompilar as regras
+        if variavel == 'erro':
+            self.mf_erro[self.termos_erro.index(termo)] = trimf(self.universo_erro, params)
+        elif variavel == 'variacao':
+            self.mf_var[self.termos_var.index(termo)] = trimf(self.universo_var, params)
+        elif variavel == 'potencia':
+            self.mf_potencia[self.termos_potencia.index(termo)] = np.interp(
+                self.universo_potencia, UNIVERSO_POTENCIA, amostrar_pertinencia(UNIVERSO_POTENCIA, params))
+            self.parametros_potencia[termo] = list(params)
+            self._preparar_geometria_saida()
+        else:
+            raise ValueError(f"Variável desconhecida: '{variavel}'.")
+
+    def _preparar_geometria_saida(self):
+        # Pontos onde o polígono agregado pode ter quinas: vértices dos
+        # conjuntos, bordas do universo, cruzamentos entre as retas dos
+        # conjuntos (fixos) e cruzamentos das retas com os níveis de corte
+        # (dependem da ativação). Entre dois pontos consecutivos o agregado é
+        # linear, então a regra do trapézio sobre eles é exata.
+        inicio, fim = float(self.universo_potencia[0]), float(self.universo_potencia[-1])
+        vertices = [vertices_pertinencia(p, inicio, fim) for p in self.parametros_potencia.values()]
+        if any(v is None for v in vertices):
+            self._vertices_potencia = None
+            return
+        self._vertices_potencia = vertices
+
+        inclinacoes, interceptos = [], []
+        for xs, ys in vertices:
+            for x0, x1, y0, y1 in zip(xs[:-1], xs[1:], ys[:-1], ys[1:]):
+                m = (y1 - y0) / (x1 - x0)
+                inclinacoes.append(m)
+                interceptos.append(y0 - m * x0)
+        m = np.array(inclinacoes)
+        q = np.array(interceptos)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cruzamentos = (q[None, :] - q[:, None]) / (m[:, None] - m[None, :])
+        cruzamentos = cruzamentos[np.triu_indices(len(m), 1)]
+        fixos = np.concatenate([[inicio, fim], np.concatenate([xs for xs, _ in vertices]), cruzamentos])
+        self._pontos_fixos = np.clip(fixos[np.isfinite(fixos)], inicio, fim)
+
+        inclinadas = m != 0
+        self._inclinacoes = m[inclinadas]
+        self._interceptos = q[inclinadas]
+
+        # Para uma única entrada, os conjuntos são avaliados em uma só chamada
+        # de np.interp: cada um é deslocado para um trecho próprio do eixo x
+        largura = fim - inicio + 1.0
+        self._deslocamentos = largura * np.arange(len(vertices))[:, None]
+        self._polilinha_x = np.concatenate([np.concatenate(([inicio], xs, [fim])) + largura * k
+                                            for k, (xs, _) in enumerate(vertices)])
+        self._polilinha_y = np.concatenate([np.concatenate(([ys[0]], ys, [ys[-1]])) for _, ys in vertices])
+
+    def centroide_exato(self, ativacao):
+        # Centróide do polígono agregado (máximo dos conjuntos recortados)
+        n = ativacao.shape[0]
+        if n == 1:
+            return np.array([self._centroide_exato_linha(ativacao[0])])
+
+        inicio, fim = self.universo_potencia[0], self.universo_potencia[-1]
+        cortes = (ativacao[:, :, None] - self._interceptos) / self._inclinacoes
+        pontos = np.concatenate([np.broadcast_to(self._pontos_fixos, (n, len(self._pontos_fixos))),
+                                 cortes.reshape(n, -1)], axis=1)
+        np.clip(pontos, inicio, fim, out=pontos)
+        pontos.sort(axis=1)
+
+        agregado = np.zeros_like(pontos)
+        for k, (xs, ys) in enumerate(self._vertices_potencia):
+            np.maximum(agregado, np.minimum(np.interp(pontos, xs, ys), ativacao[:, k:k + 1]), out=agregado)
+
+        x0, x1 = pontos[:, :-1], pontos[:, 1:]
+        y0, y1 = agregado[:, :-1], agregado[:, 1:]
+        dx = x1 - x0
+        area = (dx * (y0 + y1)).sum(axis=1) / 2.0
+        momento = (dx * (y0 * (2.0 * x0 + x1) + y1 * (x0 + 2.0 * x1))).sum(axis=1) / 6.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(area > 0, momento / area, np.nan)
+
+    def _centroide_exato_linha(self, ativacao):
+        # Mesmo cálculo para uma única entrada, em arrays 1-D (passo do controlador)
+        cortes = (ativacao[:, None] - self._interceptos) / self._inclinacoes
+        np.maximum(cortes, self.universo_potencia[0], out=cortes)
+        np.minimum(cortes, self.universo_potencia[-1], out=cortes)
+        pontos = np.concatenate((self._pontos_fixos, cortes.ravel()))
+        pontos.sort()
+
+        recortados = np.interp(pontos + self._deslocamentos, self._polilinha_x, self._polilinha_y)
+        np.minimum(recortados, ativacao[:, None], out=recortados)
+        agregado = recortados.max(axis=0)
+
+        x0, x1 = pontos[:-1], pontos[1:]
+        y0, y1 = agregado[:-1], agregado[1:]
+        dx = x1 - x0
+        area = np.dot(dx, y0 + y1)
+        if area <= 0:
+            return np.nan
+        momento = np.dot(dx, y0 * (2.0 * x0 + x1) + y1 * (x0 + 2.0 * x1))
+        return float(momento / (3.0 * area))
+
+    def fuzzificar_muitos(self, erros, variacoes):
+        # Graus de pertinência (N, termos) com as entradas limitadas aos universos
+        erros = np.clip(erros, self.universo_erro[0], self.universo_erro[-1])
+        variacoes = np.clip(variacoes, self.universo_var[0], self.universo_var[-1])
+        graus_erro = np.stack([np.interp(erros, self.universo_erro, mf) for mf in self.mf_erro], axis=-1)
+        graus_var = np.stack([np.interp(variacoes, self.universo_var, mf) for mf in self.mf_var], axis=-1)
+        return graus_erro, graus_var
+
+    def forcas_disparo(self, graus_erro, graus_var):
+        # Operador E entre os antecedentes de cada regra: (N, regras)
+        return self.base.forcas(np.concatenate((graus_erro, graus_var), axis=1))
+
+    def ativacoes(self, forcas):
+        # Acumulação das regras que apontam para o mesmo termo de saída
+        return self.base.ativacoes(forcas)
+
+    def agregar(self, ativacao):
+        # Conjuntos de saída recortados (implicação por mínimo) e agregados
+        # sobre o universo: (N, pontos)
+        recortados = np.minimum(ativacao[:, :, None], self.mf_potencia[None, :, :])
+        if self.base.agregacao == 'max':
+            return recortados.max(axis=1)
+        return 1.0 - (1.0 - recortados).prod(axis=1)
+
+    def defuzzificar(self, ativacao):
+        # Valor crisp de cada linha; NaN onde o conjunto agregado é vazio
+        if (self.defuzzificacao == 'centroide' and self.centroide_analitico
+                and self.base.agregacao == 'max' and self._vertices_potencia is not None):
+            return self.centroide_exato(ativacao)
+
+        agregado = self.agregar(ativacao)
+        area = agregado @ self._peso_area
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.defuzzificacao == 'centroide':
+                return np.where(area > 0, (agregado @ self._peso_momento) / area, np.nan)
+            if self.defuzzificacao == 'bisetor':
+                return np.where(area > 0, self._bisetor(agregado), np.nan)
+            return np.where(area > 0, self._media_dos_maximos(agregado), np.nan)
+
+    def _bisetor(self, agregado):
+        # Ponto que divide a área ao meio, pela área acumulada (trapézios) e
+        # interpolação linear dentro do intervalo onde ela cruza a metade
+        x = self.universo_potencia
+        acumulada = np.zeros_like(agregado)
+        np.cumsum((agregado[:, 1:] + agregado[:, :-1]) * (np.diff(x) / 2.0), axis=1, out=acumulada[:, 1:])
+        metade = acumulada[:, -1:] / 2.0
+        j = np.clip(np.argmax(acumulada >= metade, axis=1), 1, len(x) - 1)
+        linhas = np.arange(agregado.shape[0])
+        inicio = acumulada[linhas, j - 1]
+        trecho = acumulada[linhas, j] - inicio
+        fracao = np.where(trecho > 0, (metade[:, 0] - inicio) / trecho, 0.0)
+        return x[j - 1] + fracao * (x[j] - x[j - 1])
+
+    def _media_dos_maximos(self, agregado):
+        no_maximo = agregado >= agregado.max(axis=1, keepdims=True) - 1e-12
+        return (no_maximo @ self.universo_potencia) / no_maximo.sum(axis=1)
+
+    def compute_many(self, erros, variacoes):
+        # Retorna a potência para cada par de entradas; NaN onde nenhuma regra dispara
+        erros, variacoes = np.broadcast_arrays(np.asarray(erros, dtype=float),
+                                               np.asarray(variacoes, dtype=float))
+        forma = erros.shape
+        erros = erros.ravel()
+        variacoes = variacoes.ravel()
+
+        saida = np.empty(erros.shape[0])
+        lote = min(self.tamanho_lote, self.base.tamanho_lote())
+        for inicio in range(0, erros.shape[0], lote):
+            fim = inicio + lote
+            graus_erro, graus_var = self.fuzzificar_muitos(erros[inicio:fim], variacoes[inicio:fim])
+            forcas = self.forcas_disparo(graus_erro, graus_var)
+            saida[inicio:fim] = self.defuzzificar(self.ativacoes(forcas))
+        return saida.reshape(forma)
+
+    def fuzzificar(self, erro, variacao, potencia=None):
+        # Resultado preguiçoso: os graus só são calculados se alguém os consultar
+        return ResultadoFuzzificacao(self, erro, variacao, potencia)
+
+    def inferir(self, erro, variacao, validar=True):
+        # Inferência de um único passo que preserva a fuzzificação para
+        # diagnóstico. Com validar=False, a potência é NaN quando nenhuma
+        # regra dispara, em vez de levantar ValueError.
+        graus_erro, graus_var = self.fuzzificar_muitos(np.array([float(erro)]), np.array([float(variacao)]))
+        forcas = self.forcas_disparo(graus_erro, graus_var)
+        potencia = float(self.defuzzificar(self.ativacoes(forcas))[0])
+        if validar and np.isnan(potencia):
+            raise ValueError("Nenhuma regra foi ativada para as entradas fornecidas.")
+        return ResultadoFuzzificacao(self, erro, variacao, potencia, graus_erro[0], graus_var[0], forcas[0])
+
+    def compute(self, erro, variacao):
+        potencia = float(self.compute_many([erro], [variacao])[0])
+        if np.isnan(potencia):
+            raise ValueError("Nenhuma regra foi ativada para as entradas fornecidas.")
+        return potencia
+
+    def desvio_maximo(self, sistema_ctrl, erros, variacoes):
+        # Maior diferença absoluta contra ControlSystemSimulation.compute()
+        from skfuzzy import control as ctrl
+
+        simulacao = ctrl.ControlSystemSimulation(sistema_ctrl)
+        simulacao.input['erro_temperatura'] = np.asarray(erros, dtype=float)
+        simulacao.input['variacao_temperatura'] = np.asarray(variacoes, dtype=float)
+        simulacao.compute()
+        referencia = np.asarray(simulacao.output['potencia'], dtype=float)
+        return float(np.nanmax(np.abs(self.compute_many(erros, variacoes) - referencia)))
@@ -0,0 +1,140 @@
+import cProfile
+import time
+
+import numpy as np
+
+from buffer_circular import BufferCircular
+
+
+# Faixas do histograma de latência: de 1 µs a 10 s em escala logarítmica
+LIMITES_HISTOGRAMA_S = np.logspace(-6, 1, 29)
+
+
+class _MedicaoFase:
+    __slots__ = ('perfilador', 'fase', 'inicio')
+
+    def __init__(self, perfilador, fase):
+        self.perfilador = perfilador
+        self.fase = fase
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.perfilador.registrar(self.fase, time.perf_counter() - self.inicio)
+
+
+class _MedicaoInativa:
+    # Contexto vazio e reutilizado quando a medição está desligada
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_INATIVA = _MedicaoInativa()
+
+
+class PerfiladorTicks:
+    # Instrumentação leve das fases de cada tick. Mantém as últimas `janela`
+    # durações de cada fase (histograma móvel) e, sob demanda, captura um
+    # perfil cProfile de N ticks de um laço.
+
+    def __init__(self, janela=1000, ativo=False):
+        self.janela = janela
+        self.ativo = ativo
+        self._duracoes = {}
+        self._medicoes = {}
+        self._capturas = {}
+        self.falha_captura = None
+
+    def fase(self, nome):
+        # Uso: with perfilador.fase('inferencia'): ...
+        if not self.ativo:
+            return _INATIVA
+        medicao = self._medicoes.get(nome)
+        if medicao is None:
+            medicao = self._medicoes[nome] = _MedicaoFase(self, nome)
+        return medicao
+
+    def registrar(self, fase, duracao):
+        buffer = self._duracoes.get(fase)
+        if buffer is None:
+            buffer = self._duracoes[fase] = BufferCircular(self.janela, ('duracao',))
+        buffer.adicionar((duracao,))
+
+    def limpar(self):
+        self._duracoes.clear()
+
+    def resumo(self):
+        # Estatísticas em milissegundos por fase, na ordem em que apareceram
+        resumo = {}
+        for fase, buffer in list(self._duracoes.items()):
+            duracoes = np.array(buffer['duracao'])
+            if len(duracoes) == 0:
+                continue
+            p50, p95, p99 = np.percentile(duracoes, [50, 95, 99]) * 1000.0
+            resumo[fase] = {
+                'amostras': len(duracoes),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(duracoes.max() * 1000.0),
+                'histograma': np.histogram(duracoes, bins=LIMITES_HISTOGRAMA_S)[0],
+            }
+        return resumo
+
+    # Captura cProfile de um laço (controle ou interface) por vez: a partir do
+    # Python 3.12 o cProfile usa o sys.monitoring, global ao processo, e só um
+    # perfilador pode estar ativo. O perfil registra os ticks do laço
+    # escolhido, mas no 3.12+ inclui o que as outras threads executarem
+    # durante esses ticks.
+
+    def capturar_cprofile(self, laco, n_ticks, caminho):
+        if self._capturas:
+            raise ValueError("Já há uma captura cProfile em andamento.")
+        self.falha_captura = None
+        self._capturas[laco] = {'restantes': n_ticks, 'caminho': caminho, 'perfil': None}
+
+    def captura_pendente(self, laco):
+        return laco in self._capturas
+
+    def iniciar_tick(self, laco):
+        captura = self._capturas.get(laco)
+        if captura is not None:
+            if captura['perfil'] is None:
+                captura['perfil'] = cProfile.Profile()
+            try:
+                captura['perfil'].enable()
+                captura['ativo'] = True
+            except ValueError as e:
+                # Outra ferramenta de perfil já ativa: cancela a captura sem
+                # interromper o laço
+                del self._capturas[laco]
+                self.falha_captura = f"Captura cProfile do laço '{laco}' cancelada: {e}"
+
+    def finalizar_tick(self, laco):
+        captura = self._capturas.get(laco)
+        if captura is None or not captura.pop('ativo', False):
+            return None
+        captura['perfil'].disable()
+        captura['restantes'] -= 1
+        if captura['restantes'] > 0:
+            return None
+
+        # Captura concluída: grava o snapshot no formato pstats
+        captura['perfil'].dump_stats(captura['caminho'])
+        del self._capturas[laco]
+        return captura['caminho']
+
+
+def formatar_histograma(contagens):
+    # Representação compacta do histograma com blocos Unicode
+    niveis = " ▁▂▃▄▅▆▇█"
+    maximo = contagens.max()
+    if maximo == 0:
+        return ""
+    return "".join(niveis[int(np.ceil(c / maximo * (len(niveis) - 1)))] for c in contagens)
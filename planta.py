@@ -0,0 +1,225 @@
+import numpy as np
+
+
+# Constantes do modelo térmico do chuveiro
+TEMPERATURA_AMBIENTE = 20.0
+GANHO_POTENCIA = 2.0  # °C/s com 100% de potência
+COEFICIENTE_AMBIENTE = 0.05  # Troca de calor com o ambiente (1/s)
+
+# Tempo de trânsito da água entre a resistência e a saída do chuveiro (s)
+ATRASO_TUBULACAO = 2.0
+
+# Modelo de dois nós: capacidade térmica da resistência relativa à da água
+# e condutância resistência-água (1/s na escala da água)
+CAPACIDADE_RESISTENCIA = 0.5
+CONDUTANCIA_RESISTENCIA = 0.5
+
+INTEGRADORES = ('exato', 'rk4', 'euler')
+
+
+def expm(matriz):
+    # Exponencial de matriz por escalonamento e quadraturas com série de
+    # Taylor, suficiente para as matrizes pequenas dos modelos térmicos
+    matriz = np.asarray(matriz, dtype=float)
+    norma = np.abs(matriz).sum(axis=0).max() if matriz.size else 0.0
+    quadraturas = max(0, int(np.ceil(np.log2(norma))) + 1) if norma > 0 else 0
+    escalada = matriz / 2.0 ** quadraturas
+    resultado = np.eye(len(matriz))
+    termo = np.eye(len(matriz))
+    for k in range(1, 18):
+        termo = termo @ escalada / k
+        resultado = resultado + termo
+    for _ in range(quadraturas):
+        resultado = resultado @ resultado
+    return resultado
+
+
+class ModeloTermico:
+    # Modelo linear dx/dt = A x + B u + c, com u a potência em % e a
+    # temperatura medida y = x[saida], observada `atraso` segundos depois.
+
+    def __init__(self, nome, A, B, c, saida=0, atraso=0.0):
+        self.nome = nome
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.B = np.asarray(B, dtype=float).reshape(-1)
+        self.c = np.asarray(c, dtype=float).reshape(-1)
+        self.saida = int(saida)
+        self.atraso = float(atraso)
+        n = len(self.A)
+        if self.A.shape != (n, n) or self.B.shape != (n,) or self.c.shape != (n,):
+            raise ValueError("Dimensões inconsistentes entre A, B e c.")
+        if self.atraso < 0:
+            raise ValueError("O atraso de transporte não pode ser negativo.")
+
+    @property
+    def ordem(self):
+        return len(self.A)
+
+    def derivada(self, estados, potencias):
+        # dx/dt para N plantas: estados (N, ordem), potencias (N,)
+        return estados @ self.A.T + potencias[:, None] * self.B + self.c
+
+    def discretizar(self, dt):
+        # Discretização exata com potência constante no passo: a exponencial
+        # da matriz aumentada [[A, B, c], [0, 0, 0], [0, 0, 0]] fornece
+        # x[k+1] = Ad x[k] + Bd u[k] + cd
+        n = self.ordem
+        if n == 1:
+            # Forma fechada de primeira ordem, sem exponencial de matriz: o
+            # app rediscretiza a cada tick, com o passo do tempo real
+            a = float(self.A[0, 0])
+            Ad = np.exp(a * dt)
+            ganho = (Ad - 1.0) / a if a != 0 else dt
+            return np.array([[Ad]]), self.B * ganho, self.c * ganho
+        aumentada = np.zeros((n + 2, n + 2))
+        aumentada[:n, :n] = self.A
+        aumentada[:n, n] = self.B
+        aumentada[:n, n + 1] = self.c
+        exponencial = expm(aumentada * dt)
+        return exponencial[:n, :n], exponencial[:n, n], exponencial[:n, n + 1]
+
+
+def modelo_primeira_ordem(ganho=GANHO_POTENCIA, ambiente=TEMPERATURA_AMBIENTE, coeficiente=COEFICIENTE_AMBIENTE,
+                          atraso=0.0):
+    # O modelo da aplicação: dT/dt = ganho * u / 100 - coeficiente * (T - ambiente)
+    return ModeloTermico('primeira_ordem' if atraso == 0 else 'atraso',
+                         [[-coeficiente]], [ganho / 100.0], [coeficiente * ambiente], atraso=atraso)
+
+
+def modelo_atraso(atraso=ATRASO_TUBULACAO, **parametros):
+    # Primeira ordem medida na saída da tubulação
+    return modelo_primeira_ordem(atraso=atraso, **parametros)
+
+
+def modelo_dois_nos(ganho=GANHO_POTENCIA, ambiente=TEMPERATURA_AMBIENTE, coeficiente=COEFICIENTE_AMBIENTE,
+                    capacidade_resistencia=CAPACIDADE_RESISTENCIA, condutancia=CONDUTANCIA_RESISTENCIA):
+    # Resistência (nó 0) aquecida pela potência e água (nó 1) aquecida pela
+    # resistência e resfriada pelo ambiente. O ganho em regime é o mesmo do
+    # modelo de primeira ordem; a água é o nó medido.
+    #   Cr dTr/dt = ganho * u / 100 - condutancia * (Tr - Ta)
+    #      dTa/dt = condutancia * (Tr - Ta) - coeficiente * (Ta - ambiente)
+    Cr = capacidade_resistencia
+    A = [[-condutancia / Cr, condutancia / Cr],
+         [condutancia, -condutancia - coeficiente]]
+    return ModeloTermico('dois_nos', A, [ganho / 100.0 / Cr, 0.0], [0.0, coeficiente * ambiente], saida=1)
+
+
+MODELOS = {
+    'primeira_ordem': modelo_primeira_ordem,
+    'atraso': modelo_atraso,
+    'dois_nos': modelo_dois_nos,
+}
+
+
+class PlantaLote:
+    # N plantas do mesmo modelo avançadas juntas, com o estado em um array
+    # (N, ordem). O integrador 'exato' usa a discretização exata (estável e
+    # sem erro de truncamento para qualquer passo), 'rk4' o Runge-Kutta de
+    # quarta ordem e 'euler' o passo de Euler explícito do simulador original.
+    #
+    # Com atraso de transporte, o passo é fixo (`dt`) e a temperatura medida é
+    # a saída de round(atraso / dt) passos antes, guardada em uma linha de
+    # atraso circular.
+
+    def __init__(self, modelo, n_plantas=1, temperatura_inicial=TEMPERATURA_AMBIENTE, integrador='exato', dt=None):
+        if integrador not in INTEGRADORES:
+            raise ValueError(f"Integrador desconhecido: '{integrador}'.")
+        if modelo.atraso > 0 and dt is None:
+            raise ValueError("Modelos com atraso de transporte exigem um passo fixo dt.")
+        self.modelo = modelo
+        self.n_plantas = int(n_plantas)
+        self.integrador = integrador
+        self.dt = float(dt) if dt is not None else None
+        self.passos_atraso = int(round(modelo.atraso / self.dt)) if modelo.atraso > 0 else 0
+        self._discretizacao = None
+        self.reiniciar(temperatura_inicial)
+
+    def reiniciar(self, temperatura_inicial=TEMPERATURA_AMBIENTE):
+        # Todos os nós partem da temperatura inicial (escalar ou uma por planta)
+        temperatura = np.broadcast_to(np.asarray(temperatura_inicial, dtype=float), (self.n_plantas,))
+        self.estados = np.repeat(temperatura[:, None], self.modelo.ordem, axis=1)
+        self.linha_atraso = np.repeat(temperatura[None, :], self.passos_atraso, axis=0)
+        self._posicao_atraso = 0
+        self.temperatura = temperatura.copy()
+
+    def discretizacao(self, dt):
+        # (Ad, Bd, cd) do integrador exato, recalculados só quando dt muda
+        if self._discretizacao is None or self._discretizacao[0] != dt:
+            self._discretizacao = (dt,) + self.modelo.discretizar(dt)
+        return self._discretizacao[1:]
+
+    def avancar(self, potencias, dt=None):
+        # Avança um passo com potência constante (escalar ou uma por planta)
+        # e retorna a temperatura medida de cada planta
+        if dt is None:
+            dt = self.dt
+        elif self.passos_atraso and dt != self.dt:
+            raise ValueError("O passo de um modelo com atraso é fixo.")
+        potencias = np.broadcast_to(np.asarray(potencias, dtype=float), (self.n_plantas,))
+        x = self.estados
+        modelo = self.modelo
+
+        if self.integrador == 'exato':
+            Ad, Bd, cd = self.discretizacao(dt)
+            x = x @ Ad.T + potencias[:, None] * Bd + cd
+        elif self.integrador == 'rk4':
+            k1 = modelo.derivada(x, potencias)
+            k2 = modelo.derivada(x + (0.5 * dt) * k1, potencias)
+            k3 = modelo.derivada(x + (0.5 * dt) * k2, potencias)
+            k4 = modelo.derivada(x + dt * k3, potencias)
+            x = x + (dt / 6.0) * (k1 + 2.0 * (k2 + k3) + k4)
+        else:
+            x = x + dt * modelo.derivada(x, potencias)
+        self.estados = x
+
+        saida = x[:, modelo.saida]
+        if self.passos_atraso:
+            posicao = self._posicao_atraso
+            self.temperatura = self.linha_atraso[posicao].copy()
+            self.linha_atraso[posicao] = saida
+            self._posicao_atraso = (posicao + 1) % self.passos_atraso
+        else:
+            self.temperatura = saida.copy()
+        return self.temperatura
+
+
+def simular_lote(motor, planta, temperaturas_desejadas, passos, saturacao=None):
+    # Malha fechada de todas as plantas de `planta` (passo fixo planta.dt),
+    # com uma inferência vetorizada por passo. Retorna as trajetórias
+    # (passos + 1, N) no mesmo formato de SimuladorChuveiro.simular.
+    from saturacao import PoliticaSaturacao
+
+    if planta.dt is None:
+        raise ValueError("A simulação em lote exige uma planta com passo fixo dt.")
+    if saturacao is None:
+        saturacao = PoliticaSaturacao()
+    dt = planta.dt
+    n = planta.n_plantas
+    desejadas = np.broadcast_to(np.asarray(temperaturas_desejadas, dtype=float), (n,))
+
+    temperatura = np.empty((passos + 1, n))
+    potencia = np.zeros((passos + 1, n))
+    erro = np.zeros((passos + 1, n))
+    variacao = np.zeros((passos + 1, n))
+    temperatura[0] = planta.temperatura
+    erro[0] = desejadas - temperatura[0]
+
+    anterior = temperatura[0]
+    for k in range(1, passos + 1):
+        atual = temperatura[k - 1]
+        erro[k] = desejadas - atual
+        variacao[k] = (atual - anterior) / dt
+        # Com 'manter', cada planta sem regra ativa mantém a própria potência
+        # anterior (no primeiro passo, a potência padrão da política)
+        anteriores = potencia[k - 1] if k > 1 else saturacao.valor_padrao
+        potencia[k] = saturacao.calcular_muitos(motor, erro[k], variacao[k], anteriores)
+        anterior = atual
+        temperatura[k] = planta.avancar(potencia[k])
+
+    return {
+        'tempo': np.arange(passos + 1) * dt,
+        'temperatura': temperatura,
+        'potencia': potencia,
+        'erro': erro,
+        'variacao': variacao,
+    }
@@ -0,0 +1,176 @@
+import argparse
+import itertools
+
+import numpy as np
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, carregar_parametros
+from motor_vetorizado import MotorFuzzyVetorizado
+from saturacao import PoliticaSaturacao, POLITICAS_ENTRADA, POLITICAS_SEM_ATIVACAO
+from telemetria import ler_telemetria
+
+
+# Colunas esperadas nos arquivos CSV gravados em campo ('potencia' é opcional)
+COLUNAS_OBRIGATORIAS = ('tempo', 'temperatura', 'temperatura_desejada')
+
+TAMANHO_BLOCO_PADRAO = 65536
+
+
+def ler_blocos_csv(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    # Lê o CSV em blocos de linhas, convertidos em arrays pelo np.loadtxt,
+    # sem nunca carregar o arquivo inteiro na memória
+    with open(caminho, encoding='utf-8') as arquivo:
+        cabecalho = [coluna.strip() for coluna in arquivo.readline().split(',')]
+        faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in cabecalho]
+        if faltando:
+            raise ValueError(f"Colunas ausentes no arquivo de entrada: {', '.join(faltando)}")
+
+        colunas = [c for c in COLUNAS_OBRIGATORIAS + ('potencia',) if c in cabecalho]
+        indices = [cabecalho.index(c) for c in colunas]
+
+        while True:
+            linhas = list(itertools.islice(arquivo, tamanho_bloco))
+            if not linhas:
+                break
+            dados = np.loadtxt(linhas, delimiter=',', usecols=indices, ndmin=2)
+            yield {coluna: dados[:, i] for i, coluna in enumerate(colunas)}
+
+
+def ler_blocos_telemetria(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    # Fatias de um arquivo .fztl mapeado em memória. Cada registro guarda a
+    # temperatura após o passo junto do erro e da variação que o controlador
+    # usou antes dele, então as entradas vêm das colunas gravadas.
+    registros = ler_telemetria(caminho)
+    for inicio in range(0, len(registros), tamanho_bloco):
+        bloco = registros[inicio:inicio + tamanho_bloco]
+        yield {
+            'tempo': np.asarray(bloco['tempo'], dtype=float),
+            'temperatura': np.asarray(bloco['temperatura'], dtype=float),
+            'temperatura_desejada': np.asarray(bloco['temperatura_desejada'], dtype=float),
+            'erro': np.asarray(bloco['erro'], dtype=float),
+            'variacao': np.asarray(bloco['variacao'], dtype=float),
+            'potencia': np.asarray(bloco['potencia'], dtype=float),
+        }
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    if caminho.endswith('.fztl'):
+        return ler_blocos_telemetria(caminho, tamanho_bloco)
+    return ler_blocos_csv(caminho, tamanho_bloco)
+
+
+def reproduzir(blocos, motor, saturacao=None):
+    # Reaplica o controlador fuzzy sobre os blocos gravados. Blocos com as
+    # colunas 'erro' e 'variacao' (telemetria) são usados como gravados; nos
+    # demais, as entradas são derivadas das temperaturas, e a variação usa a
+    # última amostra do bloco anterior, então o resultado não depende do
+    # tamanho dos blocos. As saídas passam pela política de saturação, como no
+    # app; com 'manter', a última potência válida segue de um bloco ao outro.
+    if saturacao is None:
+        saturacao = PoliticaSaturacao()
+    tempo_anterior = None
+    temperatura_anterior = None
+
+    for bloco in blocos:
+        tempo = bloco['tempo']
+        temperatura = bloco['temperatura']
+        if len(tempo) == 0:
+            continue
+
+        if 'erro' in bloco and 'variacao' in bloco:
+            erro = bloco['erro']
+            variacao = bloco['variacao']
+        else:
+            erro = bloco['temperatura_desejada'] - temperatura
+
+            # Variação por segundo em relação à amostra anterior (0 na primeira)
+            if tempo_anterior is None:
+                tempos_ant = np.concatenate(([tempo[0]], tempo[:-1]))
+                temperaturas_ant = np.concatenate(([temperatura[0]], temperatura[:-1]))
+            else:
+                tempos_ant = np.concatenate(([tempo_anterior], tempo[:-1]))
+                temperaturas_ant = np.concatenate(([temperatura_anterior], temperatura[:-1]))
+            intervalo = tempo - tempos_ant
+            with np.errstate(invalid='ignore', divide='ignore'):
+                variacao = np.where(intervalo > 0, (temperatura - temperaturas_ant) / intervalo, 0.0)
+
+        potencia = saturacao.calcular_muitos(motor, erro, variacao)
+
+        resultado = {
+            'tempo': tempo,
+            'erro': erro,
+            'variacao': variacao,
+            'potencia': potencia,
+        }
+        if 'potencia' in bloco:
+            resultado['potencia_gravada'] = bloco['potencia']
+            resultado['diferenca'] = potencia - bloco['potencia']
+        yield resultado
+
+        tempo_anterior = tempo[-1]
+        temperatura_anterior = temperatura[-1]
+
+
+def executar_replay(caminho_entrada, motor, caminho_saida=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO, saturacao=None):
+    # Processa o arquivo inteiro em fluxo e retorna estatísticas da diferença
+    # entre a potência recalculada e a gravada
+    n_amostras = 0
+    soma_abs = 0.0
+    soma_quad = 0.0
+    maxima = 0.0
+    com_gravacao = False
+
+    saida = open(caminho_saida, 'w', encoding='utf-8') if caminho_saida else None
+    try:
+        for i, resultado in enumerate(reproduzir(ler_blocos(caminho_entrada, tamanho_bloco), motor, saturacao)):
+            colunas = list(resultado)
+            if saida is not None:
+                np.savetxt(saida, np.column_stack([resultado[c] for c in colunas]), delimiter=',',
+                           fmt='%.6f', header=','.join(colunas) if i == 0 else '', comments='')
+
+            n_amostras += len(resultado['tempo'])
+            if 'diferenca' in resultado:
+                com_gravacao = True
+                diferenca = np.abs(resultado['diferenca'])
+                soma_abs += float(diferenca.sum())
+                soma_quad += float((diferenca ** 2).sum())
+                maxima = max(maxima, float(diferenca.max()))
+    finally:
+        if saida is not None:
+            saida.close()
+
+    estatisticas = {'amostras': n_amostras}
+    if com_gravacao and n_amostras:
+        estatisticas.update({
+            'diferenca_media_abs': soma_abs / n_amostras,
+            'diferenca_rms': (soma_quad / n_amostras) ** 0.5,
+            'diferenca_maxima': maxima,
+        })
+    return estatisticas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reaplica o controlador fuzzy sobre dados gravados (CSV ou .fztl).")
+    parser.add_argument('entrada')
+    parser.add_argument('--saida', default=None, help="CSV com as potências recalculadas")
+    parser.add_argument('--parametros', default=None, help="JSON com os parâmetros das funções de pertinência")
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO_PADRAO)
+    parser.add_argument('--entrada-fora', choices=POLITICAS_ENTRADA, default='limitar',
+                        help="Tratamento das entradas fora dos universos")
+    parser.add_argument('--sem-ativacao', choices=POLITICAS_SEM_ATIVACAO, default='constante',
+                        help="Potência quando nenhuma regra é ativada")
+    args = parser.parse_args()
+
+    if args.parametros:
+        parametros_erro, parametros_var = carregar_parametros(args.parametros)
+    else:
+        parametros_erro, parametros_var = PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+    motor = MotorFuzzyVetorizado(parametros_erro, parametros_var)
+
+    saturacao = PoliticaSaturacao(args.entrada_fora, args.sem_ativacao)
+    estatisticas = executar_replay(args.entrada, motor, args.saida, args.bloco, saturacao)
+    for chave, valor in estatisticas.items():
+        print(f"{chave}: {valor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import numpy as np
+
+from definicao_fuzzy import UNIVERSO_ERRO, UNIVERSO_VARIACAO, UNIVERSO_POTENCIA
+
+
+# Potência usada quando nenhuma regra é ativada (política 'constante')
+POTENCIA_PADRAO = 50.0
+
+# Entradas fora dos universos: limitadas às bordas (como no skfuzzy) ou com a
+# saída extrapolada linearmente a partir da borda
+POLITICAS_ENTRADA = ('limitar', 'extrapolar')
+
+# Nenhuma regra ativada: potência fixa, última potência válida ou NaN
+POLITICAS_SEM_ATIVACAO = ('constante', 'manter', 'nan')
+
+
+class PoliticaSaturacao:
+    # Tratamento determinístico das entradas fora dos universos e dos pontos
+    # sem regra ativa, aplicado sobre a saída bruta de qualquer motor (NaN
+    # onde nenhuma regra dispara), sem exceções no caminho de controle.
+    #
+    # `contadores` registra quantas avaliações acionaram cada política.
+
+    def __init__(self, entrada='limitar', sem_ativacao='constante', valor_padrao=POTENCIA_PADRAO,
+                 passo_extrapolacao=(1.0, 1.0)):
+        self.faixa_erro = (float(UNIVERSO_ERRO[0]), float(UNIVERSO_ERRO[-1]))
+        self.faixa_variacao = (float(UNIVERSO_VARIACAO[0]), float(UNIVERSO_VARIACAO[-1]))
+        self.faixa_saida = (float(UNIVERSO_POTENCIA[0]), float(UNIVERSO_POTENCIA[-1]))
+        self.passo_extrapolacao = tuple(float(p) for p in passo_extrapolacao)
+        self.valor_padrao = float(valor_padrao)
+        self.ultima_saida = self.valor_padrao
+        self.contadores = dict.fromkeys(POLITICAS_ENTRADA + POLITICAS_SEM_ATIVACAO, 0)
+        self.configurar(entrada, sem_ativacao)
+
+    def configurar(self, entrada=None, sem_ativacao=None):
+        if entrada is not None and entrada not in POLITICAS_ENTRADA:
+            raise ValueError(f"Política de entrada desconhecida: '{entrada}'.")
+        if sem_ativacao is not None and sem_ativacao not in POLITICAS_SEM_ATIVACAO:
+            raise ValueError(f"Política sem ativação desconhecida: '{sem_ativacao}'.")
+        if entrada is not None:
+            self.entrada = entrada
+        if sem_ativacao is not None:
+            self.sem_ativacao = sem_ativacao
+
+    def zerar_contadores(self):
+        for chave in self.contadores:
+            self.contadores[chave] = 0
+
+    def reiniciar(self):
+        # Esquece a última potência válida (política 'manter')
+        self.ultima_saida = self.valor_padrao
+
+    def corrigir(self, motor, erro, variacao, potencia):
+        # Um passo do controlador: `potencia` é a saída bruta do motor para
+        # (erro, variacao), possivelmente NaN. `motor` só é consultado na
+        # extrapolação, por compute_many.
+        erro_limitado = min(max(erro, self.faixa_erro[0]), self.faixa_erro[1])
+        variacao_limitada = min(max(variacao, self.faixa_variacao[0]), self.faixa_variacao[1])
+        if erro_limitado != erro or variacao_limitada != variacao:
+            self.contadores[self.entrada] += 1
+            if self.entrada == 'extrapolar' and potencia == potencia:
+                potencia = float(self._extrapolar(motor, np.array([float(erro)]), np.array([float(variacao)]),
+                                                  np.array([potencia]))[0])
+
+        if potencia == potencia:
+            self.ultima_saida = potencia
+            return potencia
+        self.contadores[self.sem_ativacao] += 1
+        if self.sem_ativacao == 'constante':
+            return self.valor_padrao
+        if self.sem_ativacao == 'manter':
+            return self.ultima_saida
+        return potencia
+
+    def calcular(self, motor, erro, variacao):
+        # Potência de um passo a partir de qualquer motor com compute_many
+        potencia = float(motor.compute_many(np.array([float(erro)]), np.array([float(variacao)]))[0])
+        return self.corrigir(motor, erro, variacao, potencia)
+
+    def calcular_muitos(self, motor, erros, variacoes, anteriores=None):
+        # Versão em lote; com 'manter', cada ponto sem regra ativa recebe a
+        # última potência válida anterior na ordem do lote ou, se
+        # `anteriores` for dado, a última potência válida do próprio ponto
+        # (lotes com pontos independentes, como unidades distintas)
+        erros, variacoes = np.broadcast_arrays(np.asarray(erros, dtype=float), np.asarray(variacoes, dtype=float))
+        forma = erros.shape
+        erros = erros.ravel()
+        variacoes = variacoes.ravel()
+        potencias = np.array(motor.compute_many(erros, variacoes), dtype=float).ravel()
+
+        fora = ((erros < self.faixa_erro[0]) | (erros > self.faixa_erro[1])
+                | (variacoes < self.faixa_variacao[0]) | (variacoes > self.faixa_variacao[1]))
+        n_fora = int(np.count_nonzero(fora))
+        if n_fora:
+            self.contadores[self.entrada] += n_fora
+            if self.entrada == 'extrapolar':
+                potencias[fora] = self._extrapolar(motor, erros[fora], variacoes[fora], potencias[fora])
+
+        validas = ~np.isnan(potencias)
+        n_sem_ativacao = len(potencias) - int(np.count_nonzero(validas))
+        if n_sem_ativacao:
+            self.contadores[self.sem_ativacao] += n_sem_ativacao
+            if self.sem_ativacao == 'constante':
+                potencias[~validas] = self.valor_padrao
+            elif self.sem_ativacao == 'manter' and anteriores is not None:
+                anteriores = np.broadcast_to(np.asarray(anteriores, dtype=float), forma).ravel()
+                potencias = np.where(validas, potencias, anteriores)
+            elif self.sem_ativacao == 'manter':
+                anterior = np.maximum.accumulate(np.where(validas, np.arange(len(potencias)), -1))
+                preenchidas = np.where(anterior >= 0, potencias[np.maximum(anterior, 0)], self.ultima_saida)
+                potencias = np.where(validas, potencias, preenchidas)
+        if not n_sem_ativacao and len(potencias):
+            self.ultima_saida = float(potencias[-1])
+        elif n_sem_ativacao < len(potencias):
+            self.ultima_saida = float(potencias[np.flatnonzero(validas)[-1]])
+        return potencias.reshape(forma)
+
+    def _extrapolar(self, motor, erros, variacoes, potencias):
+        # Continua a superfície além da borda com a inclinação do último
+        # passo dentro do universo, em cada entrada que saiu da faixa. Os
+        # motores limitam as entradas, então `potencias` é o valor na borda.
+        erros_limitados = np.clip(erros, *self.faixa_erro)
+        variacoes_limitadas = np.clip(variacoes, *self.faixa_variacao)
+        excesso_erro = erros - erros_limitados
+        excesso_variacao = variacoes - variacoes_limitadas
+        passo_erro, passo_variacao = self.passo_extrapolacao
+
+        n = len(erros)
+        internas = motor.compute_many(
+            np.concatenate((erros_limitados - passo_erro * np.sign(excesso_erro), erros_limitados)),
+            np.concatenate((variacoes_limitadas, variacoes_limitadas - passo_variacao * np.sign(excesso_variacao))))
+        acrescimo = (np.abs(excesso_erro) / passo_erro * np.nan_to_num(potencias - internas[:n])
+                     + np.abs(excesso_variacao) / passo_variacao * np.nan_to_num(potencias - internas[n:]))
+        return np.clip(potencias + acrescimo, *self.faixa_saida)
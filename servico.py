@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, carregar_parametros
+from motor_superficie import TabelaSuperficie
+from motor_vetorizado import MotorFuzzyVetorizado
+from saturacao import PoliticaSaturacao
+
+
+# Limites padrão dos micro-lotes e da fila de leituras pendentes
+JANELA_LOTE_S = 0.002
+TAMANHO_MAXIMO_LOTE = 256
+LIMITE_FILA = 4096
+
+# Corpo máximo aceito em uma requisição HTTP
+TAMANHO_MAXIMO_CORPO = 64 * 1024
+
+
+class ErroLeitura(ValueError):
+    pass
+
+
+class ErroInferencia(RuntimeError):
+    pass
+
+
+class EstadoUnidades:
+    # Última leitura de cada unidade, usada para derivar a variação de
+    # temperatura (°C/s) da leitura seguinte. Sem o campo 'tempo' na leitura,
+    # vale o instante de chegada ao serviço.
+
+    def __init__(self):
+        self.anteriores = {}
+        self.potencias = {}
+
+    def registrar(self, unidade, temperatura, tempo):
+        anterior = self.anteriores.get(unidade)
+        self.anteriores[unidade] = (temperatura, tempo)
+        if anterior is None:
+            return 0.0
+        temperatura_anterior, tempo_anterior = anterior
+        return (temperatura - temperatura_anterior) / max(tempo - tempo_anterior, 1e-6)
+
+    def potencias_anteriores(self, unidades, padrao):
+        # Última potência válida de cada unidade (política 'manter')
+        return np.array([self.potencias.get(unidade, padrao) for unidade in unidades])
+
+
+class LoteadorInferencia:
+    # Agrupa as leituras que chegam concorrentemente em micro-lotes e resolve
+    # cada lote com uma única chamada vetorizada. Um lote é fechado ao atingir
+    # `tamanho_maximo` leituras ou `janela` segundos após a primeira delas.
+    #
+    # A fila tem capacidade `limite_fila`: com ela cheia, `enviar` aguarda
+    # (e a conexão deixa de ser lida, propagando a contrapressão ao cliente)
+    # e `tentar_enviar` retorna None.
+
+    def __init__(self, motor, saturacao=None, janela=JANELA_LOTE_S, tamanho_maximo=TAMANHO_MAXIMO_LOTE,
+                 limite_fila=LIMITE_FILA):
+        if janela < 0 or tamanho_maximo < 1 or limite_fila < 1:
+            raise ValueError("Janela, tamanho de lote e limite da fila inválidos.")
+        self.motor = motor
+        self.saturacao = saturacao if saturacao is not None else PoliticaSaturacao()
+        self.janela = float(janela)
+        self.tamanho_maximo = int(tamanho_maximo)
+        self.fila = asyncio.Queue(limite_fila)
+        self.unidades = EstadoUnidades()
+        self.lotes = 0
+        self.leituras = 0
+        self.rejeitadas = 0
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.get_running_loop().create_task(self._processar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+
+    def _preparar(self, leitura):
+        # Converte a leitura em (erro, variacao, futuro). A variação é
+        # derivada aqui, na ordem de chegada de cada unidade.
+        try:
+            unidade = str(leitura['unidade'])
+            temperatura = float(leitura['temperatura'])
+            desejada = float(leitura['desejada'])
+            tempo = float(leitura.get('tempo', time.monotonic()))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ErroLeitura("A leitura deve conter 'unidade', 'temperatura' e 'desejada' numéricas.") from None
+        if not np.isfinite((temperatura, desejada, tempo)).all():
+            raise ErroLeitura("'temperatura', 'desejada' e 'tempo' devem ser finitos.")
+        variacao = self.unidades.registrar(unidade, temperatura, tempo)
+        futuro = asyncio.get_running_loop().create_future()
+        return unidade, desejada - temperatura, variacao, futuro
+
+    async def enviar(self, leitura):
+        item = self._preparar(leitura)
+        await self.fila.put(item)
+        return await item[3]
+
+    async def tentar_enviar(self, leitura):
+        if self.fila.full():
+            self.rejeitadas += 1
+            return None
+        item = self._preparar(leitura)
+        self.fila.put_nowait(item)
+        return await item[3]
+
+    async def _processar(self):
+        fila = self.fila
+        relogio = asyncio.get_running_loop().time
+        while True:
+            lote = [await fila.get()]
+            limite = relogio() + self.janela
+            while len(lote) < self.tamanho_maximo:
+                if fila.empty():
+                    restante = limite - relogio()
+                    if restante <= 0:
+                        break
+                    try:
+                        lote.append(await asyncio.wait_for(fila.get(), restante))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    lote.append(fila.get_nowait())
+            try:
+                self._resolver(lote)
+            except Exception as e:
+                # Uma falha afeta só as leituras deste lote; o laço continua
+                falha = ErroInferencia(f"Falha na inferência do lote: {e}")
+                for item in lote:
+                    if not item[3].done():
+                        item[3].set_exception(falha)
+
+    def _resolver(self, lote):
+        unidades = [item[0] for item in lote]
+        erros = np.array([item[1] for item in lote])
+        variacoes = np.array([item[2] for item in lote])
+        saturacao = self.saturacao
+        potencias = saturacao.calcular_muitos(
+            self.motor, erros, variacoes, self.unidades.potencias_anteriores(unidades, saturacao.valor_padrao))
+        self.lotes += 1
+        self.leituras += len(lote)
+        for (unidade, erro, variacao, futuro), potencia in zip(lote, potencias.tolist()):
+            if potencia == potencia:
+                self.unidades.potencias[unidade] = potencia
+            if not futuro.done():
+                futuro.set_result({'unidade': unidade, 'potencia': potencia, 'erro': erro, 'variacao': variacao})
+
+    def estatisticas(self):
+        return {
+            'leituras': self.leituras,
+            'lotes': self.lotes,
+            'lote_medio': self.leituras / self.lotes if self.lotes else 0.0,
+            'rejeitadas': self.rejeitadas,
+            'pendentes': self.fila.qsize(),
+            'unidades': len(self.unidades.anteriores),
+            'saturacao': dict(self.saturacao.contadores),
+        }
+
+
+class ServicoControle:
+    # Serviço sem interface gráfica. Em TCP ou socket Unix, cada linha é um
+    # objeto JSON {"unidade", "temperatura", "desejada"[, "tempo"]} e a
+    # resposta é uma linha JSON com a potência. Em HTTP, o mesmo objeto é
+    # enviado por POST /leitura; GET /estado retorna as estatísticas.
+
+    def __init__(self, loteador):
+        self.loteador = loteador
+
+    async def atender_linhas(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    resposta = await self.loteador.enviar(json.loads(linha))
+                except (ValueError, ErroInferencia) as e:
+                    resposta = {'erro': str(e)}
+                escritor.write(json.dumps(resposta).encode('utf-8') + b"\n")
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def atender_http(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                partes = linha.decode('latin-1').split()
+                if len(partes) != 3:
+                    await self._responder(escritor, 400, {'erro': "Requisição inválida."}, False)
+                    break
+                metodo, caminho, versao = partes
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                manter = (cabecalhos.get('connection', '').lower() != 'close'
+                          and not (versao == 'HTTP/1.0' and cabecalhos.get('connection', '').lower() != 'keep-alive'))
+
+                tamanho = int(cabecalhos.get('content-length', 0) or 0)
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    await self._responder(escritor, 413, {'erro': "Corpo muito grande."}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                if metodo == 'POST' and caminho == '/leitura':
+                    try:
+                        resposta = await self.loteador.tentar_enviar(json.loads(corpo))
+                    except ValueError as e:
+                        await self._responder(escritor, 400, {'erro': str(e)}, manter)
+                    except ErroInferencia as e:
+                        await self._responder(escritor, 500, {'erro': str(e)}, manter)
+                    else:
+                        if resposta is None:
+                            await self._responder(escritor, 503, {'erro': "Serviço sobrecarregado."}, manter)
+                        else:
+                            await self._responder(escritor, 200, resposta, manter)
+                elif metodo == 'GET' and caminho == '/estado':
+                    await self._responder(escritor, 200, self.loteador.estatisticas(), manter)
+                else:
+                    await self._responder(escritor, 404, {'erro': "Caminho desconhecido."}, manter)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    @staticmethod
+    async def _responder(escritor, status, dados, manter):
+        razoes = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  500: 'Internal Server Error', 503: 'Service Unavailable'}
+        corpo = json.dumps(dados).encode('utf-8')
+        escritor.write(
+            f"HTTP/1.1 {status} {razoes[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode('latin-1') + corpo)
+        await escritor.drain()
+
+
+async def iniciar_servidor(servico, transporte='tcp', host='127.0.0.1', porta=8765, caminho_unix=None):
+    # Retorna o asyncio.Server já escutando
+    atender = servico.atender_http if transporte == 'http' else servico.atender_linhas
+    if transporte == 'unix':
+        return await asyncio.start_unix_server(atender, path=caminho_unix)
+    if transporte in ('tcp', 'http'):
+        return await asyncio.start_server(atender, host, porta)
+    raise ValueError(f"Transporte desconhecido: '{transporte}'.")
+
+
+def criar_motor(parametros_erro, parametros_var, motor='vetorizado'):
+    vetorizado = MotorFuzzyVetorizado(parametros_erro, parametros_var)
+    if motor == 'superficie':
+        return TabelaSuperficie(vetorizado, validar=False)
+    return vetorizado
+
+
+async def executar(args):
+    if args.parametros:
+        parametros_erro, parametros_var = carregar_parametros(args.parametros)
+    else:
+        parametros_erro, parametros_var = PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+
+    loteador = LoteadorInferencia(criar_motor(parametros_erro, parametros_var, args.motor),
+                                  janela=args.janela_ms / 1000.0, tamanho_maximo=args.tamanho_lote,
+                                  limite_fila=args.limite_fila)
+    loteador.iniciar()
+    servidor = await iniciar_servidor(ServicoControle(loteador), args.transporte, args.host, args.porta, args.unix)
+    endereco = args.unix if args.transporte == 'unix' else f"{args.host}:{args.porta}"
+    print(f"Serviço {args.transporte} em {endereco}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await loteador.parar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço de controle fuzzy com inferência em micro-lotes.")
+    parser.add_argument('--transporte', choices=('tcp', 'unix', 'http'), default='tcp')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', default='/tmp/controle_fuzzy.sock', help="Caminho do socket Unix")
+    parser.add_argument('--motor', choices=('vetorizado', 'superficie'), default='vetorizado')
+    parser.add_argument('--parametros', default=None, help="JSON com os parâmetros das funções de pertinência")
+    parser.add_argument('--janela-ms', type=float, default=JANELA_LOTE_S * 1000.0)
+    parser.add_argument('--tamanho-lote', type=int, default=TAMANHO_MAXIMO_LOTE)
+    parser.add_argument('--limite-fila', type=int, default=LIMITE_FILA)
+    args = parser.parse_args()
+    try:
+        asyncio.run(executar(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
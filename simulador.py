@@ -0,0 +1,85 @@
+import numpy as np
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from motor_vetorizado import MotorFuzzyVetorizado
+from saturacao import PoliticaSaturacao, POTENCIA_PADRAO
+from planta import TEMPERATURA_AMBIENTE, GANHO_POTENCIA, COEFICIENTE_AMBIENTE, PlantaLote, modelo_primeira_ordem
+
+
+def variacao_temperatura(temperatura, potencia, delta_t):
+    # Passo de Euler explícito do modelo de primeira ordem
+    fator_ambiente = -COEFICIENTE_AMBIENTE * (temperatura - TEMPERATURA_AMBIENTE)
+    return (potencia / 100.0 * GANHO_POTENCIA) * delta_t + fator_ambiente * delta_t
+
+
+class SimuladorChuveiro:
+    # Simulação em malha fechada sem interface gráfica e com passo fixo.
+    # Usa o mesmo controlador fuzzy e o mesmo modelo térmico da aplicação,
+    # avançando tão rápido quanto o motor de inferência permitir.
+    #
+    # `saturacao` define o tratamento das entradas fora dos universos e dos
+    # passos sem regra ativa; o padrão limita as entradas e usa POTENCIA_PADRAO.
+    # `modelo` (um ModeloTermico de planta.py) e `integrador` substituem o
+    # passo de Euler do modelo de primeira ordem.
+
+    def __init__(self, motor=None, dt=1.0, temperatura_inicial=20.0, temperatura_desejada=25.0, saturacao=None,
+                 modelo=None, integrador='euler'):
+        if dt <= 0:
+            raise ValueError("O passo de simulação deve ser positivo.")
+
+        if motor is None:
+            motor = MotorFuzzyVetorizado(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)
+
+        self.motor = motor
+        self.saturacao = saturacao if saturacao is not None else PoliticaSaturacao()
+        self.dt = float(dt)
+        self.temperatura_inicial = float(temperatura_inicial)
+        self.temperatura_desejada = float(temperatura_desejada)
+        self.modelo = modelo
+        self.integrador = integrador
+
+    def simular(self, passos):
+        # Retorna as trajetórias como arrays NumPy de tamanho passos + 1
+        # (o índice 0 é o estado inicial, como no histórico da aplicação)
+        tempo = np.arange(passos + 1) * self.dt
+        temperatura = np.empty(passos + 1)
+        potencia = np.zeros(passos + 1)
+        erro = np.zeros(passos + 1)
+        variacao = np.zeros(passos + 1)
+
+        temperatura_atual = self.temperatura_inicial
+        temperatura_anterior = temperatura_atual
+        temperatura[0] = temperatura_atual
+        erro[0] = self.temperatura_desejada - temperatura_atual
+
+        dt = self.dt
+        motor = self.motor
+        calcular = self.saturacao.calcular
+        planta = None
+        if self.modelo is not None or self.integrador != 'euler':
+            modelo = self.modelo if self.modelo is not None else modelo_primeira_ordem()
+            planta = PlantaLote(modelo, 1, temperatura_atual, self.integrador, dt)
+        for k in range(1, passos + 1):
+            erro_k = self.temperatura_desejada - temperatura_atual
+            variacao_k = (temperatura_atual - temperatura_anterior) / dt
+
+            potencia_k = calcular(motor, erro_k, variacao_k)
+
+            temperatura_anterior = temperatura_atual
+            if planta is None:
+                temperatura_atual += variacao_temperatura(temperatura_atual, potencia_k, dt)
+            else:
+                temperatura_atual = float(planta.avancar(potencia_k)[0])
+
+            temperatura[k] = temperatura_atual
+            potencia[k] = potencia_k
+            erro[k] = erro_k
+            variacao[k] = variacao_k
+
+        return {
+            'tempo': tempo,
+            'temperatura': temperatura,
+            'potencia': potencia,
+            'erro': erro,
+            'variacao': variacao,
+        }
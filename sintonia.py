@@ -0,0 +1,235 @@
+import argparse
+import hashlib
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from definicao_fuzzy import (
+    UNIVERSO_ERRO, UNIVERSO_VARIACAO, PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, salvar_parametros
+)
+from motor_vetorizado import MotorFuzzyVetorizado
+from simulador import SimuladorChuveiro
+from varredura import calcular_metricas
+
+
+# Peso da energia (%·s) em relação ao IAE (°C·s) no custo
+PESO_ENERGIA_PADRAO = 0.01
+
+# Casas decimais dos parâmetros: candidatos iguais após o arredondamento
+# compartilham a mesma entrada do cache
+CASAS_DECIMAIS = 3
+
+
+class EspacoParametros:
+    # Vetor de otimização com os vértices [a, b, c] de todos os termos de
+    # erro e variação, na ordem dos dicionários de parâmetros. Os ombros dos
+    # termos extremos ficam presos às bordas do universo, e cada triângulo é
+    # reparado ordenando seus vértices, o que garante a <= b <= c.
+
+    def __init__(self, parametros_erro=PARAMETROS_ERRO_PADRAO, parametros_var=PARAMETROS_VAR_PADRAO,
+                 fixar_ombros=True):
+        self.termos_erro = list(parametros_erro)
+        self.termos_var = list(parametros_var)
+        self.inicial = np.array([p for params in list(parametros_erro.values()) + list(parametros_var.values())
+                                 for p in params], dtype=float)
+
+        limites = []
+        for termos, universo in ((self.termos_erro, UNIVERSO_ERRO), (self.termos_var, UNIVERSO_VARIACAO)):
+            minimo, maximo = float(universo[0]), float(universo[-1])
+            for i in range(len(termos)):
+                for j in range(3):
+                    if fixar_ombros and i == 0 and j < 2:
+                        limites.append((minimo, minimo))
+                    elif fixar_ombros and i == len(termos) - 1 and j > 0:
+                        limites.append((maximo, maximo))
+                    else:
+                        limites.append((minimo, maximo))
+        self.limites = np.array(limites)
+
+    @property
+    def dimensao(self):
+        return len(self.inicial)
+
+    def reparar(self, vetores):
+        # Limita aos universos, ordena cada triângulo e arredonda
+        vetores = np.clip(vetores, self.limites[:, 0], self.limites[:, 1])
+        vetores = np.sort(vetores.reshape(*vetores.shape[:-1], -1, 3), axis=-1).reshape(vetores.shape)
+        return np.round(vetores, CASAS_DECIMAIS)
+
+    def decodificar(self, vetor):
+        # Vetor -> (parametros_erro, parametros_var) no formato de definicao_fuzzy
+        triangulos = [[float(p) for p in t] for t in np.asarray(vetor).reshape(-1, 3)]
+        n_erro = len(self.termos_erro)
+        return (dict(zip(self.termos_erro, triangulos[:n_erro])),
+                dict(zip(self.termos_var, triangulos[n_erro:])))
+
+
+class CacheAvaliacoes:
+    # Custos indexados pelo conteúdo: hash do vetor de parâmetros e da
+    # configuração da avaliação. Com `caminho`, as entradas são anexadas a um
+    # arquivo JSON Lines e reaproveitadas por execuções seguintes.
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self.custos = {}
+        self.acertos = 0
+        self.falhas = 0
+        if caminho is not None and os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                for linha in arquivo:
+                    if linha.strip():
+                        entrada = json.loads(linha)
+                        self.custos[entrada['chave']] = entrada['custo']
+
+    @staticmethod
+    def chave(vetor, configuracao):
+        conteudo = json.dumps({'vetor': [round(float(v), CASAS_DECIMAIS) for v in vetor],
+                               'configuracao': configuracao}, sort_keys=True)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def __contains__(self, chave):
+        return chave in self.custos
+
+    def __getitem__(self, chave):
+        return self.custos[chave]
+
+    def adicionar(self, novos):
+        self.custos.update(novos)
+        if self.caminho is not None and novos:
+            with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+                for chave, custo in novos.items():
+                    arquivo.write(json.dumps({'chave': chave, 'custo': custo}) + "\n")
+
+
+def avaliar_candidato(tarefa):
+    # Executado nos processos de trabalho: custo em malha fechada de um
+    # conjunto de parâmetros sobre todos os cenários da configuração
+    parametros_erro, parametros_var, configuracao = tarefa
+    motor = MotorFuzzyVetorizado(parametros_erro, parametros_var)
+    custo = 0.0
+    for temperatura_inicial, temperatura_desejada in configuracao['cenarios']:
+        simulador = SimuladorChuveiro(motor, configuracao['dt'], temperatura_inicial, temperatura_desejada)
+        metricas = calcular_metricas(simulador.simular(configuracao['passos']), temperatura_desejada,
+                                     configuracao['dt'])
+        custo += metricas['iae'] + configuracao['peso_energia'] * metricas['energia']
+    return custo
+
+
+class Sintonizador:
+    # Evolução diferencial (DE/rand/1/bin) sobre os vértices das funções de
+    # pertinência. Cada geração avalia apenas os candidatos ausentes do cache,
+    # distribuídos entre os processos do pool.
+
+    def __init__(self, espaco=None, temperaturas_iniciais=(20.0,), temperaturas_desejadas=(25.0, 35.0, 45.0),
+                 dt=1.0, passos=300, peso_energia=PESO_ENERGIA_PADRAO, processos=None, cache=None):
+        self.espaco = espaco if espaco is not None else EspacoParametros()
+        self.configuracao = {
+            'cenarios': [(float(i), float(d)) for i in temperaturas_iniciais for d in temperaturas_desejadas],
+            'dt': float(dt),
+            'passos': int(passos),
+            'peso_energia': float(peso_energia),
+        }
+        self.processos = processos if processos is not None else (os.cpu_count() or 1)
+        self.cache = cache if cache is not None else CacheAvaliacoes()
+        self.simulacoes = 0
+
+    def avaliar(self, vetores, pool=None):
+        # Custos de uma população; candidatos repetidos (na população ou em
+        # gerações anteriores) não são simulados de novo
+        chaves = [CacheAvaliacoes.chave(v, self.configuracao) for v in vetores]
+        pendentes = {}
+        for chave, vetor in zip(chaves, vetores):
+            if chave in self.cache or chave in pendentes:
+                self.cache.acertos += 1
+            else:
+                self.cache.falhas += 1
+                pendentes[chave] = vetor
+
+        tarefas = [self.espaco.decodificar(v) + (self.configuracao,) for v in pendentes.values()]
+        if pool is not None and len(tarefas) > 1:
+            tamanho_lote = max(1, len(tarefas) // (self.processos * 4))
+            custos = list(pool.imap(avaliar_candidato, tarefas, chunksize=tamanho_lote))
+        else:
+            custos = [avaliar_candidato(t) for t in tarefas]
+        self.simulacoes += len(tarefas)
+        self.cache.adicionar(dict(zip(pendentes, custos)))
+        return np.array([self.cache[chave] for chave in chaves])
+
+    def otimizar(self, geracoes=30, tamanho_populacao=20, mutacao=0.6, cruzamento=0.8, semente=0,
+                 ao_fim_da_geracao=None):
+        # Retorna (melhor vetor, melhor custo, histórico do melhor custo por geração)
+        rng = np.random.default_rng(semente)
+        espaco = self.espaco
+        minimos, maximos = espaco.limites[:, 0], espaco.limites[:, 1]
+
+        # População inicial: os parâmetros atuais mais pontos aleatórios
+        populacao = minimos + rng.random((tamanho_populacao, espaco.dimensao)) * (maximos - minimos)
+        populacao[0] = espaco.inicial
+        populacao = espaco.reparar(populacao)
+
+        pool = Pool(self.processos) if self.processos > 1 else None
+        try:
+            custos = self.avaliar(populacao, pool)
+            historico = [float(custos.min())]
+            for geracao in range(geracoes):
+                # Mutação com três indivíduos distintos do alvo e cruzamento binomial
+                indices = np.array([rng.choice(np.delete(np.arange(tamanho_populacao), i), 3, replace=False)
+                                    for i in range(tamanho_populacao)])
+                r1, r2, r3 = populacao[indices[:, 0]], populacao[indices[:, 1]], populacao[indices[:, 2]]
+                mutantes = r1 + mutacao * (r2 - r3)
+                cruzar = rng.random(populacao.shape) < cruzamento
+                cruzar[np.arange(tamanho_populacao), rng.integers(0, espaco.dimensao, tamanho_populacao)] = True
+                candidatos = espaco.reparar(np.where(cruzar, mutantes, populacao))
+
+                custos_candidatos = self.avaliar(candidatos, pool)
+                melhores = custos_candidatos <= custos
+                populacao[melhores] = candidatos[melhores]
+                custos[melhores] = custos_candidatos[melhores]
+                historico.append(float(custos.min()))
+                if ao_fim_da_geracao is not None:
+                    ao_fim_da_geracao(geracao + 1, historico[-1])
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        melhor = int(np.argmin(custos))
+        return populacao[melhor], float(custos[melhor]), historico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sintonia automática das funções de pertinência por evolução diferencial.")
+    parser.add_argument('--geracoes', type=int, default=30)
+    parser.add_argument('--populacao', type=int, default=20)
+    parser.add_argument('--iniciais', type=float, nargs='+', default=[20.0])
+    parser.add_argument('--desejadas', type=float, nargs='+', default=[25.0, 35.0, 45.0])
+    parser.add_argument('--passos', type=int, default=300)
+    parser.add_argument('--peso-energia', type=float, default=PESO_ENERGIA_PADRAO)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--cache', default=None, help="Arquivo JSON Lines com custos já avaliados")
+    parser.add_argument('--saida', default='parametros_sintonizados.json',
+                        help="JSON de parâmetros para carregar na aplicação")
+    args = parser.parse_args()
+
+    sintonizador = Sintonizador(temperaturas_iniciais=args.iniciais, temperaturas_desejadas=args.desejadas,
+                                passos=args.passos, peso_energia=args.peso_energia,
+                                processos=args.processos, cache=CacheAvaliacoes(args.cache))
+    custo_inicial = sintonizador.avaliar(sintonizador.espaco.inicial[None, :])[0]
+    print(f"Custo dos parâmetros atuais: {custo_inicial:.1f}")
+
+    melhor, custo, _ = sintonizador.otimizar(
+        args.geracoes, args.populacao, semente=args.semente,
+        ao_fim_da_geracao=lambda g, c: print(f"Geração {g}: melhor custo = {c:.1f}"))
+
+    parametros_erro, parametros_var = sintonizador.espaco.decodificar(melhor)
+    salvar_parametros(args.saida, parametros_erro, parametros_var)
+    print(f"Custo final: {custo:.1f} ({sintonizador.simulacoes} candidatos simulados, "
+          f"{sintonizador.cache.acertos} consultas ao cache)")
+    print(f"Parâmetros salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import namedtuple
+
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+
+from definicao_fuzzy import (
+    UNIVERSO_ERRO, UNIVERSO_VARIACAO, UNIVERSO_POTENCIA, PARAMETROS_POTENCIA_PADRAO, REGRAS
+)
+
+
+# Diretório onde os sistemas já montados são guardados entre execuções
+DIRETORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_fuzzy')
+
+# Incrementar quando a montagem do sistema mudar, invalidando o cache
+VERSAO_CACHE = 1
+
+# Objetos skfuzzy do controlador. As regras e o ControlSystem apontam para os
+# mesmos termos das variáveis, o que é preservado pelo pickle.
+SistemaSkfuzzy = namedtuple('SistemaSkfuzzy', ['erro_temperatura', 'variacao_temp', 'potencia', 'regras', 'sistema_ctrl'])
+
+
+def montar_sistema(parametros_erro, parametros_var):
+    # Universos de discurso
+    erro_temperatura = ctrl.Antecedent(UNIVERSO_ERRO, 'erro_temperatura')
+    variacao_temp = ctrl.Antecedent(UNIVERSO_VARIACAO, 'variacao_temperatura')
+    potencia = ctrl.Consequent(UNIVERSO_POTENCIA, 'potencia')
+
+    # Funções de pertinência para Erro de Temperatura
+    for termo, params in parametros_erro.items():
+        erro_temperatura[termo] = fuzz.trimf(erro_temperatura.universe, params)
+
+    # Funções de pertinência para Variação de Temperatura
+    for termo, params in parametros_var.items():
+        variacao_temp[termo] = fuzz.trimf(variacao_temp.universe, params)
+
+    # Funções de pertinência para Potência
+    for termo, params in PARAMETROS_POTENCIA_PADRAO.items():
+        potencia[termo] = fuzz.trimf(potencia.universe, params)
+
+    # Regras construídas a partir da tabela declarativa
+    regras = [
+        ctrl.Rule(erro_temperatura[termo_erro] & variacao_temp[termo_var], potencia[termo_potencia])
+        for termo_erro, termo_var, termo_potencia in REGRAS
+    ]
+
+    return SistemaSkfuzzy(erro_temperatura, variacao_temp, potencia, regras, ctrl.ControlSystem(regras))
+
+
+def chave_sistema(parametros_erro, parametros_var):
+    # Identifica o sistema pelo conteúdo: parâmetros, regras e versão do skfuzzy
+    conteudo = json.dumps({
+        'versao': VERSAO_CACHE,
+        'skfuzzy': fuzz.__version__,
+        'parametros_erro': {t: [float(p) for p in v] for t, v in parametros_erro.items()},
+        'parametros_var': {t: [float(p) for p in v] for t, v in parametros_var.items()},
+        'parametros_potencia': PARAMETROS_POTENCIA_PADRAO,
+        'regras': REGRAS,
+    }, sort_keys=True)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:32]
+
+
+def carregar_sistema(parametros_erro, parametros_var, diretorio_cache=DIRETORIO_CACHE):
+    # Desserializar o sistema pronto é bem mais rápido que montar o grafo do
+    # ControlSystem. Qualquer falha no cache apenas leva à montagem normal.
+    caminho = os.path.join(diretorio_cache, chave_sistema(parametros_erro, parametros_var) + '.pkl')
+    try:
+        with open(caminho, 'rb') as arquivo:
+            sistema = pickle.load(arquivo)
+        if isinstance(sistema, SistemaSkfuzzy):
+            return sistema
+    except Exception:
+        pass
+
+    sistema = montar_sistema(parametros_erro, parametros_var)
+    try:
+        os.makedirs(diretorio_cache, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            pickle.dump(sistema, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+    except OSError:
+        pass
+    return sistema
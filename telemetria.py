@@ -0,0 +1,114 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from definicao_fuzzy import REGRAS
+
+
+# Arquivo de telemetria: assinatura, versão, tamanho do cabeçalho JSON, o
+# cabeçalho (descrição dos campos) e em seguida registros de largura fixa
+ASSINATURA = b'FZTL'
+VERSAO = 1
+_PREFIXO = struct.Struct('<4sHI')
+
+# Alinhamento do início dos registros, para leituras mapeadas em memória
+ALINHAMENTO = 64
+
+
+def tipo_registro(n_regras=len(REGRAS)):
+    return np.dtype([
+        ('tempo', '<f8'),
+        ('temperatura_desejada', '<f4'),
+        ('temperatura', '<f4'),
+        ('erro', '<f4'),
+        ('variacao', '<f4'),
+        ('potencia', '<f4'),
+        ('forcas', '<f4', (n_regras,)),
+    ])
+
+
+def _montar_cabecalho(dtype):
+    descricao = json.dumps({'campos': dtype.descr}).encode('utf-8')
+    tamanho = _PREFIXO.size + len(descricao)
+    preenchimento = (-tamanho) % ALINHAMENTO
+    descricao += b' ' * preenchimento
+    return _PREFIXO.pack(ASSINATURA, VERSAO, len(descricao)) + descricao
+
+
+def _ler_cabecalho(arquivo):
+    prefixo = arquivo.read(_PREFIXO.size)
+    if len(prefixo) < _PREFIXO.size:
+        raise ValueError("Arquivo de telemetria truncado.")
+    assinatura, versao, tamanho = _PREFIXO.unpack(prefixo)
+    if assinatura != ASSINATURA or versao != VERSAO:
+        raise ValueError("O arquivo não é um registro de telemetria reconhecido.")
+    descricao = json.loads(arquivo.read(tamanho).decode('utf-8'))
+    campos = [tuple(campo[:2]) + (tuple(campo[2]),) if len(campo) > 2 else tuple(campo)
+              for campo in descricao['campos']]
+    return np.dtype(campos), _PREFIXO.size + tamanho
+
+
+class GravadorTelemetria:
+    # Grava cada passo do controlador em um arquivo binário somente de acréscimo.
+    # Os registros são acumulados em um array estruturado e escritos em lotes.
+
+    def __init__(self, caminho, n_regras=len(REGRAS), tamanho_lote=1024):
+        self.caminho = caminho
+        self.dtype = tipo_registro(n_regras)
+        self._lote = np.zeros(tamanho_lote, dtype=self.dtype)
+        self._pendentes = 0
+        self.total_registros = 0
+
+        if os.path.exists(caminho) and os.path.getsize(caminho) > 0:
+            # Continua um arquivo existente se o formato for o mesmo
+            with open(caminho, 'r+b') as arquivo:
+                dtype, inicio = _ler_cabecalho(arquivo)
+                if dtype != self.dtype:
+                    raise ValueError("O arquivo existente usa um formato de registro diferente.")
+                # Descarta um registro incompleto deixado por uma gravação interrompida
+                n_registros = (os.path.getsize(caminho) - inicio) // dtype.itemsize
+                arquivo.truncate(inicio + n_registros * dtype.itemsize)
+            self._arquivo = open(caminho, 'ab')
+        else:
+            self._arquivo = open(caminho, 'wb')
+            self._arquivo.write(_montar_cabecalho(self.dtype))
+
+    def registrar(self, tempo, temperatura_desejada, temperatura, erro, variacao, potencia, forcas):
+        self._lote[self._pendentes] = (tempo, temperatura_desejada, temperatura, erro, variacao, potencia, forcas)
+
+        self._pendentes += 1
+        self.total_registros += 1
+        if self._pendentes == len(self._lote):
+            self.descarregar()
+
+    def descarregar(self):
+        if self._pendentes:
+            self._arquivo.write(self._lote[:self._pendentes].tobytes())
+            self._pendentes = 0
+        self._arquivo.flush()
+
+    def fechar(self):
+        if not self._arquivo.closed:
+            self.descarregar()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def ler_telemetria(caminho):
+    # Retorna os registros como um array estruturado mapeado em memória:
+    # nada é carregado até que os campos sejam acessados
+    with open(caminho, 'rb') as arquivo:
+        dtype, inicio = _ler_cabecalho(arquivo)
+
+    # Ignora um eventual registro incompleto no final (gravação interrompida)
+    n_registros = (os.path.getsize(caminho) - inicio) // dtype.itemsize
+    if n_registros == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode='r', offset=inicio, shape=(n_registros,))
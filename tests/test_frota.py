@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from frota import FrotaControladores
+from saturacao import POTENCIA_PADRAO, PoliticaSaturacao
+
+
+def frota_dois_conjuntos(motor, saturacao=None):
+    # Quatro unidades alternando entre dois conjuntos iguais de parâmetros
+    conjuntos = [(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)] * 2
+    return FrotaControladores(4, temperatura_desejada=[25.0, 30.0, 35.0, 40.0],
+                              conjuntos_parametros=conjuntos, conjunto=[0, 1, 0, 1],
+                              motor=motor, saturacao=saturacao)
+
+
+@pytest.mark.parametrize('motor', ['tabela', 'exato'])
+def test_conjuntos_iguais_dao_a_mesma_trajetoria(motor):
+    frota = frota_dois_conjuntos(motor)
+    unica = FrotaControladores(4, temperatura_desejada=[25.0, 30.0, 35.0, 40.0], motor=motor)
+    np.testing.assert_array_equal(frota.simular(50, registrar=True), unica.simular(50, registrar=True))
+
+
+def test_unidades_sem_regra_seguem_a_politica():
+    # O segundo conjunto passa a não ativar nenhuma regra
+    frota = frota_dois_conjuntos('tabela')
+    frota.passo(1.0)
+    frota.tabelas[1].tabela[:] = np.nan
+    potencia = frota.passo(1.0)
+    np.testing.assert_array_equal(potencia[[1, 3]], POTENCIA_PADRAO)
+    assert not np.isnan(potencia).any()
+
+    # Com 'manter', cada unidade fica com a sua própria última potência
+    frota = frota_dois_conjuntos('tabela', PoliticaSaturacao(sem_ativacao='manter'))
+    anteriores = frota.passo(1.0).copy()
+    frota.tabelas[1].tabela[:] = np.nan
+    potencia = frota.passo(1.0)
+    np.testing.assert_array_equal(potencia[[1, 3]], anteriores[[1, 3]])
+    assert potencia[1] != potencia[3]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from motor_sugeno import MotorSugeno, ajustar_sugeno, comparar_motores, grade_ajuste
+from motor_vetorizado import MotorFuzzyVetorizado
+
+
+@pytest.fixture(scope='module')
+def mamdani():
+    return MotorFuzzyVetorizado(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)
+
+
+@pytest.mark.parametrize('ordem', [0, 1])
+def test_ajuste_recupera_consequentes(ordem):
+    # A saída é linear nos consequentes: ajustar a um Sugeno os reproduz
+    rng = np.random.default_rng(ordem)
+    alvo = MotorSugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO,
+                       consequentes=rng.uniform(0.0, 100.0, (15, 1 if ordem == 0 else 3)), ordem=ordem)
+    ajustado = ajustar_sugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, ordem=ordem, referencia=alvo)
+    np.testing.assert_allclose(ajustado.consequentes, alvo.consequentes, rtol=0, atol=1e-8)
+
+    erros, variacoes = grade_ajuste()
+    assert np.nanmax(np.abs(ajustado.compute_many(erros, variacoes) - alvo.compute_many(erros, variacoes))) < 1e-8
+
+
+def test_ajuste_ao_mamdani(mamdani):
+    # Medido: superfície máx. 6.7 pp e RMS 0.98 pp; temperatura máx. 0.50 °C
+    ajustado = ajustar_sugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, ordem=1, referencia=mamdani)
+    diferencas = comparar_motores(ajustado, mamdani)
+    assert diferencas['superficie_max'] < 7.0
+    assert diferencas['superficie_rms'] < 1.05
+    assert diferencas['temperatura_max'] < 0.6
+
+
+def test_primeira_ordem_melhor_que_ordem_zero(mamdani):
+    erros, variacoes = grade_ajuste()
+    referencia = mamdani.compute_many(erros, variacoes)
+    rms = []
+    for ordem in (0, 1):
+        motor = ajustar_sugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, ordem=ordem, referencia=mamdani)
+        rms.append(np.sqrt(np.nanmean((motor.compute_many(erros, variacoes) - referencia) ** 2)))
+    assert rms[1] < rms[0]
+
+
+def test_inferir_igual_ao_lote(mamdani):
+    motor = ajustar_sugeno(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO, ordem=1, referencia=mamdani)
+    erros = np.linspace(-35.0, 35.0, 29)
+    variacoes = np.linspace(-12.0, 12.0, 29)
+    lote = motor.compute_many(erros, variacoes)
+    unitarios = [motor.inferir(e, v, validar=False).potencia for e, v in zip(erros, variacoes)]
+    np.testing.assert_allclose(unitarios, lote, rtol=0, atol=1e-9)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from planta import (
+    TEMPERATURA_AMBIENTE, GANHO_POTENCIA, COEFICIENTE_AMBIENTE, PlantaLote, expm,
+    modelo_primeira_ordem, modelo_atraso, modelo_dois_nos
+)
+from simulador import variacao_temperatura
+
+
+def regime(potencia):
+    return TEMPERATURA_AMBIENTE + GANHO_POTENCIA * potencia / 100.0 / COEFICIENTE_AMBIENTE
+
+
+def analitica(temperatura_inicial, potencia, t):
+    final = regime(potencia)
+    return final + (temperatura_inicial - final) * np.exp(-COEFICIENTE_AMBIENTE * t)
+
+
+@pytest.mark.parametrize('matriz, esperada', [
+    (np.diag([-0.05, 2.0, -30.0]), np.diag(np.exp([-0.05, 2.0, -30.0]))),
+    (np.array([[0.0, 3.0], [0.0, 0.0]]), np.array([[1.0, 3.0], [0.0, 1.0]])),
+    (np.array([[0.0, -2.0], [2.0, 0.0]]), np.array([[np.cos(2.0), -np.sin(2.0)], [np.sin(2.0), np.cos(2.0)]])),
+])
+def test_expm(matriz, esperada):
+    np.testing.assert_allclose(expm(matriz), esperada, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('dt', [0.01, 1.0, 50.0])
+def test_exato_igual_a_solucao_analitica(dt):
+    potencias = np.array([0.0, 40.0, 100.0])
+    planta = PlantaLote(modelo_primeira_ordem(), 3, 20.0, integrador='exato')
+    for k in range(1, 21):
+        planta.avancar(potencias, dt)
+        np.testing.assert_allclose(planta.temperatura, analitica(20.0, potencias, k * dt), rtol=1e-12)
+
+
+def test_rk4_converge_para_o_exato():
+    exata = analitica(20.0, 60.0, 10.0)
+    erros = []
+    for dt in (1.0, 0.5):
+        planta = PlantaLote(modelo_primeira_ordem(), 1, 20.0, integrador='rk4')
+        for _ in range(int(round(10.0 / dt))):
+            planta.avancar(60.0, dt)
+        erros.append(abs(planta.temperatura[0] - exata))
+    assert erros[0] < 1e-5
+    # Quarta ordem: metade do passo, ~1/16 do erro
+    assert erros[0] / erros[1] == pytest.approx(16.0, rel=0.05)
+
+
+def test_euler_igual_ao_simulador():
+    # Mesmo passo de Euler; só a ordem das operações em ponto flutuante muda
+    planta = PlantaLote(modelo_primeira_ordem(), 1, 20.0, integrador='euler')
+    temperatura = 20.0
+    for k in range(200):
+        potencia = 100.0 * (k % 7) / 6.0
+        temperatura += variacao_temperatura(temperatura, potencia, 0.1)
+        assert planta.avancar(potencia, 0.1)[0] == pytest.approx(temperatura, rel=1e-13)
+
+
+@pytest.mark.parametrize('integrador', ['exato', 'rk4'])
+def test_dois_nos_tem_o_mesmo_regime(integrador):
+    planta = PlantaLote(modelo_dois_nos(), 2, 20.0, integrador=integrador)
+    for _ in range(3000):
+        planta.avancar(np.array([30.0, 80.0]), 0.5)
+    np.testing.assert_allclose(planta.temperatura, regime(np.array([30.0, 80.0])), rtol=1e-9)
+
+
+def test_atraso_desloca_a_saida():
+    dt = 0.5
+    atrasada = PlantaLote(modelo_atraso(2.0), 1, 20.0, dt=dt)
+    direta = PlantaLote(modelo_primeira_ordem(), 1, 20.0, dt=dt)
+    assert atrasada.passos_atraso == 4
+    saidas_atrasadas = [atrasada.avancar(70.0)[0] for _ in range(12)]
+    saidas_diretas = [direta.avancar(70.0)[0] for _ in range(12)]
+    assert saidas_atrasadas[:4] == [20.0] * 4
+    np.testing.assert_allclose(saidas_atrasadas[4:], saidas_diretas[:-4], rtol=1e-15)
+
+
+@pytest.mark.parametrize('dt', [0.003, 0.0117, 1.0, 40.0])
+def test_forma_fechada_igual_a_exponencial(dt):
+    modelo = modelo_primeira_ordem()
+    aumentada = np.zeros((3, 3))
+    aumentada[0, :] = [modelo.A[0, 0], modelo.B[0], modelo.c[0]]
+    exponencial = expm(aumentada * dt)
+    Ad, Bd, cd = modelo.discretizar(dt)
+    np.testing.assert_allclose([Ad[0, 0], Bd[0], cd[0]], exponencial[0], rtol=1e-12)
+
+
+def test_simular_lote_mantem_a_potencia_de_cada_planta():
+    from saturacao import PoliticaSaturacao
+    from planta import simular_lote
+
+    class MotorParcial:
+        # Sem regra ativa enquanto a temperatura sobe
+        def compute_many(self, erros, variacoes):
+            return np.where(variacoes <= 0, np.clip(erros * 10.0, 0.0, 100.0), np.nan)
+
+    planta = PlantaLote(modelo_primeira_ordem(), 2, 20.0, dt=1.0)
+    resultado = simular_lote(MotorParcial(), planta, np.array([30.0, 10.0]), 4,
+                             PoliticaSaturacao(sem_ativacao='manter'))
+    # A primeira planta aquece com 100% e mantém a própria potência, não a
+    # da segunda planta (0%), que esfria
+    np.testing.assert_array_equal(resultado['potencia'][1:, 0], 100.0)
+    np.testing.assert_array_equal(resultado['potencia'][1:, 1], 0.0)
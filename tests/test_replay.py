@@ -0,0 +1,70 @@
+import threading
+
+import numpy as np
+
+from buffer_circular import BufferCircular
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from diagnostico import CanalDiagnostico
+from motor_vetorizado import MotorFuzzyVetorizado
+from perfil import PerfiladorTicks
+from planta import PlantaLote, modelo_primeira_ordem
+from replay import executar_replay, reproduzir
+from saturacao import PoliticaSaturacao
+from telemetria import GravadorTelemetria
+
+
+def gravar_como_o_app(caminho, passos):
+    # Laço de controle do app (passo_controle) sem janela, gravando a telemetria
+    import app
+
+    interface = app.InterfaceControleFuzzy.__new__(app.InterfaceControleFuzzy)
+    interface.parametros_erro_valores = dict(PARAMETROS_ERRO_PADRAO)
+    interface.parametros_var_valores = dict(PARAMETROS_VAR_PADRAO)
+    interface.configurar_sistema_fuzzy()
+    interface.motor_inferencia = 'vetorizado'
+    interface.diagnostico = CanalDiagnostico('desligado')
+    interface.perfil = PerfiladorTicks()
+    interface.trava_estado = threading.Lock()
+    interface.temperatura_atual = 20.0
+    interface.planta = PlantaLote(modelo_primeira_ordem(), 1, interface.temperatura_atual)
+    interface.ultimo_tempo = 0.0
+    interface.historico = BufferCircular(passos + 1, app.CANAIS_HISTORICO)
+    interface.historico.adicionar((0.0, interface.temperatura_atual, 0.0, 0.0, 0.0))
+    interface.gravador = GravadorTelemetria(caminho)
+    for k in range(passos):
+        # Variações de referência fazem o controlador passar por várias regras
+        interface.temperatura_desejada = 35.0 if (k // 100) % 2 == 0 else 25.0
+        interface.passo_controle()
+    interface.gravador.fechar()
+
+
+def test_replay_da_propria_gravacao(tmp_path):
+    caminho = str(tmp_path / 'gravacao.fztl')
+    gravar_como_o_app(caminho, 500)
+
+    motor = MotorFuzzyVetorizado(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)
+    estatisticas = executar_replay(caminho, motor, tamanho_bloco=64)
+    assert estatisticas['amostras'] == 500
+    # Os campos são gravados em float32
+    assert estatisticas['diferenca_maxima'] < 1e-4
+
+
+class MotorSemRegraNegativa:
+    # Motor de teste: nenhuma regra dispara para erro negativo
+    def compute_many(self, erro, variacao):
+        return np.where(erro < 0, np.nan, 10.0 + erro)
+
+
+def test_replay_manter_atravessa_blocos():
+    erro = np.array([1.0, 2.0, -1.0, -1.0, 3.0, -1.0])
+    blocos = [
+        {'tempo': np.arange(i, i + 2, dtype=float), 'temperatura': np.zeros(2),
+         'temperatura_desejada': np.zeros(2), 'erro': erro[i:i + 2], 'variacao': np.zeros(2)}
+        for i in range(0, len(erro), 2)
+    ]
+    saturacao = PoliticaSaturacao(sem_ativacao='manter')
+    potencia = np.concatenate([r['potencia'] for r in reproduzir(blocos, MotorSemRegraNegativa(), saturacao)])
+    np.testing.assert_allclose(potencia, [11.0, 12.0, 12.0, 12.0, 13.0, 13.0])
+
+    potencia = np.concatenate([r['potencia'] for r in reproduzir(blocos, MotorSemRegraNegativa())])
+    np.testing.assert_allclose(potencia, [11.0, 12.0, 50.0, 50.0, 13.0, 50.0])
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from motor_vetorizado import MotorFuzzyVetorizado
+from saturacao import POTENCIA_PADRAO
+from simulador import SimuladorChuveiro, variacao_temperatura
+
+
+def malha_euler(motor, dt, temperatura_inicial, temperatura_desejada, passos):
+    # Referência escalar: o laço de controle com o passo de Euler do app
+    temperatura = temperatura_inicial
+    anterior = temperatura
+    temperaturas, potencias = [temperatura], [0.0]
+    for _ in range(passos):
+        erro = temperatura_desejada - temperatura
+        variacao = (temperatura - anterior) / dt
+        potencia = motor.inferir(erro, variacao, validar=False).potencia
+        if np.isnan(potencia):
+            potencia = POTENCIA_PADRAO
+        anterior = temperatura
+        temperatura += variacao_temperatura(temperatura, potencia, dt)
+        temperaturas.append(temperatura)
+        potencias.append(potencia)
+    return np.array(temperaturas), np.array(potencias)
+
+
+@pytest.mark.parametrize('dt, desejada', [(1.0, 35.0), (0.1, 25.0)])
+def test_igual_a_malha_de_euler(dt, desejada):
+    motor = MotorFuzzyVetorizado(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)
+    resultado = SimuladorChuveiro(motor, dt, 20.0, desejada).simular(300)
+    temperaturas, potencias = malha_euler(motor, dt, 20.0, desejada, 300)
+    np.testing.assert_allclose(resultado['temperatura'], temperaturas, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(resultado['potencia'], potencias, rtol=0, atol=1e-9)
+
+
+def test_formato_das_trajetorias():
+    passos = 50
+    resultado = SimuladorChuveiro(dt=0.5, temperatura_inicial=22.0, temperatura_desejada=30.0).simular(passos)
+    assert set(resultado) == {'tempo', 'temperatura', 'potencia', 'erro', 'variacao'}
+    for trajetoria in resultado.values():
+        assert trajetoria.shape == (passos + 1,)
+    np.testing.assert_allclose(resultado['tempo'], np.arange(passos + 1) * 0.5)
+    # Índice 0: estado inicial, sem potência aplicada
+    assert resultado['temperatura'][0] == 22.0
+    assert resultado['erro'][0] == 8.0
+    assert resultado['potencia'][0] == 0.0
+    assert resultado['variacao'][0] == 0.0
+
+
+def test_passo_invalido():
+    with pytest.raises(ValueError):
+        SimuladorChuveiro(dt=0.0)
@@ -0,0 +1,57 @@
+class TextoIncremental:
+    # Conteúdo de um tk.Text tratado como uma lista de linhas fixas. Cada
+    # atualização edita no lugar apenas o trecho que mudou em cada linha
+    # alterada (entre o prefixo e o sufixo comuns), sem apagar e reinserir o
+    # texto inteiro, o que evita o Tk refazer o layout de todas as linhas.
+    #
+    # `valores` fica à disposição de quem monta as linhas, para guardar os
+    # valores exibidos e formatar só as linhas cujos valores mudaram.
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.linhas = []
+        self.valores = None
+
+    def definir(self, linhas):
+        # Substitui todo o conteúdo; usado quando o número de linhas muda
+        self.linhas = list(linhas)
+        self.texto.config(state='normal')
+        self.texto.delete('1.0', 'end')
+        self.texto.insert('1.0', "\n".join(self.linhas))
+        self.texto.config(state='disabled')
+
+    def exibir(self, linhas):
+        # Exibe a lista completa de linhas, editando só as que mudaram
+        if len(linhas) != len(self.linhas):
+            self.definir(linhas)
+        else:
+            self.alterar(enumerate(linhas))
+
+    def alterar(self, alteracoes):
+        # `alteracoes`: pares (índice da linha, novo texto) de um layout fixo
+        editado = False
+        for indice, nova in alteracoes:
+            antiga = self.linhas[indice]
+            if nova == antiga:
+                continue
+            if not editado:
+                self.texto.config(state='normal')
+                editado = True
+
+            # Trecho alterado: entre o prefixo e o sufixo comuns às duas versões
+            limite = min(len(antiga), len(nova))
+            inicio = 0
+            while inicio < limite and antiga[inicio] == nova[inicio]:
+                inicio += 1
+            fim = 0
+            while fim < limite - inicio and antiga[-1 - fim] == nova[-1 - fim]:
+                fim += 1
+
+            linha = indice + 1
+            if len(antiga) - fim > inicio:
+                self.texto.delete(f"{linha}.{inicio}", f"{linha}.{len(antiga) - fim}")
+            if len(nova) - fim > inicio:
+                self.texto.insert(f"{linha}.{inicio}", nova[inicio:len(nova) - fim])
+            self.linhas[indice] = nova
+        if editado:
+            self.texto.config(state='disabled')
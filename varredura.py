@@ -0,0 +1,151 @@
+import argparse
+import csv
+import itertools
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from definicao_fuzzy import PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO
+from motor_vetorizado import MotorFuzzyVetorizado
+from simulador import SimuladorChuveiro
+
+
+# Faixa de acomodação relativa ao tamanho do degrau (2%)
+FAIXA_ACOMODACAO = 0.02
+
+COLUNAS_METRICAS = [
+    'tempo_subida', 'sobressinal', 'tempo_acomodacao', 'energia', 'iae', 'ise', 'temperatura_final'
+]
+
+
+def gerar_grade(temperaturas_iniciais, temperaturas_desejadas, conjuntos_parametros=None,
+                dt=1.0, passos=600):
+    # Produto cartesiano das condições de teste. Cada conjunto de parâmetros é
+    # um par (parametros_erro, parametros_var) no formato de definicao_fuzzy.
+    if conjuntos_parametros is None:
+        conjuntos_parametros = [(PARAMETROS_ERRO_PADRAO, PARAMETROS_VAR_PADRAO)]
+
+    cenarios = []
+    for (i, (params_erro, params_var)), t_inicial, t_desejada in itertools.product(
+            enumerate(conjuntos_parametros), temperaturas_iniciais, temperaturas_desejadas):
+        cenarios.append({
+            'id': len(cenarios),
+            'conjunto_parametros': i,
+            'temperatura_inicial': float(t_inicial),
+            'temperatura_desejada': float(t_desejada),
+            'parametros_erro': params_erro,
+            'parametros_var': params_var,
+            'dt': dt,
+            'passos': passos,
+        })
+    return cenarios
+
+
+def calcular_metricas(resultado, temperatura_desejada, dt):
+    tempo = resultado['tempo']
+    temperatura = resultado['temperatura']
+    potencia = resultado['potencia']
+    erro = resultado['erro']
+
+    # Resposta normalizada ao degrau (0 no estado inicial, 1 no setpoint)
+    amplitude = temperatura_desejada - temperatura[0]
+    if amplitude == 0:
+        tempo_subida = 0.0
+        sobressinal = 0.0
+        fora_da_faixa = np.abs(temperatura - temperatura_desejada) > 1e-9
+    else:
+        resposta = (temperatura - temperatura[0]) / amplitude
+        acima_10 = np.nonzero(resposta >= 0.1)[0]
+        acima_90 = np.nonzero(resposta >= 0.9)[0]
+        if len(acima_10) and len(acima_90):
+            tempo_subida = float(tempo[acima_90[0]] - tempo[acima_10[0]])
+        else:
+            tempo_subida = float('nan')
+        sobressinal = float(max(0.0, resposta.max() - 1.0) * 100.0)
+        fora_da_faixa = np.abs(resposta - 1.0) > FAIXA_ACOMODACAO
+
+    # Tempo de acomodação: instante após a última saída da faixa
+    indices_fora = np.nonzero(fora_da_faixa)[0]
+    if len(indices_fora) == 0:
+        tempo_acomodacao = 0.0
+    elif indices_fora[-1] == len(tempo) - 1:
+        tempo_acomodacao = float('nan')  # Não acomodou dentro da simulação
+    else:
+        tempo_acomodacao = float(tempo[indices_fora[-1] + 1])
+
+    # Índices 1.. correspondem aos passos efetivamente aplicados
+    return {
+        'tempo_subida': tempo_subida,
+        'sobressinal': sobressinal,
+        'tempo_acomodacao': tempo_acomodacao,
+        'energia': float(np.sum(potencia[1:]) * dt),  # %·s
+        'iae': float(np.sum(np.abs(erro[1:])) * dt),
+        'ise': float(np.sum(erro[1:] ** 2) * dt),
+        'temperatura_final': float(temperatura[-1]),
+    }
+
+
+def executar_cenario(cenario):
+    # Executado nos processos de trabalho: cada cenário é independente e
+    # determinístico, então o resultado não depende do número de processos
+    motor = MotorFuzzyVetorizado(cenario['parametros_erro'], cenario['parametros_var'])
+    simulador = SimuladorChuveiro(
+        motor=motor,
+        dt=cenario['dt'],
+        temperatura_inicial=cenario['temperatura_inicial'],
+        temperatura_desejada=cenario['temperatura_desejada'],
+    )
+    resultado = simulador.simular(cenario['passos'])
+    linha = {
+        'id': cenario['id'],
+        'conjunto_parametros': cenario['conjunto_parametros'],
+        'temperatura_inicial': cenario['temperatura_inicial'],
+        'temperatura_desejada': cenario['temperatura_desejada'],
+    }
+    linha.update(calcular_metricas(resultado, cenario['temperatura_desejada'], cenario['dt']))
+    return linha
+
+
+def executar_varredura(cenarios, processos=None, arquivo_saida=None):
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    if processos <= 1:
+        resultados = [executar_cenario(c) for c in cenarios]
+    else:
+        # Lotes pequenos equilibram a carga entre os processos; imap mantém a ordem
+        tamanho_lote = max(1, len(cenarios) // (processos * 4))
+        with Pool(processos) as pool:
+            resultados = list(pool.imap(executar_cenario, cenarios, chunksize=tamanho_lote))
+
+    if arquivo_saida is not None:
+        salvar_resultados(resultados, arquivo_saida)
+    return resultados
+
+
+def salvar_resultados(resultados, arquivo_saida):
+    colunas = ['id', 'conjunto_parametros', 'temperatura_inicial', 'temperatura_desejada'] + COLUNAS_METRICAS
+    with open(arquivo_saida, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=colunas)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de cenários do controlador fuzzy em paralelo.")
+    parser.add_argument('--iniciais', type=float, nargs='+', default=[15.0, 20.0, 25.0])
+    parser.add_argument('--desejadas', type=float, nargs='+', default=[25.0, 30.0, 35.0, 40.0])
+    parser.add_argument('--dt', type=float, default=1.0)
+    parser.add_argument('--passos', type=int, default=600)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--saida', default='resultados_varredura.csv')
+    args = parser.parse_args()
+
+    cenarios = gerar_grade(args.iniciais, args.desejadas, dt=args.dt, passos=args.passos)
+    executar_varredura(cenarios, processos=args.processos, arquivo_saida=args.saida)
+    print(f"{len(cenarios)} cenários simulados. Resultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()